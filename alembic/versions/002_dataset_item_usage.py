@@ -0,0 +1,37 @@
+"""Dataset item usage accounting
+
+Revision ID: 002_dataset_item_usage
+Revises: 001_initial
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '002_dataset_item_usage'
+down_revision: Union[str, None] = '001_initial'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('dataset_items', sa.Column('source_model', sa.String(length=100), nullable=True))
+    op.add_column('dataset_items', sa.Column('generation_run_id', sa.String(length=36), nullable=True))
+    op.add_column('dataset_items', sa.Column('prompt_tokens', sa.Integer(), nullable=True))
+    op.add_column('dataset_items', sa.Column('completion_tokens', sa.Integer(), nullable=True))
+    op.add_column('dataset_items', sa.Column('cached_tokens', sa.Integer(), nullable=True))
+    op.add_column('dataset_items', sa.Column('latency_ms', sa.Float(), nullable=True))
+    op.create_index('idx_dataset_items_generation_run_id', 'dataset_items', ['dataset_id', 'generation_run_id'])
+
+
+def downgrade() -> None:
+    op.drop_index('idx_dataset_items_generation_run_id', table_name='dataset_items')
+    op.drop_column('dataset_items', 'latency_ms')
+    op.drop_column('dataset_items', 'cached_tokens')
+    op.drop_column('dataset_items', 'completion_tokens')
+    op.drop_column('dataset_items', 'prompt_tokens')
+    op.drop_column('dataset_items', 'generation_run_id')
+    op.drop_column('dataset_items', 'source_model')
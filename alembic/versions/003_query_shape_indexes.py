@@ -0,0 +1,113 @@
+"""Composite and partial indexes for the review, export and generation queries
+
+Revision ID: 003_query_shape_indexes
+Revises: 002_dataset_item_usage
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '003_query_shape_indexes'
+down_revision: Union[str, None] = '002_dataset_item_usage'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PENDING_REVIEW = sa.text("status = 'pending_review'")
+
+
+def upgrade() -> None:
+    # Built concurrently so large tables stay writable during the migration
+    with op.get_context().autocommit_block():
+        # Review queue of a dataset and export: equality on dataset_id and status,
+        # already ordered by created_at
+        op.create_index(
+            'idx_dataset_items_dataset_status',
+            'dataset_items',
+            ['dataset_id', 'status', 'created_at'],
+            postgresql_concurrently=True,
+        )
+        # Review queue across datasets; only pending items are indexed
+        op.create_index(
+            'idx_dataset_items_pending_review',
+            'dataset_items',
+            ['created_at'],
+            postgresql_where=PENDING_REVIEW,
+            postgresql_concurrently=True,
+        )
+        # Segment selection for generation, paged by id
+        op.create_index(
+            'idx_segments_domain_use_case_type',
+            'segments',
+            ['domain_id', 'use_case', 'segment_type', 'id'],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'idx_segments_domain_use_case',
+            'segments',
+            ['domain_id', 'use_case', 'id'],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'idx_segments_domain',
+            'segments',
+            ['domain_id', 'id'],
+            postgresql_concurrently=True,
+        )
+
+        # Superseded by the indexes above; dropping them keeps the index count,
+        # and the write cost of bulk generation and segmentation, unchanged
+        op.drop_index(
+            'idx_dataset_items_dataset_id', table_name='dataset_items', postgresql_concurrently=True
+        )
+        op.drop_index(
+            'idx_dataset_items_status', table_name='dataset_items', postgresql_concurrently=True
+        )
+        op.drop_index('idx_segments_domain_id', table_name='segments', postgresql_concurrently=True)
+        op.drop_index('idx_segments_use_case', table_name='segments', postgresql_concurrently=True)
+        op.drop_index(
+            'idx_segments_segment_type', table_name='segments', postgresql_concurrently=True
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'idx_segments_segment_type', 'segments', ['segment_type'], postgresql_concurrently=True
+        )
+        op.create_index(
+            'idx_segments_use_case', 'segments', ['use_case'], postgresql_concurrently=True
+        )
+        op.create_index(
+            'idx_segments_domain_id', 'segments', ['domain_id'], postgresql_concurrently=True
+        )
+        op.create_index(
+            'idx_dataset_items_status', 'dataset_items', ['status'], postgresql_concurrently=True
+        )
+        op.create_index(
+            'idx_dataset_items_dataset_id',
+            'dataset_items',
+            ['dataset_id'],
+            postgresql_concurrently=True,
+        )
+
+        op.drop_index('idx_segments_domain', table_name='segments', postgresql_concurrently=True)
+        op.drop_index(
+            'idx_segments_domain_use_case', table_name='segments', postgresql_concurrently=True
+        )
+        op.drop_index(
+            'idx_segments_domain_use_case_type', table_name='segments', postgresql_concurrently=True
+        )
+        op.drop_index(
+            'idx_dataset_items_pending_review',
+            table_name='dataset_items',
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            'idx_dataset_items_dataset_status',
+            table_name='dataset_items',
+            postgresql_concurrently=True,
+        )
@@ -0,0 +1,156 @@
+"""Range-partition system_logs by month of created_at
+
+Revision ID: 004_partition_system_logs
+Revises: 003_query_shape_indexes
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '004_partition_system_logs'
+down_revision: Union[str, None] = '003_query_shape_indexes'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Partitions created ahead of the current month; the application keeps
+# creating them from then on (see app/db/partitions.py)
+MONTHS_AHEAD = 3
+
+OLD_INDEXES = (
+    'idx_system_logs_level',
+    'idx_system_logs_module',
+    'idx_system_logs_action',
+    'idx_system_logs_entity_id',
+    'idx_system_logs_entity_type',
+    'idx_system_logs_request_id',
+    'idx_system_logs_created_at',
+)
+
+COLUMNS = 'id, level, module, action, entity_id, entity_type, details, request_id, created_at'
+
+# Rows moved per committed statement when copying between the tables
+COPY_BATCH_SIZE = 10000
+
+
+def _create_indexes() -> None:
+    op.create_index('idx_system_logs_level', 'system_logs', ['level'])
+    op.create_index('idx_system_logs_module', 'system_logs', ['module'])
+    op.create_index('idx_system_logs_entity_id', 'system_logs', ['entity_id'])
+    op.create_index('idx_system_logs_request_id', 'system_logs', ['request_id'])
+    op.create_index(
+        'idx_system_logs_created_at',
+        'system_logs',
+        ['created_at'],
+        postgresql_ops={'created_at': 'DESC'},
+    )
+
+
+def _move_rows(source: str) -> None:
+    """Move the rows of ``source`` into ``system_logs`` in committed batches.
+
+    Each batch is deleted from ``source`` as it is copied, so no transaction
+    holds the whole table and an interrupted run leaves every row in exactly
+    one of the two tables.
+    """
+    bind = op.get_bind()
+    with op.get_context().autocommit_block():
+        while True:
+            result = bind.execute(sa.text(
+                f'WITH batch AS ('
+                f'DELETE FROM {source} WHERE (id, created_at) IN '
+                f'(SELECT id, created_at FROM {source} LIMIT {COPY_BATCH_SIZE}) '
+                f'RETURNING {COLUMNS}) '
+                f'INSERT INTO system_logs ({COLUMNS}) SELECT {COLUMNS} FROM batch'
+            ))
+            if result.rowcount < COPY_BATCH_SIZE:
+                break
+
+
+def upgrade() -> None:
+    for name in OLD_INDEXES:
+        op.execute(f'DROP INDEX IF EXISTS {name}')
+    op.execute('ALTER TABLE system_logs RENAME TO system_logs_unpartitioned')
+    op.execute(
+        'ALTER TABLE system_logs_unpartitioned '
+        'RENAME CONSTRAINT system_logs_pkey TO system_logs_unpartitioned_pkey'
+    )
+
+    # The partition key has to be part of the primary key
+    op.execute("""
+        CREATE TABLE system_logs (
+            id UUID NOT NULL DEFAULT uuid_generate_v4(),
+            level VARCHAR(20) NOT NULL,
+            module VARCHAR(100) NOT NULL,
+            action VARCHAR(100) NOT NULL,
+            entity_id UUID,
+            entity_type VARCHAR(50),
+            details JSONB NOT NULL DEFAULT '{}',
+            request_id VARCHAR(100),
+            created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+            PRIMARY KEY (id, created_at)
+        ) PARTITION BY RANGE (created_at)
+    """)
+
+    # One partition per month from the oldest existing row to MONTHS_AHEAD
+    op.execute(f"""
+        DO $$
+        DECLARE
+            part_month TIMESTAMP;
+        BEGIN
+            FOR part_month IN
+                SELECT generate_series(
+                    date_trunc('month', LEAST(
+                        (SELECT MIN(created_at) FROM system_logs_unpartitioned), NOW()
+                    ) AT TIME ZONE 'UTC'),
+                    date_trunc('month', NOW() AT TIME ZONE 'UTC')
+                        + INTERVAL '{MONTHS_AHEAD} months',
+                    INTERVAL '1 month'
+                )
+            LOOP
+                EXECUTE format(
+                    'CREATE TABLE system_logs_p%s PARTITION OF system_logs '
+                    'FOR VALUES FROM (%L) TO (%L)',
+                    to_char(part_month, 'YYYY_MM'),
+                    part_month AT TIME ZONE 'UTC',
+                    (part_month + INTERVAL '1 month') AT TIME ZONE 'UTC'
+                );
+            END LOOP;
+        END $$
+    """)
+    # Catches rows outside the monthly partitions instead of failing inserts
+    op.execute('CREATE TABLE system_logs_default PARTITION OF system_logs DEFAULT')
+
+    _move_rows('system_logs_unpartitioned')
+    op.execute('DROP TABLE system_logs_unpartitioned')
+    _create_indexes()
+
+
+def downgrade() -> None:
+    for name in OLD_INDEXES:
+        op.execute(f'DROP INDEX IF EXISTS {name}')
+    op.execute('ALTER TABLE system_logs RENAME TO system_logs_partitioned')
+    op.execute(
+        'ALTER TABLE system_logs_partitioned '
+        'RENAME CONSTRAINT system_logs_pkey TO system_logs_partitioned_pkey'
+    )
+    op.execute("""
+        CREATE TABLE system_logs (
+            id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+            level VARCHAR(20) NOT NULL,
+            module VARCHAR(100) NOT NULL,
+            action VARCHAR(100) NOT NULL,
+            entity_id UUID,
+            entity_type VARCHAR(50),
+            details JSONB NOT NULL DEFAULT '{}',
+            request_id VARCHAR(100),
+            created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW()
+        )
+    """)
+    _move_rows('system_logs_partitioned')
+    # Dropping the partitioned table drops its partitions
+    op.execute('DROP TABLE system_logs_partitioned')
+    _create_indexes()
@@ -0,0 +1,34 @@
+"""Offline generation state on datasets
+
+Revision ID: 005_dataset_generation_state
+Revises: 004_partition_system_logs
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '005_dataset_generation_state'
+down_revision: Union[str, None] = '004_partition_system_logs'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'datasets',
+        sa.Column(
+            'generation_state',
+            postgresql.JSONB(astext_type=sa.Text()),
+            server_default='{}',
+            nullable=False,
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('datasets', 'generation_state')
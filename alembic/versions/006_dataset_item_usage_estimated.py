@@ -0,0 +1,33 @@
+"""Flag estimated token usage on dataset items
+
+Revision ID: 006_dataset_item_usage_estimated
+Revises: 005_dataset_generation_state
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '006_dataset_item_usage_estimated'
+down_revision: Union[str, None] = '005_dataset_generation_state'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'dataset_items',
+        sa.Column(
+            'usage_estimated',
+            sa.Boolean(),
+            server_default=sa.text('false'),
+            nullable=False,
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('dataset_items', 'usage_estimated')
@@ -1,20 +1,66 @@
 """API dependencies."""
 
-from typing import AsyncGenerator
+import math
+import time
+from typing import AsyncGenerator, Optional
 
-from fastapi import Request
+from fastapi import Header, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import get_settings
+from app.core.exceptions import PermissionDeniedError
 from app.core.logging import get_request_id
-from app.db.session import get_db
+from app.core.middleware import PRIMARY_STICKY_COOKIE, READ_PRIMARY_UNTIL_STATE
+from app.db.session import get_db, get_read_db
 
+settings = get_settings()
 
-async def get_db_session() -> AsyncGenerator[AsyncSession, None]:
-    """Get database session dependency."""
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+
+async def get_db_session(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """Get database session dependency (primary).
+
+    Write requests mark the client so that its next reads within
+    ``DB_READ_YOUR_WRITES_SECONDS`` skip the read replica; the cookie is set
+    by ``ReadYourWritesMiddleware``.
+    """
+    if settings.DATABASE_READ_REPLICA_URL and request.method not in SAFE_METHODS:
+        until = math.ceil(time.time() + settings.DB_READ_YOUR_WRITES_SECONDS)
+        setattr(request.state, READ_PRIMARY_UNTIL_STATE, until)
     async for session in get_db():
         yield session
 
 
+def _reads_own_writes(request: Request) -> bool:
+    """Check whether the client wrote recently and must read from the primary."""
+    value = request.cookies.get(PRIMARY_STICKY_COOKIE)
+    if not value:
+        return False
+    try:
+        return float(value) > time.time()
+    except ValueError:
+        return False
+
+
+async def get_read_db_session(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """Get read-only database session dependency (replica when available)."""
+    async for session in get_read_db(use_primary=_reads_own_writes(request)):
+        yield session
+
+
+async def require_admin_key(x_admin_key: Optional[str] = Header(None)) -> None:
+    """Reject requests without a valid ``X-Admin-Key`` header.
+
+    Raises:
+        PermissionDeniedError: If the key is missing or wrong, or admin routes are disabled
+    """
+    from app.core.profiling import is_admin_key
+
+    if not is_admin_key(x_admin_key):
+        raise PermissionDeniedError("Admin key required")
+
+
 async def get_request(request: Request) -> Request:
     """Get FastAPI request object.
     
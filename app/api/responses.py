@@ -0,0 +1,180 @@
+"""Fast rendering of large list responses and conditional GET support.
+
+Returning Pydantic models from a route makes FastAPI validate and serialize
+them again through ``response_model``. List routes instead validate their rows
+once against the schema (from ORM objects or result rows) and render the
+result with orjson (by alias, like ``response_model``), either as one JSON
+array or, for clients sending ``Accept: application/x-ndjson``, as a stream of
+one JSON object per line.
+
+Detail and list responses carry a weak ``ETag`` and a ``Last-Modified``
+header. Lists derive them from the row count and latest timestamp of their
+query, so a client polling with ``If-None-Match`` gets a ``304`` without the
+rows being loaded or serialized.
+"""
+
+import hashlib
+from datetime import datetime
+from email.utils import format_datetime, parsedate_to_datetime
+from functools import lru_cache
+from typing import Any, AsyncIterator, Iterable, Optional
+
+import orjson
+from fastapi import Request, Response
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from pydantic import BaseModel, TypeAdapter
+from sqlalchemy import Select, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+# Rows serialized per chunk of an NDJSON stream
+NDJSON_CHUNK_ROWS = 500
+# Clients may keep responses but must revalidate them before reuse
+CACHE_CONTROL = "no-cache"
+
+
+@lru_cache(maxsize=None)
+def _list_adapter(schema: type[BaseModel]) -> TypeAdapter:
+    """Get the (cached) validator and serializer of a list of ``schema``."""
+    return TypeAdapter(list[schema])
+
+
+def wants_ndjson(request: Request) -> bool:
+    """Check whether the client asked for an NDJSON stream."""
+    return NDJSON_MEDIA_TYPE in request.headers.get("accept", "")
+
+
+def make_etag(request: Request, *version: Any) -> str:
+    """Build a weak ETag from the URL, representation and version of a resource."""
+    parts = [
+        request.url.path,
+        request.url.query,
+        NDJSON_MEDIA_TYPE if wants_ndjson(request) else "json",
+        *(value.isoformat() if isinstance(value, datetime) else str(value) for value in version),
+    ]
+    digest = hashlib.blake2b("|".join(parts).encode("utf-8"), digest_size=16).hexdigest()
+    return f'W/"{digest}"'
+
+
+def _validator_headers(etag: str, last_modified: Optional[datetime]) -> dict[str, str]:
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(last_modified, usegmt=True)
+    return headers
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    """Weak comparison of an ``If-None-Match`` header with an ETag."""
+    if header.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in header.split(","))
+
+
+def is_not_modified(request: Request, etag: str, last_modified: Optional[datetime]) -> bool:
+    """Check the conditional headers of a GET request.
+
+    ``If-None-Match`` takes precedence; ``If-Modified-Since`` is only used
+    without it (HTTP dates have second precision).
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return _etag_matches(if_none_match, etag)
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None or last_modified.tzinfo is None:
+            return False
+        return last_modified.replace(microsecond=0) <= since
+    return False
+
+
+def not_modified_response(etag: str, last_modified: Optional[datetime]) -> Response:
+    """Build a 304 response carrying the validators."""
+    return Response(status_code=304, headers=_validator_headers(etag, last_modified))
+
+
+async def list_validators(
+    request: Request, db: AsyncSession, query: Select, *timestamp_columns: str
+) -> tuple[str, Optional[datetime]]:
+    """Compute the ETag and Last-Modified of a list query with one aggregate query.
+
+    Args:
+        request: Current request
+        db: Database session
+        query: List query (its ORDER BY is dropped)
+        *timestamp_columns: Names of the query's timestamp columns
+
+    Returns:
+        Tuple of (ETag, latest timestamp)
+    """
+    rows = query.order_by(None).subquery()
+    result = await db.execute(
+        select(func.count(), *(func.max(rows.c[name]) for name in timestamp_columns))
+    )
+    count, *timestamps = result.one()
+    last_modified = max((value for value in timestamps if value is not None), default=None)
+    return make_etag(request, count, *timestamps), last_modified
+
+
+async def _ndjson_chunks(adapter: TypeAdapter, items: list[Any]) -> AsyncIterator[bytes]:
+    for start in range(0, len(items), NDJSON_CHUNK_ROWS):
+        chunk = adapter.dump_python(items[start:start + NDJSON_CHUNK_ROWS], by_alias=True)
+        yield b"".join(orjson.dumps(item) + b"\n" for item in chunk)
+
+
+def list_response(
+    request: Request,
+    schema: type[BaseModel],
+    rows: Iterable[Any],
+    etag: Optional[str] = None,
+    last_modified: Optional[datetime] = None,
+) -> Response:
+    """Render a list route response on the fast path.
+
+    Args:
+        request: Current request (its ``Accept`` header selects NDJSON)
+        schema: Response schema of one row
+        rows: ORM objects or result rows
+        etag: ETag from ``list_validators`` (optional)
+        last_modified: Last-Modified from ``list_validators`` (optional)
+
+    Returns:
+        JSON array response, or NDJSON streaming response
+    """
+    adapter = _list_adapter(schema)
+    items = adapter.validate_python(list(rows), from_attributes=True)
+    headers = _validator_headers(etag, last_modified) if etag is not None else None
+    if wants_ndjson(request):
+        return StreamingResponse(
+            _ndjson_chunks(adapter, items), media_type=NDJSON_MEDIA_TYPE, headers=headers
+        )
+    return ORJSONResponse(adapter.dump_python(items, by_alias=True), headers=headers)
+
+
+def detail_response(request: Request, schema: type[BaseModel], obj: Any) -> Response:
+    """Render one resource with validators, or a 304 when the client has it.
+
+    The version is the resource's ``updated_at`` (``created_at`` for
+    resources that are never updated).
+
+    Args:
+        request: Current request
+        schema: Response schema
+        obj: ORM object
+
+    Returns:
+        JSON response, or 304 response
+    """
+    last_modified = getattr(obj, "updated_at", None) or getattr(obj, "created_at", None)
+    etag = make_etag(request, last_modified)
+    if is_not_modified(request, etag, last_modified):
+        return not_modified_response(etag, last_modified)
+    return ORJSONResponse(
+        schema.model_validate(obj).model_dump(by_alias=True),
+        headers=_validator_headers(etag, last_modified),
+    )
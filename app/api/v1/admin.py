@@ -0,0 +1,65 @@
+"""Admin endpoints for profiling live workers."""
+
+import os
+import time
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import PlainTextResponse
+
+from app.api.deps import require_admin_key
+from app.core.config import get_settings
+from app.core.exceptions import NotFoundError
+
+router = APIRouter(prefix="/admin", tags=["admin"], dependencies=[Depends(require_admin_key)])
+
+settings = get_settings()
+
+
+def _folded_response(content: str, name: str) -> PlainTextResponse:
+    """Return folded stacks as a file download tagged with the worker PID."""
+    return PlainTextResponse(
+        content,
+        headers={
+            "Content-Disposition": f'attachment; filename="{name}.folded"',
+            "X-Worker-PID": str(os.getpid()),
+        },
+    )
+
+
+@router.get("/profile", response_class=PlainTextResponse)
+async def profile_worker(
+    seconds: float = Query(10.0, gt=0),
+    interval_ms: Optional[float] = Query(None, gt=0),
+):
+    """Sample the CPU stacks of the worker serving this request for N seconds.
+
+    The result is in the folded stack format (flamegraph.pl, inferno, speedscope).
+    """
+    from app.core.profiling import profile_worker as run_profile
+
+    seconds = min(seconds, settings.PROFILING_MAX_SECONDS)
+    profile = await run_profile(seconds, interval_ms)
+    return _folded_response(profile, f"profile-{os.getpid()}-{int(time.time())}")
+
+
+@router.get("/tasks", response_class=PlainTextResponse)
+async def dump_tasks():
+    """Dump where every asyncio task of the worker serving this request is waiting."""
+    from app.core.profiling import dump_tasks as run_dump
+
+    return _folded_response(run_dump(), f"tasks-{os.getpid()}-{int(time.time())}")
+
+
+@router.get("/profiles/{profile_id}", response_class=PlainTextResponse)
+async def get_request_profile(profile_id: str):
+    """Download the profile of a request sent with the ``X-Profile`` header."""
+    from app.core.profiling import profile_path
+
+    try:
+        path = profile_path(profile_id)
+        with open(path, encoding="utf-8") as f:
+            content = f.read()
+    except (ValueError, OSError):
+        raise NotFoundError("Profile", profile_id) from None
+    return _folded_response(content, f"request-{profile_id}")
@@ -2,12 +2,21 @@
 
 from typing import List
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_db_session
+from app.api.deps import get_db_session, get_read_db_session
+from app.api.responses import (
+    detail_response,
+    is_not_modified,
+    list_response,
+    list_validators,
+    not_modified_response,
+)
 from app.schemas.dataset import DatasetCreate, DatasetGenerate, DatasetResponse
+from app.schemas.usage import DatasetUsageReport
 from app.services.synthetic_generator import SyntheticGeneratorService
+from app.services.usage_service import UsageService
 
 router = APIRouter(prefix="/datasets", tags=["datasets"])
 
@@ -41,10 +50,11 @@ async def create_dataset(
 
 @router.get("", response_model=List[DatasetResponse])
 async def list_datasets(
+    request: Request,
     domain_id: str = None,
-    db: AsyncSession = Depends(get_db_session),
+    db: AsyncSession = Depends(get_read_db_session),
 ):
-    """List datasets."""
+    """List datasets (NDJSON with ``Accept: application/x-ndjson``)."""
     from sqlalchemy import select
     from app.models.dataset import Dataset
 
@@ -52,15 +62,20 @@ async def list_datasets(
     if domain_id:
         query = query.where(Dataset.domain_id == domain_id)
 
+    etag, last_modified = await list_validators(request, db, query, "updated_at")
+    if is_not_modified(request, etag, last_modified):
+        return not_modified_response(etag, last_modified)
+
     result = await db.execute(query)
     datasets = list(result.scalars().all())
-    return [DatasetResponse.model_validate(d) for d in datasets]
+    return list_response(request, DatasetResponse, datasets, etag, last_modified)
 
 
 @router.get("/{dataset_id}", response_model=DatasetResponse)
 async def get_dataset(
+    request: Request,
     dataset_id: str,
-    db: AsyncSession = Depends(get_db_session),
+    db: AsyncSession = Depends(get_read_db_session),
 ):
     """Get dataset by ID."""
     from sqlalchemy import select
@@ -71,7 +86,17 @@ async def get_dataset(
     dataset = result.scalar_one_or_none()
     if not dataset:
         raise NotFoundError("Dataset", dataset_id)
-    return DatasetResponse.model_validate(dataset)
+    return detail_response(request, DatasetResponse, dataset)
+
+
+@router.get("/{dataset_id}/usage", response_model=DatasetUsageReport)
+async def get_dataset_usage(
+    dataset_id: str,
+    db: AsyncSession = Depends(get_read_db_session),
+):
+    """Get token usage, cost and throughput report for a dataset."""
+    report = await UsageService.get_dataset_usage(db=db, dataset_id=dataset_id)
+    return DatasetUsageReport.model_validate(report)
 
 
 @router.post("/generate", status_code=202)
@@ -79,13 +104,38 @@ async def generate_dataset(
     generate_data: DatasetGenerate,
     db: AsyncSession = Depends(get_db_session),
 ):
-    """Generate synthetic dataset items."""
-    items = await SyntheticGeneratorService.generate_items(
+    """Generate synthetic dataset items.
+
+    Offline mode only submits the provider batch jobs; poll
+    ``POST /datasets/{dataset_id}/generate/ingest`` to ingest their results.
+    """
+    if generate_data.mode == "offline":
+        state = await SyntheticGeneratorService.submit_offline(
+            db=db,
+            dataset_id=generate_data.dataset_id,
+            segment_ids=generate_data.segment_ids,
+            max_items=generate_data.max_items,
+        )
+        return {
+            "status": "generating" if state["batches"] else "ready",
+            "generation_run_id": state["generation_run_id"],
+            "batch_ids": list(state["batches"]),
+        }
+
+    items_created = await SyntheticGeneratorService.generate_items(
         db=db,
         dataset_id=generate_data.dataset_id,
         segment_ids=generate_data.segment_ids,
         max_items=generate_data.max_items,
         batch_size=generate_data.batch_size,
     )
-    return {"status": "generating", "items_created": len(items)}
+    return {"status": "generating", "items_created": items_created}
+
 
+@router.post("/{dataset_id}/generate/ingest")
+async def ingest_offline_generation(
+    dataset_id: str,
+    db: AsyncSession = Depends(get_db_session),
+):
+    """Check the offline batch jobs of a dataset once and ingest the finished ones."""
+    return await SyntheticGeneratorService.ingest_offline(db=db, dataset_id=dataset_id)
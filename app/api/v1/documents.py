@@ -2,10 +2,11 @@
 
 from typing import List
 
-from fastapi import APIRouter, Depends, File, Query, UploadFile
+from fastapi import APIRouter, Depends, File, Query, Request, UploadFile
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_db_session
+from app.api.deps import get_db_session, get_read_db_session
+from app.api.responses import detail_response
 from app.schemas.document import DocumentProcess, DocumentResponse, DocumentUpload
 from app.services.ingestion_service import IngestionService
 from app.services.segmenter_service import SegmenterService
@@ -38,7 +39,7 @@ async def upload_document(
 @router.get("", response_model=List[DocumentResponse])
 async def list_documents(
     domain_id: str = None,
-    db: AsyncSession = Depends(get_db_session),
+    db: AsyncSession = Depends(get_read_db_session),
 ):
     """List documents."""
     from sqlalchemy import select
@@ -55,8 +56,9 @@ async def list_documents(
 
 @router.get("/{document_id}", response_model=DocumentResponse)
 async def get_document(
+    request: Request,
     document_id: str,
-    db: AsyncSession = Depends(get_db_session),
+    db: AsyncSession = Depends(get_read_db_session),
 ):
     """Get document by ID."""
     from sqlalchemy import select
@@ -67,7 +69,7 @@ async def get_document(
     document = result.scalar_one_or_none()
     if not document:
         raise NotFoundError("Document", document_id)
-    return DocumentResponse.model_validate(document)
+    return detail_response(request, DocumentResponse, document)
 
 
 @router.post("/{document_id}/process", status_code=202)
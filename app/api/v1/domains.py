@@ -2,10 +2,11 @@
 
 from typing import List
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_db_session
+from app.api.deps import get_db_session, get_read_db_session
+from app.api.responses import detail_response
 from app.schemas.common import PaginatedResponse, PaginationParams
 from app.schemas.domain import DomainCreate, DomainResponse, DomainUpdate
 from app.services.domain_service import DomainService
@@ -32,7 +33,7 @@ async def create_domain(
 @router.get("", response_model=List[DomainResponse])
 async def list_domains(
     active_only: bool = True,
-    db: AsyncSession = Depends(get_db_session),
+    db: AsyncSession = Depends(get_read_db_session),
 ):
     """List all domains."""
     domains = await DomainService.list_all(db=db, active_only=active_only)
@@ -41,12 +42,13 @@ async def list_domains(
 
 @router.get("/{domain_id}", response_model=DomainResponse)
 async def get_domain(
+    request: Request,
     domain_id: str,
-    db: AsyncSession = Depends(get_db_session),
+    db: AsyncSession = Depends(get_read_db_session),
 ):
     """Get domain by ID."""
     domain = await DomainService.get_by_id(db=db, domain_id=domain_id)
-    return DomainResponse.model_validate(domain)
+    return detail_response(request, DomainResponse, domain)
 
 
 @router.put("/{domain_id}", response_model=DomainResponse)
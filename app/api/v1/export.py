@@ -2,10 +2,16 @@
 
 from typing import List
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_db_session
+from app.api.deps import get_db_session, get_read_db_session
+from app.api.responses import (
+    is_not_modified,
+    list_response,
+    list_validators,
+    not_modified_response,
+)
 from app.schemas.export import ExportRequest, ExportResponse
 from app.services.export_service import ExportService
 
@@ -38,24 +44,28 @@ async def export_dataset(
 
 @router.get("/{dataset_id}/exports", response_model=List[ExportResponse])
 async def list_exports(
+    request: Request,
     dataset_id: str,
-    db: AsyncSession = Depends(get_db_session),
+    db: AsyncSession = Depends(get_read_db_session),
 ):
-    """List exports for a dataset."""
+    """List exports for a dataset (NDJSON with ``Accept: application/x-ndjson``)."""
     from sqlalchemy import select
     from app.models.dataset_export import DatasetExport
 
-    result = await db.execute(
-        select(DatasetExport).where(DatasetExport.dataset_id == dataset_id)
-    )
+    query = select(DatasetExport).where(DatasetExport.dataset_id == dataset_id)
+    etag, last_modified = await list_validators(request, db, query, "created_at")
+    if is_not_modified(request, etag, last_modified):
+        return not_modified_response(etag, last_modified)
+
+    result = await db.execute(query)
     exports = list(result.scalars().all())
-    return [ExportResponse.model_validate(e) for e in exports]
+    return list_response(request, ExportResponse, exports, etag, last_modified)
 
 
 @router.get("/exports/{export_id}/download")
 async def get_download_url(
     export_id: str,
-    db: AsyncSession = Depends(get_db_session),
+    db: AsyncSession = Depends(get_read_db_session),
 ):
     """Get download URL for an export."""
     from sqlalchemy import select
@@ -1,22 +1,44 @@
 """Health check endpoints."""
 
 from fastapi import APIRouter
+from fastapi.responses import JSONResponse
 
 router = APIRouter()
 
 
 @router.get("/health")
+@router.get("/health/live")
 async def health_check():
-    """Health check endpoint for EasyPanel."""
+    """Liveness check: the process serves requests (no dependency checks)."""
     return {"status": "healthy"}
 
 
+@router.get("/health/ready")
+async def readiness_check():
+    """Readiness check: 503 while the database or S3 is unreachable."""
+    from app.core.readiness import readiness_checker
+
+    result = await readiness_checker.check()
+    return JSONResponse(
+        status_code=200 if result["status"] == "ready" else 503,
+        content=result,
+    )
+
+
 @router.get("/health/detailed")
 async def health_check_detailed():
     """Detailed health check endpoint."""
+    from app.core.readiness import readiness_checker
+    from app.core.system_log import system_log_writer
+    from app.db.session import get_pool_metrics, replica_monitor
+
+    readiness = await readiness_checker.check()
     return {
-        "status": "healthy",
+        "status": "healthy" if readiness["status"] == "ready" else "unhealthy",
         "service": "VRForge",
         "version": "0.1.0",
+        "dependencies": readiness["checks"],
+        "database_pool": get_pool_metrics().snapshot(),
+        "database_replica": replica_monitor.status() if replica_monitor else None,
+        "system_log_writer": system_log_writer.stats(),
     }
-
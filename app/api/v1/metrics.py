@@ -0,0 +1,15 @@
+"""Prometheus metrics endpoint."""
+
+from fastapi import APIRouter, Response
+
+router = APIRouter()
+
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Expose metrics of all workers in the Prometheus text format."""
+    from app.core.metrics import refresh_review_queue_depth, render_metrics
+
+    await refresh_review_queue_depth()
+    payload, content_type = render_metrics()
+    return Response(content=payload, media_type=content_type)
@@ -2,10 +2,11 @@
 
 from typing import List
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_db_session
+from app.api.deps import get_db_session, get_read_db_session
+from app.api.responses import detail_response
 from app.schemas.model import ModelCreate, ModelResponse
 from app.services.model_service import ModelService
 
@@ -36,7 +37,7 @@ async def create_model(
 async def list_models(
     domain_id: str = None,
     provider: str = None,
-    db: AsyncSession = Depends(get_db_session),
+    db: AsyncSession = Depends(get_read_db_session),
 ):
     """List models."""
     models = await ModelService.list_all(db=db, domain_id=domain_id, provider=provider)
@@ -45,10 +46,11 @@ async def list_models(
 
 @router.get("/{model_id}", response_model=ModelResponse)
 async def get_model(
+    request: Request,
     model_id: str,
-    db: AsyncSession = Depends(get_db_session),
+    db: AsyncSession = Depends(get_read_db_session),
 ):
     """Get model by ID."""
     model = await ModelService.get_by_id(db=db, model_id=model_id)
-    return ModelResponse.model_validate(model)
+    return detail_response(request, ModelResponse, model)
 
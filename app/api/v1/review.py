@@ -2,10 +2,16 @@
 
 from typing import List
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_db_session
+from app.api.deps import get_db_session, get_read_db_session
+from app.api.responses import (
+    is_not_modified,
+    list_response,
+    list_validators,
+    not_modified_response,
+)
 from app.schemas.review import PendingReviewItem, ReviewApprove, ReviewEdit, ReviewReject, ReviewResponse
 from app.services.review_service import ReviewService
 
@@ -14,37 +20,27 @@ router = APIRouter(prefix="/dataset/review", tags=["review"])
 
 @router.get("/pending", response_model=List[PendingReviewItem])
 async def list_pending(
+    request: Request,
     dataset_id: str = None,
-    db: AsyncSession = Depends(get_db_session),
+    db: AsyncSession = Depends(get_read_db_session),
 ):
-    """List pending review items."""
-    items = await ReviewService.list_pending(db=db, dataset_id=dataset_id)
-
-    # Format response
-    result = []
-    for item in items:
-        from sqlalchemy import select
-        from app.models.dataset import Dataset
-        dataset_result = await db.execute(select(Dataset).where(Dataset.id == item.dataset_id))
-        dataset = dataset_result.scalar_one()
-
-        result.append(
-            PendingReviewItem(
-                id=item.id,
-                dataset_id=item.dataset_id,
-                dataset_name=dataset.name,
-                instruction=item.instruction,
-                input_text=item.input_text,
-                ideal_response=item.ideal_response,
-                bad_response=item.bad_response,
-                explanation=item.explanation,
-                quality_score=item.quality_score,
-                quality_flags=item.quality_flags,
-                created_at=item.created_at,
-            )
-        )
-
-    return result
+    """List pending review items (NDJSON with ``Accept: application/x-ndjson``)."""
+    from app.models.dataset import Dataset
+    from app.models.dataset_item import DatasetItem
+
+    query = ReviewService.pending_items_query(dataset_id)
+    # Edited items and renamed datasets change the list without changing its size
+    versions = query.add_columns(
+        DatasetItem.updated_at, Dataset.updated_at.label("dataset_updated_at")
+    )
+    etag, last_modified = await list_validators(
+        request, db, versions, "updated_at", "dataset_updated_at"
+    )
+    if is_not_modified(request, etag, last_modified):
+        return not_modified_response(etag, last_modified)
+
+    result = await db.execute(query)
+    return list_response(request, PendingReviewItem, result.all(), etag, last_modified)
 
 
 @router.post("/{item_id}/approve", response_model=ReviewResponse)
@@ -103,7 +99,7 @@ async def edit_item(
 @router.get("/{item_id}/history", response_model=List[ReviewResponse])
 async def get_review_history(
     item_id: str,
-    db: AsyncSession = Depends(get_db_session),
+    db: AsyncSession = Depends(get_read_db_session),
 ):
     """Get review history for an item."""
     from sqlalchemy import select
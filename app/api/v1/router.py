@@ -2,7 +2,7 @@
 
 from fastapi import APIRouter
 
-from app.api.v1 import datasets, domains, documents, export, health, models, review, segments, templates, training_jobs
+from app.api.v1 import admin, datasets, domains, documents, export, health, models, review, segments, templates, training_jobs
 
 api_router = APIRouter()
 
@@ -16,4 +16,5 @@ api_router.include_router(review.router)
 api_router.include_router(export.router)
 api_router.include_router(models.router)
 api_router.include_router(training_jobs.router)
+api_router.include_router(admin.router)
 
@@ -2,10 +2,17 @@
 
 from typing import List
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_db_session
+from app.api.deps import get_read_db_session
+from app.api.responses import (
+    detail_response,
+    is_not_modified,
+    list_response,
+    list_validators,
+    not_modified_response,
+)
 from app.schemas.segment import SegmentResponse
 from app.services.segmenter_service import SegmenterService
 
@@ -14,27 +21,29 @@ router = APIRouter(prefix="/segments", tags=["segments"])
 
 @router.get("", response_model=List[SegmentResponse])
 async def list_segments(
+    request: Request,
     domain_id: str = Query(None),
     document_id: str = Query(None),
     use_case: str = Query(None),
     segment_type: str = Query(None),
-    db: AsyncSession = Depends(get_db_session),
+    db: AsyncSession = Depends(get_read_db_session),
 ):
-    """List segments with filters."""
-    segments = await SegmenterService.get_segments(
-        db=db,
-        domain_id=domain_id,
-        document_id=document_id,
-        use_case=use_case,
-        segment_type=segment_type,
-    )
-    return [SegmentResponse.model_validate(s) for s in segments]
+    """List segments with filters (NDJSON with ``Accept: application/x-ndjson``)."""
+    query = SegmenterService.segments_query(domain_id, document_id, use_case, segment_type)
+    etag, last_modified = await list_validators(request, db, query, "created_at")
+    if is_not_modified(request, etag, last_modified):
+        return not_modified_response(etag, last_modified)
+
+    result = await db.execute(query)
+    segments = list(result.scalars().all())
+    return list_response(request, SegmentResponse, segments, etag, last_modified)
 
 
 @router.get("/{segment_id}", response_model=SegmentResponse)
 async def get_segment(
+    request: Request,
     segment_id: str,
-    db: AsyncSession = Depends(get_db_session),
+    db: AsyncSession = Depends(get_read_db_session),
 ):
     """Get segment by ID."""
     from sqlalchemy import select
@@ -45,5 +54,5 @@ async def get_segment(
     segment = result.scalar_one_or_none()
     if not segment:
         raise NotFoundError("Segment", segment_id)
-    return SegmentResponse.model_validate(segment)
+    return detail_response(request, SegmentResponse, segment)
 
@@ -2,10 +2,11 @@
 
 from typing import List
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_db_session
+from app.api.deps import get_db_session, get_read_db_session
+from app.api.responses import detail_response
 from app.schemas.template import TemplateCreate, TemplateResponse, TemplateUpdate
 
 router = APIRouter(prefix="/templates", tags=["templates"])
@@ -18,6 +19,10 @@ async def create_template(
 ):
     """Create a new generation template."""
     from app.models.generation_template import GenerationTemplate
+    from app.services.prompt_template import compile_template
+
+    # Reject templates that would fail to render during generation
+    compile_template(template_data.user_prompt_template)
 
     template = GenerationTemplate(
         domain_id=template_data.domain_id,
@@ -40,7 +45,7 @@ async def create_template(
 async def list_templates(
     domain_id: str = None,
     use_case: str = None,
-    db: AsyncSession = Depends(get_db_session),
+    db: AsyncSession = Depends(get_read_db_session),
 ):
     """List templates."""
     from sqlalchemy import select
@@ -60,8 +65,9 @@ async def list_templates(
 
 @router.get("/{template_id}", response_model=TemplateResponse)
 async def get_template(
+    request: Request,
     template_id: str,
-    db: AsyncSession = Depends(get_db_session),
+    db: AsyncSession = Depends(get_read_db_session),
 ):
     """Get template by ID."""
     from sqlalchemy import select
@@ -74,5 +80,5 @@ async def get_template(
     template = result.scalar_one_or_none()
     if not template:
         raise NotFoundError("GenerationTemplate", template_id)
-    return TemplateResponse.model_validate(template)
+    return detail_response(request, TemplateResponse, template)
 
@@ -2,10 +2,11 @@
 
 from typing import List
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_db_session
+from app.api.deps import get_db_session, get_read_db_session
+from app.api.responses import detail_response
 from app.schemas.training_job import TrainingJobCreate, TrainingJobResponse
 from app.services.training_service import TrainingService
 
@@ -33,7 +34,7 @@ async def create_training_job(
 async def list_training_jobs(
     model_id: str = None,
     status: str = None,
-    db: AsyncSession = Depends(get_db_session),
+    db: AsyncSession = Depends(get_read_db_session),
 ):
     """List training jobs."""
     jobs = await TrainingService.list_all(db=db, model_id=model_id, status=status)
@@ -42,10 +43,11 @@ async def list_training_jobs(
 
 @router.get("/{job_id}", response_model=TrainingJobResponse)
 async def get_training_job(
+    request: Request,
     job_id: str,
-    db: AsyncSession = Depends(get_db_session),
+    db: AsyncSession = Depends(get_read_db_session),
 ):
     """Get training job by ID."""
     job = await TrainingService.get_by_id(db=db, job_id=job_id)
-    return TrainingJobResponse.model_validate(job)
+    return detail_response(request, TrainingJobResponse, job)
 
@@ -0,0 +1,193 @@
+"""Response compression (brotli or gzip) negotiated from ``Accept-Encoding``.
+
+Text responses (JSON, NDJSON, ``text/*``) are compressed with brotli when the
+client accepts it, otherwise with gzip. A response sent in one piece is
+compressed whole when it reaches ``COMPRESSION_MINIMUM_SIZE``; a streamed
+response (NDJSON lists) is compressed chunk by chunk, each chunk flushed so
+the client can decode rows as they arrive.
+"""
+
+import zlib
+from typing import Optional
+
+import brotli
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import get_settings
+
+settings = get_settings()
+
+# Preferred first
+ENCODINGS = ("br", "gzip")
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/x-ndjson",
+    "application/javascript",
+    "application/xml",
+    "text/",
+)
+# Responses without a body, or with a body that must not be re-encoded
+SKIPPED_STATUSES = {204, 206, 304}
+
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    """Pick the preferred encoding accepted by the client.
+
+    Args:
+        accept_encoding: ``Accept-Encoding`` request header
+
+    Returns:
+        ``br``, ``gzip``, or None to send the response as is
+    """
+    qualities: dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.partition(";")
+        quality = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[name.strip().lower()] = quality
+
+    for encoding in ENCODINGS:
+        if qualities.get(encoding, qualities.get("*", 0.0)) > 0:
+            return encoding
+    return None
+
+
+def is_compressible(content_type: str) -> bool:
+    """Check whether a content type is worth compressing."""
+    content_type = content_type.lower()
+    return content_type.endswith("+json") or content_type.startswith(COMPRESSIBLE_TYPES)
+
+
+class _GzipEncoder:
+    def __init__(self, level: int):
+        # wbits=31: deflate with a gzip header and trailer
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+class _BrotliEncoder:
+    def __init__(self, quality: int):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data) + self._compressor.flush()
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+class CompressionMiddleware:
+    """Pure ASGI middleware compressing text responses.
+
+    Responses that already have a ``Content-Encoding``, partial or empty
+    responses, ``HEAD`` requests and non-text content types pass through.
+    Compressible responses get ``Vary: Accept-Encoding`` whether or not they
+    end up compressed, so shared caches keep one copy per encoding.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: Optional[int] = None,
+        gzip_level: Optional[int] = None,
+        brotli_quality: Optional[int] = None,
+    ):
+        """Initialize compression middleware.
+
+        Args:
+            app: ASGI application
+            minimum_size: Smallest body compressed, in bytes (default: settings)
+            gzip_level: gzip level 1-9 (default: settings)
+            brotli_quality: brotli quality 0-11 (default: settings)
+        """
+        self.app = app
+        self.minimum_size = (
+            settings.COMPRESSION_MINIMUM_SIZE if minimum_size is None else minimum_size
+        )
+        self.gzip_level = settings.COMPRESSION_GZIP_LEVEL if gzip_level is None else gzip_level
+        self.brotli_quality = (
+            settings.COMPRESSION_BROTLI_QUALITY if brotli_quality is None else brotli_quality
+        )
+
+    def _encoder(self, encoding: str):
+        if encoding == "br":
+            return _BrotliEncoder(self.brotli_quality)
+        return _GzipEncoder(self.gzip_level)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] == "HEAD":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        start_message: Optional[Message] = None
+        encoder = None
+        passthrough = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal start_message, encoder, passthrough
+
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message.get("headers", []))
+                if (
+                    message["status"] in SKIPPED_STATUSES
+                    or "content-encoding" in headers
+                    or not is_compressible(headers.get("content-type", ""))
+                ):
+                    passthrough = True
+                    await send(message)
+                else:
+                    # Held until the first body chunk shows the response size
+                    start_message = message
+                return
+
+            if passthrough or message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+            if start_message is not None:
+                start_message["headers"] = list(start_message.get("headers", []))
+                headers = MutableHeaders(raw=start_message["headers"])
+                headers.add_vary_header("Accept-Encoding")
+                if encoding is None or (not more_body and len(body) < self.minimum_size):
+                    passthrough = True
+                    await send(start_message)
+                    await send(message)
+                    return
+
+                encoder = self._encoder(encoding)
+                headers["Content-Encoding"] = encoding
+                if more_body:
+                    # Streamed: the compressed length is unknown
+                    del headers["Content-Length"]
+                else:
+                    body = encoder.compress(body) + encoder.finish()
+                    headers["Content-Length"] = str(len(body))
+                    await send(start_message)
+                    await send({"type": "http.response.body", "body": body})
+                    return
+                await send(start_message)
+                start_message = None
+
+            if more_body:
+                chunk = encoder.compress(body) if body else b""
+            else:
+                chunk = (encoder.compress(body) if body else b"") + encoder.finish()
+            await send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+
+        await self.app(scope, receive, send_wrapper)
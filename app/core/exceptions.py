@@ -57,6 +57,17 @@ class ValidationError(VRForgeException):
         )
 
 
+class PermissionDeniedError(VRForgeException):
+    """Permission denied exception."""
+
+    def __init__(self, message: str, details: Optional[Dict[str, Any]] = None):
+        super().__init__(
+            message=message,
+            status_code=403,
+            details=details,
+        )
+
+
 class ExternalServiceError(VRForgeException):
     """External service error exception."""
 
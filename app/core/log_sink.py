@@ -0,0 +1,172 @@
+"""Queue-backed log sink drained by a background thread."""
+
+import json
+import os
+import queue
+import sys
+import threading
+import weakref
+from typing import Any, Optional, TextIO, Union
+
+# Default bound of queued log lines; lines beyond it are dropped, not waited for
+DEFAULT_QUEUE_SIZE = 10_000
+# Default maximum number of lines written per batch
+DEFAULT_BATCH_SIZE = 256
+
+_STOP = object()
+
+
+class QueueLogSink:
+    """Non-blocking log sink writing batched lines from a background thread.
+
+    ``write`` only enqueues, so logging never waits on the output stream. When
+    the queue is full the line is dropped and counted; the writer reports the
+    number of dropped lines with the next batch. The writer thread of a sink
+    that is still open is restarted in forked child processes.
+    """
+
+    def __init__(
+        self,
+        stream: Optional[TextIO] = None,
+        max_queue_size: int = DEFAULT_QUEUE_SIZE,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ):
+        """Initialize sink and start its writer thread.
+
+        Args:
+            stream: Output stream (default: ``sys.stdout`` at creation)
+            max_queue_size: Maximum number of queued lines
+            batch_size: Maximum number of lines per write
+        """
+        self.stream = stream or sys.stdout
+        self.max_queue_size = max_queue_size
+        self.batch_size = batch_size
+        self.written = 0
+        self.dropped = 0
+        self._unreported_drops = 0
+        self._closed = False
+        self._start()
+        if hasattr(os, "register_at_fork"):
+            # Fork hooks cannot be unregistered: hold the sink weakly
+            sink_ref = weakref.ref(self)
+            os.register_at_fork(after_in_child=lambda: QueueLogSink._restart_in_child(sink_ref))
+
+    @staticmethod
+    def _restart_in_child(sink_ref: "weakref.ref[QueueLogSink]") -> None:
+        """Restart the writer thread after a fork, unless the sink is closed or gone."""
+        sink = sink_ref()
+        if sink is not None and not sink._closed:
+            sink._start()
+
+    def _start(self) -> None:
+        """Create the queue and start the writer thread."""
+        self._queue: queue.Queue = queue.Queue(maxsize=self.max_queue_size)
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="log-sink", daemon=True)
+        self._thread.start()
+
+    def write(self, line: Union[str, bytes]) -> None:
+        """Enqueue a rendered log line without blocking."""
+        try:
+            self._queue.put_nowait(line)
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+                self._unreported_drops += 1
+
+    def _run(self) -> None:
+        """Drain the queue in batches until stopped."""
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            stop = any(item is _STOP for item in batch)
+            self._write_batch([item for item in batch if item is not _STOP])
+            if stop:
+                return
+
+    def _write_batch(self, batch: list[Union[str, bytes]]) -> None:
+        """Write a batch of lines with a single write and flush."""
+        with self._lock:
+            dropped, self._unreported_drops = self._unreported_drops, 0
+        lines = [line.encode("utf-8") if isinstance(line, str) else line for line in batch]
+        if dropped:
+            notice = {"event": "Log lines dropped", "level": "warning", "dropped": dropped}
+            lines.append(json.dumps(notice).encode("utf-8"))
+        if not lines:
+            return
+
+        data = b"\n".join(lines) + b"\n"
+        try:
+            buffer = getattr(self.stream, "buffer", None)
+            if buffer is not None:
+                buffer.write(data)
+                buffer.flush()
+            else:
+                self.stream.write(data.decode("utf-8", errors="replace"))
+                self.stream.flush()
+            self.written += len(batch)
+        except Exception:
+            # Logging must never take the writer thread down
+            pass
+
+    def close(self, timeout: float = 2.0) -> None:
+        """Flush queued lines and stop the writer thread.
+
+        Args:
+            timeout: Maximum seconds to wait for the flush
+        """
+        self._closed = True
+        if not self._thread.is_alive():
+            return
+        try:
+            self._queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            return
+        self._thread.join(timeout)
+
+    def stats(self) -> dict[str, Any]:
+        """Get sink counters for monitoring."""
+        return {
+            "queued": self._queue.qsize(),
+            "written": self.written,
+            "dropped": self.dropped,
+        }
+
+
+class QueueLogger:
+    """structlog logger writing rendered events to a ``QueueLogSink``."""
+
+    def __init__(self, sink: QueueLogSink):
+        """Initialize logger.
+
+        Args:
+            sink: Sink receiving rendered lines
+        """
+        self._sink = sink
+
+    def msg(self, message: Union[str, bytes]) -> None:
+        """Enqueue a rendered event."""
+        self._sink.write(message)
+
+    log = debug = info = warn = warning = msg
+    fatal = failure = err = error = critical = exception = msg
+
+
+class QueueLoggerFactory:
+    """structlog logger factory sharing one ``QueueLogSink``."""
+
+    def __init__(self, sink: QueueLogSink):
+        """Initialize factory.
+
+        Args:
+            sink: Sink shared by all loggers
+        """
+        self.sink = sink
+
+    def __call__(self, *args: Any) -> QueueLogger:
+        return QueueLogger(self.sink)
@@ -1,13 +1,26 @@
 """Structured logging configuration."""
 
+import atexit
 import logging
 import sys
 from datetime import datetime
 from typing import Any, Optional
 
+import orjson
 import structlog
+from opentelemetry import trace
 from structlog.processors import CallsiteParameter
 
+from app.core.log_sink import (
+    DEFAULT_BATCH_SIZE,
+    DEFAULT_QUEUE_SIZE,
+    QueueLoggerFactory,
+    QueueLogSink,
+)
+
+# Sink of the current logging configuration (None when writing synchronously)
+_log_sink: Optional[QueueLogSink] = None
+
 
 def _add_timestamp(logger, method_name, event_dict):
     """Add ISO 8601 timestamp to log event."""
@@ -15,6 +28,15 @@ def _add_timestamp(logger, method_name, event_dict):
     return event_dict
 
 
+def _add_trace_context(logger, method_name, event_dict):
+    """Add the trace and span IDs of the current span, if any."""
+    context = trace.get_current_span().get_span_context()
+    if context.is_valid:
+        event_dict["trace_id"] = trace.format_trace_id(context.trace_id)
+        event_dict["span_id"] = trace.format_span_id(context.span_id)
+    return event_dict
+
+
 def _colorize_level(logger, method_name, event_dict):
     """Add color to log level for better readability."""
     level = event_dict.get("level", "").upper()
@@ -111,13 +133,26 @@ def _format_url(logger, method_name, event_dict):
     return event_dict
 
 
-def configure_logging(log_level: str = "INFO", app_env: str = "development") -> None:
+def configure_logging(
+    log_level: str = "INFO",
+    app_env: str = "development",
+    async_sink: bool = False,
+    queue_size: int = DEFAULT_QUEUE_SIZE,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    trace_context: bool = False,
+) -> None:
     """Configure structured logging for the application.
     
     Args:
         log_level: Logging level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
         app_env: Application environment (development, production)
+        async_sink: Write through a queue drained by a background thread
+        queue_size: Maximum queued lines of the async sink (extra lines are dropped)
+        batch_size: Maximum lines per write of the async sink
+        trace_context: Add trace_id/span_id of the current span to every event
     """
+    global _log_sink
+
     # Configure standard library logging
     logging.basicConfig(
         format="%(message)s",
@@ -148,6 +183,8 @@ def configure_logging(log_level: str = "INFO", app_env: str = "development") ->
     
     # Add timestamp processor
     processors.append(_add_timestamp)
+    if trace_context:
+        processors.append(_add_trace_context)
     
     # Choose renderer based on environment
     if is_dev:
@@ -160,11 +197,24 @@ def configure_logging(log_level: str = "INFO", app_env: str = "development") ->
             structlog.dev.ConsoleRenderer(colors=True),
         ])
     else:
-        # Production: JSON output
+        # Production: JSON output (rendered to bytes by orjson)
         processors.extend([
             _format_url,
-            structlog.processors.JSONRenderer(),
+            structlog.processors.JSONRenderer(
+                serializer=orjson.dumps, option=orjson.OPT_NON_STR_KEYS
+            ),
         ])
+
+    if _log_sink is not None:
+        _log_sink.close()
+        _log_sink = None
+    if async_sink:
+        _log_sink = QueueLogSink(max_queue_size=queue_size, batch_size=batch_size)
+        logger_factory = QueueLoggerFactory(_log_sink)
+    elif is_dev:
+        logger_factory = structlog.PrintLoggerFactory()
+    else:
+        logger_factory = structlog.BytesLoggerFactory()
     
     # Configure structlog
     structlog.configure(
@@ -173,11 +223,23 @@ def configure_logging(log_level: str = "INFO", app_env: str = "development") ->
             getattr(logging, log_level.upper())
         ),
         context_class=dict,
-        logger_factory=structlog.PrintLoggerFactory(),
+        logger_factory=logger_factory,
         cache_logger_on_first_use=True,
     )
 
 
+def get_log_sink() -> Optional[QueueLogSink]:
+    """Get the async log sink, if logging is configured with one."""
+    return _log_sink
+
+
+@atexit.register
+def _flush_log_sink() -> None:
+    """Flush queued log lines at interpreter exit."""
+    if _log_sink is not None:
+        _log_sink.close()
+
+
 def get_logger(name: str) -> Any:
     """Get a structured logger instance.
     
@@ -0,0 +1,267 @@
+"""Prometheus metrics and the middleware recording request latency.
+
+Metrics are aggregated across gunicorn workers when ``PROMETHEUS_MULTIPROC_DIR``
+is set (see ``gunicorn.conf.py``); each worker then writes its samples to
+memory-mapped files in that directory and ``/metrics`` merges them.
+"""
+
+import os
+import time
+from typing import Any, Optional
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import get_settings
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+settings = get_settings()
+
+# Label used for requests that matched no route (keeps label cardinality bounded)
+UNMATCHED_ROUTE = "unmatched"
+
+HTTP_REQUEST_DURATION = Histogram(
+    "vrforge_http_request_duration_seconds",
+    "HTTP request latency by route template",
+    ["method", "route", "status"],
+)
+HTTP_REQUESTS_IN_PROGRESS = Gauge(
+    "vrforge_http_requests_in_progress",
+    "HTTP requests being served",
+    multiprocess_mode="livesum",
+)
+
+DB_POOL_CONNECTIONS = Gauge(
+    "vrforge_db_pool_connections",
+    "Connections of the database pool by state",
+    ["pool", "state"],
+    multiprocess_mode="livesum",
+)
+DB_POOL_CHECKOUTS = Counter(
+    "vrforge_db_pool_checkouts", "Connections checked out of the pool", ["pool"]
+)
+DB_POOL_CHECKOUT_WAIT = Counter(
+    "vrforge_db_pool_checkout_wait_seconds", "Time spent waiting for a connection", ["pool"]
+)
+DB_POOL_TIMEOUTS = Counter(
+    "vrforge_db_pool_timeouts", "Checkouts that gave up after the pool timeout", ["pool"]
+)
+DB_POOL_CONNECTS = Counter(
+    "vrforge_db_pool_connects", "New database connections opened", ["pool"]
+)
+
+S3_REQUEST_DURATION = Histogram(
+    "vrforge_s3_request_duration_seconds", "S3 request latency", ["operation", "outcome"]
+)
+S3_TRANSFER_BYTES = Counter(
+    "vrforge_s3_transfer_bytes", "Bytes transferred to and from S3", ["operation"]
+)
+
+EXTRACTION_DURATION = Histogram(
+    "vrforge_extraction_duration_seconds",
+    "Text extraction time by document content type",
+    ["content_type"],
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60),
+)
+
+LLM_REQUEST_DURATION = Histogram(
+    "vrforge_llm_request_duration_seconds",
+    "LLM call latency by provider and model",
+    ["provider", "model"],
+    buckets=(0.25, 0.5, 1, 2, 5, 10, 20, 30, 60, 120),
+)
+LLM_TOKENS = Counter(
+    "vrforge_llm_tokens", "LLM tokens by provider, model and kind", ["provider", "model", "kind"]
+)
+LLM_ERRORS = Counter(
+    "vrforge_llm_errors", "Failed LLM calls by provider and model", ["provider", "model", "reason"]
+)
+
+GENERATION_ITEMS = Counter(
+    "vrforge_generation_items", "Generated dataset items (rate gives items/s)", ["mode"]
+)
+GENERATION_DURATION = Histogram(
+    "vrforge_generation_duration_seconds",
+    "Duration of a dataset generation run",
+    ["mode"],
+    buckets=(1, 5, 15, 30, 60, 120, 300, 600, 1800, 3600),
+)
+
+REVIEW_QUEUE_DEPTH = Gauge(
+    "vrforge_review_queue_depth",
+    "Dataset items pending review",
+    multiprocess_mode="mostrecent",
+)
+
+LOG_LINES_DROPPED = Counter("vrforge_log_lines_dropped", "Log lines dropped by the log queue")
+SYSTEM_LOG_ROWS = Counter(
+    "vrforge_system_log_rows", "system_logs rows by outcome of the batched writer", ["outcome"]
+)
+
+# Per-process state copied into the metrics at most this often (seconds)
+PROCESS_METRICS_INTERVAL = 5.0
+
+_last_refresh = 0.0
+# Last value seen of each per-process cumulative count, to increment counters by the delta
+_last_seen: dict[tuple[Any, ...], float] = {}
+_review_queue_checked_at: Optional[float] = None
+
+
+def _inc_by_delta(counter: Any, key: tuple[Any, ...], value: float) -> None:
+    """Increment a counter by the growth of a cumulative value since the last call."""
+    delta = value - _last_seen.get(key, 0.0)
+    if delta > 0:
+        counter.inc(delta)
+    _last_seen[key] = value
+
+
+def refresh_process_metrics(force: bool = False) -> None:
+    """Copy pool, log queue and system log writer state into the metrics.
+
+    Throttled to once per ``PROCESS_METRICS_INTERVAL`` unless ``force`` is set.
+    """
+    global _last_refresh
+
+    now = time.monotonic()
+    if not force and now - _last_refresh < PROCESS_METRICS_INTERVAL:
+        return
+    _last_refresh = now
+
+    from app.core.logging import get_log_sink
+    from app.core.system_log import system_log_writer
+    from app.db.session import engine, read_engine
+
+    pools = {"primary": engine, "replica": read_engine}
+    for name, pool_engine in pools.items():
+        if pool_engine is None:
+            continue
+        stats = pool_engine.sync_engine.pool.metrics.snapshot()
+        for state in ("size", "checked_out", "checked_in", "overflow"):
+            DB_POOL_CONNECTIONS.labels(pool=name, state=state).set(stats.get(state, 0))
+        _inc_by_delta(DB_POOL_CHECKOUTS.labels(pool=name), (name, "checkouts"), stats["checkouts"])
+        _inc_by_delta(
+            DB_POOL_CHECKOUT_WAIT.labels(pool=name),
+            (name, "wait"),
+            stats["wait_ms_total"] / 1000,
+        )
+        _inc_by_delta(DB_POOL_TIMEOUTS.labels(pool=name), (name, "timeouts"), stats["timeouts"])
+        _inc_by_delta(DB_POOL_CONNECTS.labels(pool=name), (name, "connects"), stats["connects"])
+
+    sink = get_log_sink()
+    if sink is not None:
+        _inc_by_delta(LOG_LINES_DROPPED, ("log_sink", "dropped"), sink.dropped)
+
+    writer_stats = system_log_writer.stats()
+    for outcome in ("written", "dropped", "failed"):
+        _inc_by_delta(
+            SYSTEM_LOG_ROWS.labels(outcome=outcome),
+            ("system_log", outcome),
+            writer_stats[outcome],
+        )
+
+
+async def refresh_review_queue_depth() -> None:
+    """Count pending review items, at most once per ``METRICS_REVIEW_QUEUE_TTL_SECONDS``."""
+    global _review_queue_checked_at
+
+    now = time.monotonic()
+    if (
+        _review_queue_checked_at is not None
+        and now - _review_queue_checked_at < settings.METRICS_REVIEW_QUEUE_TTL_SECONDS
+    ):
+        return
+    _review_queue_checked_at = now
+
+    from sqlalchemy import func, select
+
+    from app.db.session import AsyncSessionLocal
+    from app.services.review_service import ReviewService
+
+    query = select(func.count()).select_from(
+        ReviewService.pending_query().order_by(None).subquery()
+    )
+    try:
+        async with AsyncSessionLocal() as session:
+            REVIEW_QUEUE_DEPTH.set((await session.execute(query)).scalar_one())
+    except Exception as e:
+        logger.warning("Review queue depth refresh failed", error=str(e))
+
+
+def render_metrics() -> tuple[bytes, str]:
+    """Render all metrics in the Prometheus text format.
+
+    Returns:
+        Tuple of (payload, content type)
+    """
+    refresh_process_metrics(force=True)
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+def observe_llm_call(
+    provider: str, model: str, latency_ms: float, usage: Optional[dict[str, Any]] = None
+) -> None:
+    """Record a successful LLM call and its token usage."""
+    LLM_REQUEST_DURATION.labels(provider=provider, model=model).observe(latency_ms / 1000)
+    if usage:
+        for kind in ("prompt", "completion", "cached"):
+            tokens = usage.get(f"{kind}_tokens") or 0
+            if tokens:
+                LLM_TOKENS.labels(provider=provider, model=model, kind=kind).inc(tokens)
+
+
+def _route_template(scope: Scope) -> str:
+    """Get the matched route template, never the raw path."""
+    route = scope.get("route")
+    path = getattr(route, "path", None) if route is not None else None
+    return path or UNMATCHED_ROUTE
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware recording request latency per route template."""
+
+    def __init__(self, app: ASGIApp):
+        """Initialize metrics middleware.
+
+        Args:
+            app: ASGI application
+        """
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        HTTP_REQUESTS_IN_PROGRESS.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            HTTP_REQUESTS_IN_PROGRESS.dec()
+            HTTP_REQUEST_DURATION.labels(
+                method=scope["method"], route=_route_template(scope), status=str(status)
+            ).observe(time.perf_counter() - start)
+            refresh_process_metrics()
@@ -1,313 +1,339 @@
 """HTTP middleware for request logging and tracking."""
 
+import json
+import math
+import random
 import time
 import uuid
-from typing import Callable, Optional
+from contextlib import nullcontext
+from typing import Any, Optional
+from urllib.parse import parse_qsl
 
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.types import ASGIApp
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from app.core.config import get_settings
-from app.core.logging import get_logger, set_request_id, clear_request_context
+from app.core.logging import clear_request_context, get_logger, set_request_id
+from app.core.tracing import finish_request_span, request_span, tracing_enabled
 
 logger = get_logger(__name__)
 settings = get_settings()
 
+DETAIL_LEVELS = {"minimal", "standard", "verbose"}
+SENSITIVE_HEADERS = {"authorization", "cookie", "x-api-key", "x-auth-token", "x-admin-key"}
+REDACTED = "***REDACTED***"
+# Characters of a non-JSON request body kept in the log
+MAX_LOGGED_BODY_CHARS = 500
 
-class LoggingMiddleware(BaseHTTPMiddleware):
-    """Middleware for logging HTTP requests and responses."""
+# Cookie holding the epoch until which the client's reads stay on the primary
+PRIMARY_STICKY_COOKIE = "vrforge_read_primary_until"
+# Request state key set by write requests (see ``ReadYourWritesMiddleware``)
+READ_PRIMARY_UNTIL_STATE = "read_primary_until"
 
-    def __init__(self, app: ASGIApp, log_request_body: bool = False, log_response_body: bool = False):
+
+def _redact(headers: list[tuple[bytes, bytes]]) -> dict[str, str]:
+    """Decode raw headers, hiding sensitive values."""
+    decoded = {}
+    for raw_name, raw_value in headers:
+        name = raw_name.decode("latin-1")
+        if name.lower() in SENSITIVE_HEADERS:
+            decoded[name] = REDACTED
+        else:
+            decoded[name] = raw_value.decode("latin-1")
+    return decoded
+
+
+def _route_path(scope: Scope) -> str:
+    """Get the matched route template, or the raw path before routing."""
+    route = scope.get("route")
+    if route is not None:
+        path = getattr(route, "path", None) or getattr(route, "name", None)
+        if path:
+            return path
+    return scope["path"]
+
+
+class RequestLoggingMiddleware:
+    """Pure ASGI middleware logging HTTP requests, responses and CORS events.
+
+    Only the fields needed by ``LOG_REQUEST_DETAILS`` are computed, response
+    bodies (including streaming ones) are passed through untouched and an
+    ``X-Request-ID`` header is added to every response. Successful requests
+    on paths listed in ``LOG_SAMPLE_RATES`` are logged at the configured rate.
+    With tracing enabled, the request runs inside a server span tagged with
+    the request ID. Register it last so it is the outermost middleware and
+    sees CORS preflights and headers.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        log_request_body: bool = False,
+        detail_level: Optional[str] = None,
+    ):
         """Initialize logging middleware.
-        
+
         Args:
             app: ASGI application
             log_request_body: Whether to log request body (default: False, only in DEBUG)
-            log_response_body: Whether to log response body (default: False)
+            detail_level: minimal, standard or verbose (default: ``LOG_REQUEST_DETAILS``)
         """
-        super().__init__(app)
+        self.app = app
         self.log_request_body = log_request_body
-        self.log_response_body = log_response_body
+        self.detail_level = (detail_level or settings.LOG_REQUEST_DETAILS).lower()
+        if self.detail_level not in DETAIL_LEVELS:
+            self.detail_level = "standard"
+        self.log_cors = settings.LOG_LEVEL.upper() == "DEBUG"
+
+        # Request headers read once per request, depending on the detail level
+        wanted = {b"origin", b"host"}
+        if self.detail_level != "minimal":
+            if settings.LOG_USER_AGENT:
+                wanted.add(b"user-agent")
+            if settings.LOG_REFERER:
+                wanted.add(b"referer")
+        if self.log_cors:
+            wanted.update({b"access-control-request-method", b"access-control-request-headers"})
+        self._wanted_headers = frozenset(wanted)
+
+        # Path prefixes whose successful requests are sampled, longest first
+        self._sample_rates = sorted(
+            settings.LOG_SAMPLE_RATES.items(), key=lambda item: len(item[0]), reverse=True
+        )
+
+    def _sample_rate(self, path: str) -> Optional[float]:
+        """Get the success log sample rate of a path (None when not sampled)."""
+        for prefix, rate in self._sample_rates:
+            if path.startswith(prefix):
+                return rate
+        return None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
-    def _get_route_name(self, request: Request) -> Optional[str]:
-        """Try to identify the API route being called.
-        
-        Args:
-            request: FastAPI request object
-            
-        Returns:
-            Route name or None if not identifiable
-        """
-        # Try to get route from scope
-        route = request.scope.get("route")
-        if route:
-            if hasattr(route, "path"):
-                return route.path
-            if hasattr(route, "name"):
-                return route.name
-        
-        # Fallback: use path
-        return request.url.path
-    
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        """Process request and log details.
-        
-        Args:
-            request: FastAPI request object
-            call_next: Next middleware/handler
-            
-        Returns:
-            Response object
-        """
-        # Generate unique request ID
         request_id = str(uuid.uuid4())
         set_request_id(request_id)
-        
-        # Start timing
-        start_time = time.time()
-        
-        # Extract request details
-        method = request.method
-        path = request.url.path
-        query_params = dict(request.query_params)
-        client_ip = request.client.host if request.client else "unknown"
-        
-        # Get full URL
-        full_url = str(request.url)
-        
-        # Try to identify route
-        route_name = self._get_route_name(request)
-        
-        # Extract headers
-        headers = dict(request.headers)
-        sensitive_headers = {"authorization", "cookie", "x-api-key", "x-auth-token"}
-        filtered_headers = {
-            k: "***REDACTED***" if k.lower() in sensitive_headers else v
-            for k, v in headers.items()
+        start = time.perf_counter()
+
+        method = scope["method"]
+        path = scope["path"]
+        client = scope.get("client")
+        client_ip = client[0] if client else "unknown"
+        headers = {
+            name: value.decode("latin-1")
+            for name, value in scope["headers"]
+            if name in self._wanted_headers
         }
-        
-        # Extract User-Agent and Referer if configured
-        user_agent = headers.get("user-agent") if settings.LOG_USER_AGENT else None
-        referer = headers.get("referer") if settings.LOG_REFERER else None
-        origin = headers.get("origin")
-        
-        # Build log data based on detail level
-        log_detail_level = settings.LOG_REQUEST_DETAILS.lower()
-        
-        if log_detail_level == "minimal":
-            log_data = {
-                "method": method,
-                "path": path,
-                "client_ip": client_ip,
-            }
-        elif log_detail_level == "verbose":
-            log_data = {
-                "method": method,
-                "path": path,
-                "url": full_url,
-                "route": route_name,
-                "client_ip": client_ip,
-                "user_agent": user_agent,
-                "referer": referer,
-                "origin": origin,
-                "headers": filtered_headers,
-            }
-            if query_params:
-                log_data["query_params"] = query_params
-        else:  # standard
-            log_data = {
-                "method": method,
-                "path": path,
-                "url": full_url,
-                "route": route_name,
-                "client_ip": client_ip,
-            }
-            if user_agent:
-                log_data["user_agent"] = user_agent
-            if referer:
-                log_data["referer"] = referer
-            if origin:
+        origin = headers.get(b"origin")
+
+        url = None
+        if self.detail_level != "minimal":
+            host = headers.get(b"host", "")
+            query_string = scope.get("query_string", b"")
+            url = f"{scope.get('scheme', 'http')}://{host}{scope.get('root_path', '')}{path}"
+            if query_string:
+                url = f"{url}?{query_string.decode('latin-1')}"
+
+        # Sampled paths only log completions, so their errors are never lost
+        sample_rate = self._sample_rate(path)
+        if sample_rate is None:
+            log_data: dict[str, Any] = {"method": method, "path": path}
+            if url is not None:
+                log_data["url"] = url
+                log_data["route"] = path
+            log_data["client_ip"] = client_ip
+            if self.detail_level == "verbose":
+                log_data["user_agent"] = headers.get(b"user-agent")
+                log_data["referer"] = headers.get(b"referer")
                 log_data["origin"] = origin
-            if query_params:
-                log_data["query_params"] = query_params
-        
-        # Log request body if enabled (and in DEBUG mode)
-        if self.log_request_body:
+                log_data["headers"] = _redact(scope["headers"])
+            elif self.detail_level == "standard":
+                for key, name in (("user_agent", b"user-agent"), ("referer", b"referer")):
+                    if headers.get(name):
+                        log_data[key] = headers[name]
+                if origin:
+                    log_data["origin"] = origin
+            if url is not None and scope.get("query_string"):
+                query_string = scope["query_string"].decode("latin-1")
+                log_data["query_params"] = dict(parse_qsl(query_string))
+
+            if self.log_request_body:
+                receive = await self._buffer_body(receive, log_data)
+
+            logger.info("Request received", **log_data)
+
+        if self.log_cors and method == "OPTIONS":
+            logger.debug(
+                "CORS preflight request",
+                origin=origin,
+                method=method,
+                access_control_request_method=headers.get(b"access-control-request-method"),
+                access_control_request_headers=headers.get(b"access-control-request-headers"),
+            )
+
+        request_id_header = (b"x-request-id", request_id.encode("latin-1"))
+        response: dict[str, Any] = {}
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", ()), request_id_header]
+                response["status_code"] = message["status"]
+                response["headers"] = message["headers"]
+            await send(message)
+
+        span_context = request_span(scope, request_id) if tracing_enabled() else nullcontext()
+        with span_context as span:
             try:
-                # Read body without consuming it
-                body_bytes = await request.body()
-                if body_bytes:
-                    # Try to decode as JSON, fallback to string
-                    try:
-                        import json
-                        log_data["body"] = json.loads(body_bytes.decode())
-                    except:
-                        log_data["body"] = body_bytes.decode()[:500]  # Limit size
-                    # Re-create request with body for downstream handlers
-                    async def receive():
-                        return {"type": "http.request", "body": body_bytes}
-                    request._receive = receive
+                await self.app(scope, receive, send_wrapper)
             except Exception as e:
-                log_data["body_error"] = str(e)
-        
-        logger.info("Request received", **log_data)
-        
-        # Process request
-        try:
-            response = await call_next(request)
-            
-            # Calculate duration
-            duration_ms = (time.time() - start_time) * 1000
-            
-            # Extract response details
-            status_code = response.status_code
-            
-            # Determine log level based on status code
+                duration_ms = round((time.perf_counter() - start) * 1000, 2)
+                error_log: dict[str, Any] = {"method": method, "path": path}
+                if url is not None:
+                    error_log.update(url=url, route=_route_path(scope), client_ip=client_ip)
+                error_log.update(
+                    error_type=type(e).__name__,
+                    error_message=str(e),
+                    duration_ms=duration_ms,
+                )
+                logger.error("Request failed", **error_log, exc_info=True)
+                # Keep the request context: the outer error handler reports the request ID
+                raise
+            finally:
+                if span is not None:
+                    finish_request_span(
+                        span, method, _route_path(scope), response.get("status_code")
+                    )
+
+        duration_ms = round((time.perf_counter() - start) * 1000, 2)
+        status_code = response.get("status_code", 500)
+        sampled_out = (
+            sample_rate is not None and status_code < 400 and random.random() >= sample_rate
+        )
+        if not sampled_out:
+            response_log: dict[str, Any] = {"method": method, "path": path}
+            if url is not None:
+                response_log["url"] = url
+                response_log["route"] = _route_path(scope)
+            response_log["status_code"] = status_code
+            response_log["duration_ms"] = duration_ms
+            if self.detail_level == "verbose":
+                response_log["response_headers"] = _redact(response.get("headers", []))
+            if sample_rate is not None and status_code < 400:
+                response_log["sample_rate"] = sample_rate
+
             if status_code >= 500:
-                log_level = "error"
+                logger.error("Request completed", **response_log)
             elif status_code >= 400:
-                log_level = "warning"
-            else:
-                log_level = "info"
-            
-            # Log response
-            log_detail_level = settings.LOG_REQUEST_DETAILS.lower()
-            
-            if log_detail_level == "minimal":
-                response_log = {
-                    "method": method,
-                    "path": path,
-                    "status_code": status_code,
-                    "duration_ms": round(duration_ms, 2),
-                }
-            elif log_detail_level == "verbose":
-                response_log = {
-                    "method": method,
-                    "path": path,
-                    "url": full_url,
-                    "route": route_name,
-                    "status_code": status_code,
-                    "duration_ms": round(duration_ms, 2),
-                }
-                # Add response headers (filtered)
-                response_headers = dict(response.headers)
-                filtered_response_headers = {
-                    k: "***REDACTED***" if k.lower() in sensitive_headers else v
-                    for k, v in response_headers.items()
-                }
-                response_log["response_headers"] = filtered_response_headers
-            else:  # standard
-                response_log = {
-                    "method": method,
-                    "path": path,
-                    "url": full_url,
-                    "route": route_name,
-                    "status_code": status_code,
-                    "duration_ms": round(duration_ms, 2),
-                }
-            
-            # Log response body if enabled
-            if self.log_response_body:
-                # Note: This requires reading the response body, which consumes it
-                # Only use for debugging specific routes
-                pass
-            
-            # Log with appropriate level
-            getattr(logger, log_level)("Request completed", **response_log)
-            
-            # Add request ID to response headers
-            response.headers["X-Request-ID"] = request_id
-            
-            return response
-            
-        except Exception as e:
-            # Calculate duration even on error
-            duration_ms = (time.time() - start_time) * 1000
-            
-            # Build error log based on detail level
-            log_detail_level = settings.LOG_REQUEST_DETAILS.lower()
-            
-            if log_detail_level == "minimal":
-                error_log = {
-                    "method": method,
-                    "path": path,
-                    "error_type": type(e).__name__,
-                    "error_message": str(e),
-                    "duration_ms": round(duration_ms, 2),
-                }
+                logger.warning("Request completed", **response_log)
             else:
-                error_log = {
-                    "method": method,
-                    "path": path,
-                    "url": full_url,
-                    "route": route_name,
-                    "client_ip": client_ip,
-                    "error_type": type(e).__name__,
-                    "error_message": str(e),
-                    "duration_ms": round(duration_ms, 2),
-                }
-            
-            logger.error("Request failed", **error_log, exc_info=True)
-            
-            # Re-raise exception
-            raise
-        finally:
-            # Clear context
-            clear_request_context()
-
-
-class CORSLoggingMiddleware(BaseHTTPMiddleware):
-    """Middleware for logging CORS-related events."""
-
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        """Process request and log CORS events.
-        
-        Args:
-            request: FastAPI request object
-            call_next: Next middleware/handler
-            
+                logger.info("Request completed", **response_log)
+
+        if origin:
+            self._log_cors_response(
+                scope, method, origin, headers.get(b"host"), status_code, response
+            )
+
+        clear_request_context()
+
+    async def _buffer_body(self, receive: Receive, log_data: dict[str, Any]) -> Receive:
+        """Read the request body into ``log_data`` and replay it downstream.
+
         Returns:
-            Response object
+            Receive callable yielding the buffered body first
         """
-        origin = request.headers.get("origin")
-        method = request.method
-        
-        # Check if this is a CORS preflight request
-        if method == "OPTIONS":
-            logger.debug(
-                "CORS preflight request",
-                origin=origin,
-                method=method,
-                access_control_request_method=request.headers.get("access-control-request-method"),
-                access_control_request_headers=request.headers.get("access-control-request-headers"),
-            )
-        
-        response = await call_next(request)
-        
-        # Log CORS response headers
+        chunks = []
+        more_body = True
+        while more_body:
+            message = await receive()
+            if message["type"] != "http.request":
+                break
+            chunks.append(message.get("body", b""))
+            more_body = message.get("more_body", False)
+        body = b"".join(chunks)
+
+        if body:
+            try:
+                log_data["body"] = json.loads(body)
+            except ValueError:
+                log_data["body"] = body.decode("utf-8", errors="replace")[:MAX_LOGGED_BODY_CHARS]
+
+        replayed = False
+
+        async def replay() -> Message:
+            nonlocal replayed
+            if not replayed:
+                replayed = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return await receive()
+
+        return replay
+
+    def _log_cors_response(
+        self,
+        scope: Scope,
+        method: str,
+        origin: str,
+        host: Optional[str],
+        status_code: int,
+        response: dict[str, Any],
+    ) -> None:
+        """Log CORS response headers and cross-origin responses without them."""
         cors_headers = {
-            k: v for k, v in response.headers.items()
-            if k.lower().startswith("access-control-")
+            name.decode("latin-1"): value.decode("latin-1")
+            for name, value in response.get("headers", [])
+            if name.lower().startswith(b"access-control-")
         }
-        
         if cors_headers:
-            logger.debug(
-                "CORS headers set",
+            if self.log_cors:
+                logger.debug("CORS headers set", origin=origin, cors_headers=cors_headers)
+            return
+
+        if status_code == 200 and origin.split("://", 1)[-1] != host:
+            logger.warning(
+                "Possible CORS issue",
                 origin=origin,
-                cors_headers=cors_headers,
+                method=method,
+                path=scope["path"],
+                message="Cross-origin request without CORS headers",
             )
-        
-        # Check if CORS might have been blocked (no CORS headers on cross-origin request)
-        if origin and origin != request.url.netloc:
-            if not cors_headers and response.status_code == 200:
-                logger.warning(
-                    "Possible CORS issue",
-                    origin=origin,
-                    method=method,
-                    path=request.url.path,
-                    message="Cross-origin request without CORS headers",
-                )
-        
-        return response
 
+
+class ReadYourWritesMiddleware:
+    """Pure ASGI middleware setting the read-your-writes cookie.
+
+    ``get_db_session`` stores the end of the client's primary-read window
+    in the request state of write requests; the cookie is added here, when
+    the response starts, so it is sent whatever response class the route
+    returns.
+    """
+
+    def __init__(self, app: ASGIApp):
+        """Initialize read-your-writes middleware.
+
+        Args:
+            app: ASGI application
+        """
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                until = scope.get("state", {}).get(READ_PRIMARY_UNTIL_STATE)
+                if until is not None:
+                    max_age = math.ceil(settings.DB_READ_YOUR_WRITES_SECONDS)
+                    cookie = (
+                        f"{PRIMARY_STICKY_COOKIE}={until}; HttpOnly; Max-Age={max_age}; "
+                        "Path=/; SameSite=lax"
+                    )
+                    message["headers"] = [
+                        *message.get("headers", ()),
+                        (b"set-cookie", cookie.encode("latin-1")),
+                    ]
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
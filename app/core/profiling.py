@@ -0,0 +1,250 @@
+"""On-demand sampling profiles and asyncio task dumps of a live worker.
+
+Nothing runs until a profile is requested. A profile starts a daemon thread
+that reads the stack of the event loop thread every few milliseconds through
+``sys._current_frames`` and counts identical stacks; the worker itself is not
+instrumented. Profiles and task dumps use the folded stack format (one
+``frame;frame;frame count`` line per stack) read by flamegraph.pl, inferno and
+speedscope.
+"""
+
+import asyncio
+import hmac
+import os
+import re
+import sys
+import threading
+import uuid
+from collections import Counter
+from types import FrameType
+from typing import Any, Optional
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import get_settings
+from app.core.logging import get_logger, get_request_id
+
+logger = get_logger(__name__)
+settings = get_settings()
+
+# Request header asking for a profile of that single request (with X-Admin-Key)
+PROFILE_HEADER = b"x-profile"
+ADMIN_KEY_HEADER = b"x-admin-key"
+PROFILE_ID_PATTERN = re.compile(r"^[A-Za-z0-9-]{1,64}$")
+DEFAULT_TASK_NAME = re.compile(r"^Task-\d+$")
+
+
+def is_admin_key(key: Optional[str]) -> bool:
+    """Check a key against ``PROFILING_ADMIN_KEY`` (always False while it is unset)."""
+    if not settings.PROFILING_ADMIN_KEY or not key:
+        return False
+    return hmac.compare_digest(key.encode(), settings.PROFILING_ADMIN_KEY.encode())
+
+
+def _frame_name(frame: FrameType) -> str:
+    """Name a frame as ``module:qualified.function``."""
+    code = frame.f_code
+    module = frame.f_globals.get("__name__", code.co_filename)
+    return f"{module}:{getattr(code, 'co_qualname', code.co_name)}"
+
+
+def _frame_stack(frame: Optional[FrameType]) -> tuple[str, ...]:
+    """Get the stack of a thread frame, outermost call first."""
+    names = []
+    while frame is not None:
+        names.append(_frame_name(frame))
+        frame = frame.f_back
+    names.reverse()
+    return tuple(names)
+
+
+def fold_stacks(stacks: Counter) -> str:
+    """Render stack counts in the folded stack format, hottest first."""
+    return "".join(f"{';'.join(stack)} {count}\n" for stack, count in stacks.most_common())
+
+
+class StackSampler:
+    """Thread sampling the stack of one thread at a fixed interval.
+
+    With ``task`` set, only samples taken while that task runs on ``loop`` are
+    kept, which isolates one request from the others served concurrently.
+    Work a task hands to other threads (``asyncio.to_thread``) is not seen.
+    """
+
+    def __init__(
+        self,
+        thread_id: int,
+        interval_seconds: float,
+        task: Optional[asyncio.Task] = None,
+        loop: Optional[asyncio.AbstractEventLoop] = None,
+    ):
+        """Initialize sampler.
+
+        Args:
+            thread_id: Thread whose stack is sampled (the event loop thread)
+            interval_seconds: Time between samples
+            task: Only count samples taken while this task runs (optional)
+            loop: Event loop running ``task``
+        """
+        self.thread_id = thread_id
+        self.interval_seconds = interval_seconds
+        self.task = task
+        self.loop = loop
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval_seconds):
+            if self.task is not None and asyncio.current_task(self.loop) is not self.task:
+                continue
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                self.stacks[_frame_stack(frame)] += 1
+                self.samples += 1
+
+    def start(self) -> None:
+        """Start sampling."""
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> str:
+        """Stop sampling.
+
+        Returns:
+            Folded stacks
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        return fold_stacks(self.stacks)
+
+
+async def profile_worker(seconds: float, interval_ms: Optional[float] = None) -> str:
+    """Sample the event loop thread of this worker for a while.
+
+    Args:
+        seconds: Profile duration
+        interval_ms: Time between samples (default: ``PROFILING_SAMPLE_INTERVAL_MS``)
+
+    Returns:
+        Folded stacks
+    """
+    interval_ms = interval_ms or settings.PROFILING_SAMPLE_INTERVAL_MS
+    sampler = StackSampler(threading.get_ident(), interval_ms / 1000)
+    sampler.start()
+    try:
+        await asyncio.sleep(seconds)
+    finally:
+        profile = await asyncio.to_thread(sampler.stop)
+    logger.info("Worker profiled", seconds=seconds, samples=sampler.samples, pid=os.getpid())
+    return profile
+
+
+def _task_stack(task: asyncio.Task) -> tuple[str, ...]:
+    """Get the await chain a task is suspended in, outermost coroutine first."""
+    # Default names (Task-<n>) are dropped so that identical tasks fold together
+    name = task.get_name()
+    names = ["task" if DEFAULT_TASK_NAME.match(name) else f"task:{name}"]
+    awaitable: Any = task.get_coro()
+    while awaitable is not None:
+        frame = getattr(awaitable, "cr_frame", None) or getattr(awaitable, "gi_frame", None)
+        if frame is None:
+            break
+        names.append(_frame_name(frame))
+        awaitable = getattr(awaitable, "cr_await", None) or getattr(
+            awaitable, "gi_yieldfrom", None
+        )
+    return tuple(names)
+
+
+def dump_tasks() -> str:
+    """Dump where every asyncio task of this worker is suspended.
+
+    Tasks suspended at the same point are counted together.
+
+    Returns:
+        Folded stacks
+    """
+    current = asyncio.current_task()
+    stacks = Counter(
+        _task_stack(task) for task in asyncio.all_tasks() if task is not current
+    )
+    return fold_stacks(stacks)
+
+
+def profile_path(profile_id: str) -> str:
+    """Get the file of a per-request profile.
+
+    Raises:
+        ValueError: If the profile ID is not a request ID
+    """
+    if not PROFILE_ID_PATTERN.match(profile_id):
+        raise ValueError(f"Invalid profile id: {profile_id}")
+    return os.path.join(settings.PROFILING_DIR, f"{profile_id}.folded")
+
+
+def _write_profile(path: str, profile: str) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(profile)
+
+
+class ProfilingMiddleware:
+    """Pure ASGI middleware profiling single requests on demand.
+
+    A request sent with ``X-Profile: 1`` and a valid ``X-Admin-Key`` is sampled
+    while its task runs; the profile is written to ``PROFILING_DIR`` under the
+    request ID, returned in the ``X-Profile-Id`` header and served by
+    ``GET /api/v1/admin/profiles/{profile_id}``. Other requests pay one header
+    scan. Register it inside ``RequestLoggingMiddleware``, which sets the
+    request ID.
+    """
+
+    def __init__(self, app: ASGIApp):
+        """Initialize profiling middleware.
+
+        Args:
+            app: ASGI application
+        """
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope["headers"])
+        if PROFILE_HEADER not in headers or not is_admin_key(
+            headers.get(ADMIN_KEY_HEADER, b"").decode("latin-1")
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = get_request_id() or str(uuid.uuid4())
+        profile_id_header = (b"x-profile-id", profile_id.encode("latin-1"))
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", ()), profile_id_header]
+            await send(message)
+
+        sampler = StackSampler(
+            threading.get_ident(),
+            settings.PROFILING_SAMPLE_INTERVAL_MS / 1000,
+            task=asyncio.current_task(),
+            loop=asyncio.get_running_loop(),
+        )
+        sampler.start()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            profile = await asyncio.to_thread(sampler.stop)
+            await asyncio.to_thread(_write_profile, profile_path(profile_id), profile)
+            logger.info(
+                "Request profiled",
+                profile_id=profile_id,
+                samples=sampler.samples,
+                path=scope["path"],
+            )
@@ -0,0 +1,158 @@
+"""Readiness probes of the service dependencies."""
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Optional
+
+import boto3
+import httpx
+from botocore.config import Config
+from sqlalchemy import text
+
+from app.core.config import get_settings
+from app.core.logging import get_logger
+
+settings = get_settings()
+logger = get_logger(__name__)
+
+# Endpoints answering any HTTP status when a provider API is reachable
+PROVIDER_URLS = {
+    "openai": "https://api.openai.com/v1/models",
+    "gemini": "https://generativelanguage.googleapis.com/v1beta/models",
+    "together": "https://api.together.xyz/v1/models",
+}
+
+
+class ReadinessChecker:
+    """Concurrent dependency probes with per-probe timeouts and a short cache.
+
+    The database and S3 are critical: the node is not ready without them. The
+    read replica (reads fall back to the primary) and LLM providers (shared by
+    every node) are reported but never make the node unready. Results are
+    reused for ``cache_seconds`` and concurrent callers share one probe run.
+    """
+
+    def __init__(
+        self,
+        timeout_seconds: float,
+        cache_seconds: float,
+        providers: Optional[list[str]] = None,
+    ):
+        """Initialize checker.
+
+        Args:
+            timeout_seconds: Timeout of each probe
+            cache_seconds: Time a probe run is reused
+            providers: LLM providers whose API reachability is probed
+        """
+        self.timeout_seconds = timeout_seconds
+        self.cache_seconds = cache_seconds
+        self.providers = [name.lower() for name in providers or []]
+        self._result: Optional[dict[str, Any]] = None
+        self._checked_at: Optional[float] = None
+        self._lock = asyncio.Lock()
+        self._s3_client: Any = None
+
+    def _is_stale(self) -> bool:
+        return (
+            self._checked_at is None
+            or time.monotonic() - self._checked_at >= self.cache_seconds
+        )
+
+    async def _probe_database(self, engine: Any) -> None:
+        """Check a connection out of the pool and run a trivial query."""
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    async def _probe_s3(self) -> None:
+        """Check that the bucket exists and is accessible."""
+        if self._s3_client is None:
+            # Fail fast: no retries, and socket timeouts bounded by the probe timeout
+            self._s3_client = boto3.client(
+                "s3",
+                aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
+                aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
+                region_name=settings.AWS_S3_REGION,
+                endpoint_url=settings.AWS_S3_ENDPOINT_URL or None,
+                config=Config(
+                    connect_timeout=self.timeout_seconds,
+                    read_timeout=self.timeout_seconds,
+                    retries={"max_attempts": 1},
+                ),
+            )
+        await asyncio.to_thread(self._s3_client.head_bucket, Bucket=settings.AWS_S3_BUCKET_NAME)
+
+    async def _probe_provider(self, url: str) -> None:
+        """Check that a provider API answers HTTP requests."""
+        async with httpx.AsyncClient(timeout=self.timeout_seconds) as client:
+            await client.get(url)
+
+    async def _run_probe(
+        self, probe: Callable[[], Awaitable[None]], critical: bool
+    ) -> dict[str, Any]:
+        """Run one probe with the timeout and measure its latency."""
+        start = time.perf_counter()
+        result: dict[str, Any] = {"status": "ok", "critical": critical}
+        try:
+            await asyncio.wait_for(probe(), timeout=self.timeout_seconds)
+        except asyncio.TimeoutError:
+            result.update(status="error", error=f"Timed out after {self.timeout_seconds}s")
+        except Exception as e:
+            result.update(status="error", error=f"{type(e).__name__}: {e}")
+        result["latency_ms"] = round((time.perf_counter() - start) * 1000, 2)
+        return result
+
+    async def _probe_all(self) -> dict[str, Any]:
+        """Run every probe concurrently."""
+        from app.db.session import engine, read_engine
+
+        probes: dict[str, tuple[Callable[[], Awaitable[None]], bool]] = {
+            "database": (lambda: self._probe_database(engine), True),
+            "s3": (self._probe_s3, True),
+        }
+        if read_engine is not None:
+            probes["database_replica"] = (lambda: self._probe_database(read_engine), False)
+        for name in self.providers:
+            url = PROVIDER_URLS.get(name)
+            if url:
+                probes[f"provider_{name}"] = (lambda url=url: self._probe_provider(url), False)
+
+        results = await asyncio.gather(
+            *(self._run_probe(probe, critical) for probe, critical in probes.values())
+        )
+        checks = dict(zip(probes, results))
+        ready = all(
+            check["status"] == "ok" for check in checks.values() if check["critical"]
+        )
+        return {"status": "ready" if ready else "unready", "checks": checks}
+
+    async def check(self) -> dict[str, Any]:
+        """Get readiness, probing dependencies when the cached result is stale.
+
+        Returns:
+            Dict with overall status and per-dependency status and latency
+        """
+        if self._is_stale():
+            async with self._lock:
+                if self._is_stale():
+                    was_ready = self._result is None or self._result["status"] == "ready"
+                    self._result = await self._probe_all()
+                    self._checked_at = time.monotonic()
+                    ready = self._result["status"] == "ready"
+                    if was_ready and not ready:
+                        failed = {
+                            name: check.get("error")
+                            for name, check in self._result["checks"].items()
+                            if check["status"] != "ok"
+                        }
+                        logger.warning("Readiness check failed", failed=failed)
+                    elif ready and not was_ready:
+                        logger.info("Readiness restored")
+        return self._result
+
+
+readiness_checker = ReadinessChecker(
+    timeout_seconds=settings.HEALTH_CHECK_TIMEOUT_SECONDS,
+    cache_seconds=settings.HEALTH_CHECK_CACHE_SECONDS,
+    providers=settings.HEALTH_CHECK_PROVIDERS,
+)
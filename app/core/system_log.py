@@ -1,13 +1,186 @@
 """Service for persisting logs to database."""
 
+import asyncio
+from datetime import datetime, timezone
 from typing import Any, Dict, Optional
+from uuid import uuid4
 
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import Select, insert, select
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
 
+from app.core.config import get_settings
+from app.core.exceptions import ValidationError
 from app.core.logging import get_logger, get_request_id
 from app.models.system_log import SystemLog
 
 logger = get_logger(__name__)
+settings = get_settings()
+
+
+class SystemLogWriter:
+    """Buffered writer persisting ``SystemLog`` rows in bulk.
+
+    ``write`` only appends a row to an in-memory buffer. A background task
+    inserts the buffer with one executemany per batch on its own connection,
+    when ``batch_size`` rows are waiting or every ``flush_interval`` seconds,
+    independently of the caller's transaction. When ``max_buffer`` rows are
+    pending, new rows are dropped and counted instead of slowing the caller.
+    """
+
+    def __init__(
+        self,
+        batch_size: int = 500,
+        flush_interval: float = 1.0,
+        max_buffer: int = 10_000,
+        engine: Optional[AsyncEngine] = None,
+    ):
+        """Initialize writer.
+
+        Args:
+            batch_size: Rows per insert; a full batch triggers a flush
+            flush_interval: Maximum seconds a row waits in the buffer
+            max_buffer: Maximum pending rows before new rows are dropped
+            engine: Engine to write with (default: the primary engine)
+        """
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_buffer = max_buffer
+        self._engine = engine
+        self._buffer: list[dict[str, Any]] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+        self._flush_lock: Optional[asyncio.Lock] = None
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+
+    @property
+    def engine(self) -> AsyncEngine:
+        if self._engine is None:
+            from app.db.session import engine
+
+            self._engine = engine
+        return self._engine
+
+    def write(
+        self,
+        level: str,
+        module: str,
+        action: str,
+        details: Optional[Dict[str, Any]] = None,
+        entity_id: Optional[str] = None,
+        entity_type: Optional[str] = None,
+        request_id: Optional[str] = None,
+    ) -> bool:
+        """Buffer a log entry (call from the event loop thread).
+
+        Args:
+            level: Log level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
+            module: Module/component name
+            action: Action description
+            details: Additional details as dictionary
+            entity_id: Related entity ID (optional)
+            entity_type: Related entity type (optional)
+            request_id: Request ID (optional, auto-filled if available)
+
+        Returns:
+            False if the buffer was full and the entry was dropped
+        """
+        if len(self._buffer) >= self.max_buffer:
+            self.dropped += 1
+            return False
+
+        self._buffer.append(
+            {
+                "id": str(uuid4()),
+                "level": level.upper(),
+                "module": module,
+                "action": action,
+                "entity_id": entity_id,
+                "entity_type": entity_type,
+                "request_id": request_id if request_id is not None else get_request_id(),
+                "details": details or {},
+                "created_at": datetime.now(timezone.utc),
+            }
+        )
+        if len(self._buffer) >= self.batch_size and self._wakeup is not None:
+            self._wakeup.set()
+        return True
+
+    async def flush(self) -> int:
+        """Insert all buffered rows.
+
+        Returns:
+            Number of rows written
+        """
+        if self._flush_lock is None:
+            self._flush_lock = asyncio.Lock()
+
+        async with self._flush_lock:
+            rows, self._buffer = self._buffer, []
+            written = 0
+            for i in range(0, len(rows), self.batch_size):
+                batch = rows[i : i + self.batch_size]
+                try:
+                    async with self.engine.begin() as conn:
+                        await conn.execute(insert(SystemLog), batch)
+                    written += len(batch)
+                except Exception as e:
+                    self.failed += len(batch)
+                    logger.warning(
+                        "Failed to persist system logs", rows=len(batch), error=str(e)
+                    )
+            self.written += written
+            return written
+
+    async def _run(self) -> None:
+        """Flush on a full batch or after ``flush_interval``, until stopped."""
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            if self._buffer:
+                await self.flush()
+
+    def start(self) -> None:
+        """Start the background flush task on the running event loop."""
+        if self._task is not None and not self._task.done():
+            return
+        self._stopping = False
+        self._wakeup = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the background task and flush remaining rows."""
+        # Signal the loop rather than cancel it: on Python 3.11 wait_for
+        # swallows a cancellation that races with the wakeup event
+        if self._task is not None:
+            self._stopping = True
+            self._wakeup.set()
+            await self._task
+            self._task = None
+        self._wakeup = None
+        await self.flush()
+
+    def stats(self) -> dict[str, int]:
+        """Get writer counters for monitoring."""
+        return {
+            "pending": len(self._buffer),
+            "written": self.written,
+            "dropped": self.dropped,
+            "failed": self.failed,
+        }
+
+
+system_log_writer = SystemLogWriter(
+    batch_size=settings.SYSTEM_LOG_BATCH_SIZE,
+    flush_interval=settings.SYSTEM_LOG_FLUSH_INTERVAL_SECONDS,
+    max_buffer=settings.SYSTEM_LOG_MAX_BUFFER,
+)
 
 
 class SystemLogService:
@@ -15,7 +188,7 @@ class SystemLogService:
 
     @staticmethod
     async def log_to_database(
-        db: AsyncSession,
+        db: Optional[AsyncSession],
         level: str,
         module: str,
         action: str,
@@ -23,11 +196,15 @@ class SystemLogService:
         entity_id: Optional[str] = None,
         entity_type: Optional[str] = None,
         request_id: Optional[str] = None,
-    ) -> SystemLog:
-        """Persist a log entry to the database.
-        
+    ) -> bool:
+        """Queue a log entry for batched persistence.
+
+        The entry is written by ``system_log_writer`` on its own connection,
+        so it neither joins nor commits the caller's transaction. Kept async
+        for existing ``await`` callers; queuing never waits.
+
         Args:
-            db: Database session
+            db: Caller's database session (unused, kept for compatibility)
             level: Log level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
             module: Module/component name
             action: Action description
@@ -35,60 +212,130 @@ class SystemLogService:
             entity_id: Related entity ID (optional)
             entity_type: Related entity type (optional)
             request_id: Request ID (optional, auto-filled if available)
-            
+
         Returns:
-            Created SystemLog instance
+            False if the writer buffer was full and the entry was dropped
         """
-        # Auto-fill request_id if not provided
-        if request_id is None:
-            request_id = get_request_id()
-        
-        log_entry = SystemLog(
-            level=level.upper(),
+        return system_log_writer.write(
+            level=level,
             module=module,
             action=action,
+            details=details,
             entity_id=entity_id,
             entity_type=entity_type,
             request_id=request_id,
-            details=details or {},
         )
-        
-        db.add(log_entry)
-        await db.commit()
-        await db.refresh(log_entry)
-        
-        return log_entry
+
+    @staticmethod
+    def logs_query(
+        start: datetime,
+        end: datetime,
+        request_id: Optional[str] = None,
+        level: Optional[str] = None,
+        module: Optional[str] = None,
+        entity_id: Optional[str] = None,
+    ) -> Select:
+        """Build a query over a time window of logs, newest first.
+
+        The ``created_at`` bounds let Postgres skip every monthly partition
+        outside the window, so always pass the narrowest known window.
+
+        Args:
+            start: Inclusive lower bound of ``created_at``
+            end: Exclusive upper bound of ``created_at``
+            request_id: Filter by request ID
+            level: Filter by log level
+            module: Filter by module
+            entity_id: Filter by related entity ID
+
+        Returns:
+            Select over matching logs
+
+        Raises:
+            ValidationError: If the window is empty
+        """
+        if start >= end:
+            raise ValidationError("Log query start must be before end")
+
+        query = select(SystemLog).where(SystemLog.created_at >= start, SystemLog.created_at < end)
+        if request_id:
+            query = query.where(SystemLog.request_id == request_id)
+        if level:
+            query = query.where(SystemLog.level == level.upper())
+        if module:
+            query = query.where(SystemLog.module == module)
+        if entity_id:
+            query = query.where(SystemLog.entity_id == entity_id)
+
+        return query.order_by(SystemLog.created_at.desc())
+
+    @staticmethod
+    async def list_logs(
+        db: AsyncSession,
+        start: datetime,
+        end: Optional[datetime] = None,
+        request_id: Optional[str] = None,
+        level: Optional[str] = None,
+        module: Optional[str] = None,
+        entity_id: Optional[str] = None,
+        limit: int = 100,
+    ) -> list[SystemLog]:
+        """List logs of a time window, newest first.
+
+        Args:
+            db: Database session
+            start: Inclusive lower bound of ``created_at``
+            end: Exclusive upper bound of ``created_at`` (default: now)
+            request_id: Filter by request ID
+            level: Filter by log level
+            module: Filter by module
+            entity_id: Filter by related entity ID
+            limit: Maximum number of logs
+
+        Returns:
+            List of logs
+        """
+        query = SystemLogService.logs_query(
+            start,
+            end or datetime.now(timezone.utc),
+            request_id=request_id,
+            level=level,
+            module=module,
+            entity_id=entity_id,
+        )
+        result = await db.execute(query.limit(limit))
+        return list(result.scalars().all())
 
 
 async def log_error_to_database(
-    db: AsyncSession,
+    db: Optional[AsyncSession],
     error: Exception,
     module: str,
     action: str,
     details: Optional[Dict[str, Any]] = None,
     entity_id: Optional[str] = None,
     entity_type: Optional[str] = None,
-) -> SystemLog:
+) -> bool:
     """Convenience function to log errors to database.
-    
+
     Args:
-        db: Database session
+        db: Caller's database session (unused, kept for compatibility)
         error: Exception instance
         module: Module/component name
         action: Action description
         details: Additional details
         entity_id: Related entity ID
         entity_type: Related entity type
-        
+
     Returns:
-        Created SystemLog instance
+        False if the writer buffer was full and the entry was dropped
     """
     error_details = {
         "error_type": type(error).__name__,
         "error_message": str(error),
         **(details or {}),
     }
-    
+
     return await SystemLogService.log_to_database(
         db=db,
         level="ERROR",
@@ -98,4 +345,3 @@ async def log_error_to_database(
         entity_id=entity_id,
         entity_type=entity_type,
     )
-
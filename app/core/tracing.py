@@ -0,0 +1,268 @@
+"""OpenTelemetry tracing of requests, database queries, S3, LLM calls and services.
+
+Tracing is off unless ``TRACING_ENABLED`` is set; the helpers here then return
+immediately, so instrumented code pays one flag check per call. Every span
+carries the structlog ``request_id`` of the request it belongs to, and log
+events carry the ``trace_id``/``span_id`` of the current span.
+"""
+
+import contextlib
+import functools
+import inspect
+import threading
+from typing import Any, Callable, Iterator, Optional, Sequence
+
+from opentelemetry import propagate, trace
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.trace import ReadableSpan, SpanProcessor, TracerProvider
+from opentelemetry.sdk.trace.export import (
+    BatchSpanProcessor,
+    ConsoleSpanExporter,
+    SpanExporter,
+    SpanExportResult,
+)
+from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+from opentelemetry.trace import Span, SpanKind, Status, StatusCode
+from sqlalchemy import event
+
+from app.core.config import get_settings
+from app.core.logging import get_logger, get_request_id
+
+settings = get_settings()
+logger = get_logger(__name__)
+
+EXPORTERS = {"file", "otlp", "console"}
+# Characters of a SQL statement kept on a database span
+MAX_STATEMENT_CHARS = 1000
+
+tracer = trace.get_tracer("vrforge")
+_enabled = False
+_provider: Optional[TracerProvider] = None
+
+
+def tracing_enabled() -> bool:
+    """Check whether tracing is configured in this process."""
+    return _enabled
+
+
+class FileSpanExporter(SpanExporter):
+    """Span exporter appending one OpenTelemetry JSON span per line to a file."""
+
+    def __init__(self, path: str):
+        """Initialize exporter.
+
+        Args:
+            path: File the spans are appended to
+        """
+        self.path = path
+        self._lock = threading.Lock()
+
+    def export(self, spans: Sequence[ReadableSpan]) -> SpanExportResult:
+        lines = "".join(span.to_json(indent=None) + "\n" for span in spans)
+        try:
+            with self._lock, open(self.path, "a", encoding="utf-8") as f:
+                f.write(lines)
+        except OSError:
+            return SpanExportResult.FAILURE
+        return SpanExportResult.SUCCESS
+
+    def shutdown(self) -> None:
+        pass
+
+
+class RequestIdSpanProcessor(SpanProcessor):
+    """Span processor tagging every span with the current request ID."""
+
+    def on_start(self, span: Span, parent_context: Any = None) -> None:
+        request_id = get_request_id()
+        if request_id:
+            span.set_attribute("request_id", request_id)
+
+
+def _create_exporter(exporter: str) -> SpanExporter:
+    """Create the span exporter selected by ``TRACING_EXPORTER``."""
+    if exporter == "otlp":
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+
+        return OTLPSpanExporter(endpoint=settings.TRACING_OTLP_ENDPOINT)
+    if exporter == "console":
+        return ConsoleSpanExporter()
+    return FileSpanExporter(settings.TRACING_FILE_PATH)
+
+
+def configure_tracing(enabled: bool, exporter: str = "file", sample_ratio: float = 1.0) -> None:
+    """Configure the tracer provider of this process.
+
+    Args:
+        enabled: Whether to record spans
+        exporter: file, otlp or console
+        sample_ratio: Share of traces recorded (child spans follow their parent)
+    """
+    global _enabled, _provider
+
+    if not enabled or _provider is not None:
+        return
+    if exporter not in EXPORTERS:
+        logger.warning("Unknown tracing exporter, using file", exporter=exporter)
+        exporter = "file"
+
+    _provider = TracerProvider(
+        resource=Resource.create({"service.name": settings.APP_NAME.lower()}),
+        sampler=ParentBased(TraceIdRatioBased(sample_ratio)),
+    )
+    _provider.add_span_processor(RequestIdSpanProcessor())
+    _provider.add_span_processor(BatchSpanProcessor(_create_exporter(exporter)))
+    trace.set_tracer_provider(_provider)
+    _enabled = True
+
+
+def shutdown_tracing() -> None:
+    """Export pending spans and stop the exporter."""
+    if _provider is not None:
+        _provider.shutdown()
+
+
+def record_exception(span: Span, error: BaseException) -> None:
+    """Mark a span as failed with an exception."""
+    span.record_exception(error)
+    span.set_status(Status(StatusCode.ERROR, str(error)))
+
+
+@contextlib.contextmanager
+def request_span(scope: dict[str, Any], request_id: str) -> Iterator[Span]:
+    """Run an HTTP request inside a server span, continuing an incoming ``traceparent``.
+
+    The span is named after the method until ``finish_request_span`` sets the
+    matched route template.
+    """
+    carrier = {
+        name.decode("latin-1"): value.decode("latin-1")
+        for name, value in scope["headers"]
+        if name in (b"traceparent", b"tracestate")
+    }
+    with tracer.start_as_current_span(
+        scope["method"],
+        context=propagate.extract(carrier) if carrier else None,
+        kind=SpanKind.SERVER,
+        attributes={
+            "http.method": scope["method"],
+            "http.target": scope["path"],
+            "request_id": request_id,
+        },
+    ) as span:
+        yield span
+
+
+def finish_request_span(
+    span: Span, method: str, route: str, status_code: Optional[int]
+) -> None:
+    """Name a request span after its route template and record the status code."""
+    span.update_name(f"{method} {route}")
+    span.set_attribute("http.route", route)
+    if status_code is not None:
+        span.set_attribute("http.status_code", status_code)
+        if status_code >= 500:
+            span.set_status(Status(StatusCode.ERROR))
+
+
+def traced(name: Optional[str] = None, **attributes: Any) -> Callable:
+    """Decorator running a function (sync or async) inside a span.
+
+    Args:
+        name: Span name (default: the function's qualified name)
+        **attributes: Static span attributes
+    """
+
+    def decorator(func: Callable) -> Callable:
+        span_name = name or func.__qualname__
+
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                if not _enabled:
+                    return await func(*args, **kwargs)
+                with tracer.start_as_current_span(span_name, attributes=attributes):
+                    return await func(*args, **kwargs)
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def sync_wrapper(*args: Any, **kwargs: Any) -> Any:
+            if not _enabled:
+                return func(*args, **kwargs)
+            with tracer.start_as_current_span(span_name, attributes=attributes):
+                return func(*args, **kwargs)
+
+        return sync_wrapper
+
+    return decorator
+
+
+def trace_llm_call(func: Callable) -> Callable:
+    """Decorator tracing an ``LLMProvider`` call with its provider, model and usage."""
+
+    signature = inspect.signature(func)
+
+    @functools.wraps(func)
+    async def wrapper(self: Any, *args: Any, **kwargs: Any) -> Any:
+        if not _enabled:
+            return await func(self, *args, **kwargs)
+
+        # Imported here: the provider base module imports this one
+        from app.integrations.llm_providers.base import usage_scope
+
+        arguments = signature.bind(self, *args, **kwargs)
+        arguments.apply_defaults()
+        model = arguments.arguments.get("model")
+        with tracer.start_as_current_span(
+            f"llm.{func.__name__}",
+            kind=SpanKind.CLIENT,
+            attributes={"llm.provider": self.name.lower(), "llm.model": str(model)},
+        ) as span:
+            with usage_scope() as scope:
+                result = await func(self, *args, **kwargs)
+            usage = scope.usage or {}
+            for key in ("prompt_tokens", "completion_tokens", "cached_tokens"):
+                if key in usage:
+                    span.set_attribute(f"llm.{key}", usage[key])
+            return result
+
+    return wrapper
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    span = tracer.start_span(
+        "db.query",
+        kind=SpanKind.CLIENT,
+        attributes={
+            "db.system": "postgresql",
+            "db.statement": statement[:MAX_STATEMENT_CHARS],
+            "db.executemany": executemany,
+        },
+    )
+    context._trace_span = span
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    span = getattr(context, "_trace_span", None)
+    if span is not None:
+        span.end()
+        context._trace_span = None
+
+
+def _handle_error(exception_context) -> None:
+    context = exception_context.execution_context
+    span = getattr(context, "_trace_span", None) if context is not None else None
+    if span is not None:
+        record_exception(span, exception_context.original_exception)
+        span.end()
+        context._trace_span = None
+
+
+def instrument_engine(engine: Any) -> None:
+    """Record a span for every statement run on an (async) engine."""
+    sync_engine = getattr(engine, "sync_engine", engine)
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(sync_engine, "handle_error", _handle_error)
@@ -0,0 +1,264 @@
+"""Monthly range partitions of time-series tables."""
+
+import asyncio
+import re
+from datetime import date, datetime, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from app.core.config import get_settings
+from app.core.logging import get_logger
+
+settings = get_settings()
+logger = get_logger(__name__)
+
+SYSTEM_LOGS_TABLE = "system_logs"
+# Serializes partition maintenance across worker processes
+MAINTENANCE_LOCK_ID = 0x73797374
+
+_PARTITION_SUFFIX = re.compile(r"_p(\d{4})_(\d{2})$")
+
+LIST_PARTITIONS_QUERY = """
+SELECT child.relname
+FROM pg_inherits
+JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+WHERE parent.relname = :table
+"""
+
+
+def month_start(day: date) -> date:
+    """Get the first day of the month containing ``day``."""
+    return day.replace(day=1)
+
+
+def add_months(month: date, months: int) -> date:
+    """Get the first day of the month ``months`` after ``month``."""
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table: str, month: date) -> str:
+    """Get the name of the partition holding ``month`` (e.g. ``system_logs_p2026_10``)."""
+    return f"{table}_p{month.year:04d}_{month.month:02d}"
+
+
+def default_partition_name(table: str) -> str:
+    """Get the name of the DEFAULT partition catching rows outside every month."""
+    return f"{table}_default"
+
+
+def partition_month(table: str, name: str) -> Optional[date]:
+    """Get the month of a partition name, or None for other tables."""
+    if not name.startswith(f"{table}_p"):
+        return None
+    match = _PARTITION_SUFFIX.search(name)
+    if match is None:
+        return None
+    return date(int(match.group(1)), int(match.group(2)), 1)
+
+
+def expired_partitions(
+    table: str, names: list[str], retention_days: int, today: date
+) -> list[str]:
+    """Select the partitions whose whole month is older than the retention period.
+
+    Args:
+        table: Partitioned table name
+        names: Existing partition names
+        retention_days: Days of data to keep
+        today: Current date (UTC)
+
+    Returns:
+        Partition names to drop, oldest first
+    """
+    cutoff = today - timedelta(days=retention_days)
+    expired = []
+    for name in names:
+        month = partition_month(table, name)
+        if month is not None and add_months(month, 1) <= cutoff:
+            expired.append((month, name))
+    return [name for _, name in sorted(expired)]
+
+
+def _month_bounds(month: date) -> dict[str, datetime]:
+    """Get the UTC range of a month partition as query parameters."""
+    start = datetime(month.year, month.month, 1, tzinfo=timezone.utc)
+    end = datetime.combine(add_months(month, 1), datetime.min.time(), tzinfo=timezone.utc)
+    return {"start": start, "end": end}
+
+
+async def _create_partition(
+    conn: AsyncConnection, table: str, month: date, has_default: bool
+) -> str:
+    """Create the partition of ``month``, moving its rows out of the DEFAULT partition.
+
+    Postgres refuses to create a partition whose range already has rows in
+    the DEFAULT partition, so those rows are moved into a standalone table
+    that is then attached. Rows there mean maintenance fell behind, which is
+    logged as a warning.
+
+    Returns:
+        Name of the created partition
+    """
+    name = partition_name(table, month)
+    default = default_partition_name(table)
+    bounds = _month_bounds(month)
+    values = (
+        f"FOR VALUES FROM ('{month.isoformat()} 00:00+00') "
+        f"TO ('{add_months(month, 1).isoformat()} 00:00+00')"
+    )
+    in_range = "created_at >= :start AND created_at < :end"
+
+    stray_rows = 0
+    if has_default:
+        stray_rows = (
+            await conn.execute(text(f"SELECT count(*) FROM {default} WHERE {in_range}"), bounds)
+        ).scalar()
+    if not stray_rows:
+        await conn.execute(text(f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {table} {values}"))
+        return name
+
+    logger.warning(
+        "Rows found in the default partition", table=default, partition=name, rows=stray_rows
+    )
+    await conn.execute(
+        text(f"CREATE TABLE {name} (LIKE {table} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)")
+    )
+    await conn.execute(
+        text(
+            f"WITH moved AS (DELETE FROM {default} WHERE {in_range} RETURNING *) "
+            f"INSERT INTO {name} SELECT * FROM moved"
+        ),
+        bounds,
+    )
+    await conn.execute(text(f"ALTER TABLE {table} ATTACH PARTITION {name} {values}"))
+    return name
+
+
+async def ensure_partitions(
+    conn: AsyncConnection, table: str, months_ahead: int, today: Optional[date] = None
+) -> list[str]:
+    """Create the partitions of the current month and the next ``months_ahead``.
+
+    Returns:
+        Names of the partitions that did not exist yet
+    """
+    today = today or datetime.now(timezone.utc).date()
+    existing = set((await conn.execute(text(LIST_PARTITIONS_QUERY), {"table": table})).scalars())
+
+    has_default = default_partition_name(table) in existing
+    created = []
+    current = month_start(today)
+    for offset in range(months_ahead + 1):
+        start = add_months(current, offset)
+        if partition_name(table, start) in existing:
+            continue
+        created.append(await _create_partition(conn, table, start, has_default))
+    return created
+
+
+async def drop_expired_partitions(
+    conn: AsyncConnection, table: str, retention_days: int, today: Optional[date] = None
+) -> list[str]:
+    """Drop the partitions older than ``retention_days`` instead of deleting rows.
+
+    Expired rows left in the DEFAULT partition are deleted.
+
+    Returns:
+        Names of the dropped partitions
+    """
+    today = today or datetime.now(timezone.utc).date()
+    names = list((await conn.execute(text(LIST_PARTITIONS_QUERY), {"table": table})).scalars())
+    dropped = expired_partitions(table, names, retention_days, today)
+    for name in dropped:
+        await conn.execute(text(f"DROP TABLE IF EXISTS {name}"))
+
+    default = default_partition_name(table)
+    if default in names:
+        cutoff = datetime.combine(
+            today - timedelta(days=retention_days), datetime.min.time(), tzinfo=timezone.utc
+        )
+        await conn.execute(
+            text(f"DELETE FROM {default} WHERE created_at < :cutoff"), {"cutoff": cutoff}
+        )
+    return dropped
+
+
+async def maintain_system_log_partitions(engine: AsyncEngine) -> dict[str, list[str]]:
+    """Create upcoming ``system_logs`` partitions and drop expired ones.
+
+    Only one process runs the maintenance at a time; the others skip it.
+
+    Returns:
+        Created and dropped partition names
+    """
+    result: dict[str, list[str]] = {"created": [], "dropped": []}
+    async with engine.begin() as conn:
+        locked = (
+            await conn.execute(
+                text("SELECT pg_try_advisory_xact_lock(:lock_id)"),
+                {"lock_id": MAINTENANCE_LOCK_ID},
+            )
+        ).scalar()
+        if not locked:
+            return result
+
+        result["created"] = await ensure_partitions(
+            conn, SYSTEM_LOGS_TABLE, settings.SYSTEM_LOG_PARTITIONS_AHEAD
+        )
+        if settings.SYSTEM_LOG_RETENTION_DAYS > 0:
+            result["dropped"] = await drop_expired_partitions(
+                conn, SYSTEM_LOGS_TABLE, settings.SYSTEM_LOG_RETENTION_DAYS
+            )
+
+    if result["created"] or result["dropped"]:
+        logger.info("System log partitions maintained", **result)
+    return result
+
+
+class PartitionMaintainer:
+    """Background task running ``maintain_system_log_partitions`` periodically."""
+
+    def __init__(self, interval_seconds: float, engine: Optional[AsyncEngine] = None):
+        """Initialize maintainer.
+
+        Args:
+            interval_seconds: Seconds between maintenance runs
+            engine: Engine to run with (default: the primary engine)
+        """
+        self.interval_seconds = interval_seconds
+        self._engine = engine
+        self._task: Optional[asyncio.Task] = None
+
+    async def _run(self) -> None:
+        while True:
+            if self._engine is None:
+                from app.db.session import engine
+
+                self._engine = engine
+            try:
+                await maintain_system_log_partitions(self._engine)
+            except Exception as e:
+                logger.warning("System log partition maintenance failed", error=str(e))
+            await asyncio.sleep(self.interval_seconds)
+
+    def start(self) -> None:
+        """Start maintenance on the running event loop (first run immediately)."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the background task."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+partition_maintainer = PartitionMaintainer(settings.SYSTEM_LOG_PARTITION_CHECK_INTERVAL_SECONDS)
@@ -0,0 +1,113 @@
+"""Instrumented connection pool and pool metrics."""
+
+import math
+import threading
+import time
+from collections import deque
+from typing import Any, Optional
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+# Number of recent checkout waits kept for percentiles
+WAIT_SAMPLE_SIZE = 1000
+
+
+class PoolMetrics:
+    """Counters and recent wait times for one connection pool."""
+
+    def __init__(self):
+        """Initialize metrics."""
+        self._lock = threading.Lock()
+        self.pool: Optional[AsyncAdaptedQueuePool] = None
+        self.checkouts = 0
+        self.timeouts = 0
+        self.connects = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self._recent_waits: deque[float] = deque(maxlen=WAIT_SAMPLE_SIZE)
+
+    def record_checkout(self, wait_seconds: float) -> None:
+        """Record a connection checkout and how long it waited."""
+        with self._lock:
+            self.checkouts += 1
+            self.wait_seconds_total += wait_seconds
+            self.wait_seconds_max = max(self.wait_seconds_max, wait_seconds)
+            self._recent_waits.append(wait_seconds)
+
+    def record_timeout(self) -> None:
+        """Record a checkout that gave up after ``pool_timeout``."""
+        with self._lock:
+            self.timeouts += 1
+
+    def record_connect(self) -> None:
+        """Record a new DBAPI connection being opened."""
+        with self._lock:
+            self.connects += 1
+
+    def snapshot(self) -> dict[str, Any]:
+        """Get current pool state and wait statistics.
+
+        Returns:
+            Dict with pool occupancy, counters and wait times in milliseconds
+        """
+        with self._lock:
+            waits = sorted(self._recent_waits)
+            wait_p95 = waits[max(0, math.ceil(0.95 * len(waits)) - 1)] if waits else 0.0
+            stats = {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "connects": self.connects,
+                "wait_ms_total": round(self.wait_seconds_total * 1000, 3),
+                "wait_ms_max": round(self.wait_seconds_max * 1000, 3),
+                "wait_ms_p95": round(wait_p95 * 1000, 3),
+            }
+
+        pool = self.pool
+        if pool is not None:
+            stats.update(
+                {
+                    "size": pool.size(),
+                    "checked_out": pool.checkedout(),
+                    "checked_in": pool.checkedin(),
+                    "overflow": max(pool.overflow(), 0),
+                }
+            )
+        return stats
+
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """Async queue pool that records checkout wait times and timeouts.
+
+    Wait time covers queueing for a free connection and, when the pool
+    grows into its overflow, opening the new connection.
+    """
+
+    metrics: PoolMetrics
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        """Initialize pool with its own metrics collector."""
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+        self.metrics.pool = self
+
+    def _do_get(self) -> Any:
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            self.metrics.record_timeout()
+            raise
+        self.metrics.record_checkout(time.perf_counter() - start)
+        return connection
+
+    def _create_connection(self) -> Any:
+        self.metrics.record_connect()
+        return super()._create_connection()
+
+    def recreate(self) -> "InstrumentedAsyncQueuePool":
+        """Recreate the pool, keeping the same metrics collector."""
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        self.metrics.pool = pool
+        return pool
@@ -1,13 +1,34 @@
 """Database session management."""
 
-from typing import AsyncGenerator
+import asyncio
+import time
+from typing import Any, AsyncGenerator, Optional
 from urllib.parse import parse_qs, urlencode, urlparse, urlunparse
 
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 
 from app.core.config import get_settings
+from app.core.logging import get_logger
+from app.core.tracing import instrument_engine
+from app.db.pool import InstrumentedAsyncQueuePool, PoolMetrics
 
 settings = get_settings()
+logger = get_logger(__name__)
+
+# Replication delay of a standby; 0 when it has replayed everything it
+# received, NULL when the server is not a standby at all
+REPLICA_LAG_QUERY = """
+SELECT CASE
+    WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+    ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())
+END
+"""
 
 
 def _clean_database_url_for_asyncpg(url: str) -> str:
@@ -51,22 +72,159 @@ def _clean_database_url_for_asyncpg(url: str) -> str:
 # Process database URL to remove incompatible parameters
 cleaned_database_url = _clean_database_url_for_asyncpg(settings.DATABASE_URL)
 
-# Create async engine
-engine = create_async_engine(
-    cleaned_database_url,
-    echo=settings.DEBUG,
-    future=True,
-    pool_pre_ping=True,
-)
 
-# Create async session factory
-AsyncSessionLocal = async_sessionmaker(
-    engine,
-    class_=AsyncSession,
-    expire_on_commit=False,
-    autocommit=False,
-    autoflush=False,
-)
+def _connect_args() -> dict:
+    """Build asyncpg connection arguments from settings."""
+    connect_args: dict = {"statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE}
+    if settings.DB_STATEMENT_TIMEOUT_MS:
+        connect_args["server_settings"] = {
+            "statement_timeout": str(settings.DB_STATEMENT_TIMEOUT_MS)
+        }
+    return connect_args
+
+
+def _create_engine(url: str) -> AsyncEngine:
+    """Create an async engine with the configured pool (one pool per worker process)."""
+    async_engine = create_async_engine(
+        url,
+        echo=settings.DEBUG,
+        future=True,
+        pool_pre_ping=True,
+        poolclass=InstrumentedAsyncQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        connect_args=_connect_args(),
+    )
+    if settings.TRACING_ENABLED:
+        instrument_engine(async_engine)
+    return async_engine
+
+
+def _create_sessionmaker(bind: AsyncEngine) -> async_sessionmaker:
+    """Create an async session factory bound to an engine."""
+    return async_sessionmaker(
+        bind,
+        class_=AsyncSession,
+        expire_on_commit=False,
+        autocommit=False,
+        autoflush=False,
+    )
+
+
+# Create async engine and session factory (primary)
+engine = _create_engine(cleaned_database_url)
+AsyncSessionLocal = _create_sessionmaker(engine)
+
+# Optional read replica for read-only routes
+read_engine: Optional[AsyncEngine] = None
+ReadSessionLocal: Optional[async_sessionmaker] = None
+if settings.DATABASE_READ_REPLICA_URL:
+    read_engine = _create_engine(
+        _clean_database_url_for_asyncpg(settings.DATABASE_READ_REPLICA_URL)
+    )
+    ReadSessionLocal = _create_sessionmaker(read_engine)
+
+
+def get_pool_metrics() -> PoolMetrics:
+    """Get connection pool metrics for this worker process."""
+    return engine.sync_engine.pool.metrics
+
+
+class ReplicaLagMonitor:
+    """Cached replication lag check deciding whether reads may use a replica.
+
+    The lag is measured at most once per check interval; concurrent callers
+    share the result. A replica that lags too far behind, or cannot be
+    queried, is skipped until a later check finds it healthy again.
+    """
+
+    def __init__(
+        self,
+        replica_engine: AsyncEngine,
+        max_lag_seconds: float,
+        check_interval_seconds: float,
+        check_timeout_seconds: float,
+    ):
+        """Initialize monitor.
+
+        Args:
+            replica_engine: Engine connected to the replica
+            max_lag_seconds: Largest lag at which the replica is still used
+            check_interval_seconds: Minimum time between lag checks
+            check_timeout_seconds: Timeout for a single lag check
+        """
+        self.engine = replica_engine
+        self.max_lag_seconds = max_lag_seconds
+        self.check_interval_seconds = check_interval_seconds
+        self.check_timeout_seconds = check_timeout_seconds
+        self.lag_seconds: Optional[float] = None
+        self.usable = False
+        self._checked_at: Optional[float] = None
+        self._lock = asyncio.Lock()
+
+    def _is_stale(self) -> bool:
+        return (
+            self._checked_at is None
+            or time.monotonic() - self._checked_at >= self.check_interval_seconds
+        )
+
+    async def _measure_lag(self) -> float:
+        async with self.engine.connect() as conn:
+            result = await conn.execute(text(REPLICA_LAG_QUERY))
+            lag = result.scalar()
+        return float(lag or 0.0)
+
+    async def check(self) -> None:
+        """Measure the replica lag and update ``usable``."""
+        was_usable = self.usable
+        try:
+            self.lag_seconds = await asyncio.wait_for(
+                self._measure_lag(), timeout=self.check_timeout_seconds
+            )
+            self.usable = self.lag_seconds <= self.max_lag_seconds
+        except Exception as e:
+            self.lag_seconds = None
+            self.usable = False
+            if was_usable or self._checked_at is None:
+                logger.warning("Read replica lag check failed", error=str(e))
+        self._checked_at = time.monotonic()
+
+        if self.usable != was_usable:
+            logger.info(
+                "Read replica routing changed",
+                usable=self.usable,
+                lag_seconds=self.lag_seconds,
+                max_lag_seconds=self.max_lag_seconds,
+            )
+
+    async def is_usable(self) -> bool:
+        """Check whether reads may go to the replica, refreshing a stale lag check."""
+        if self._is_stale():
+            async with self._lock:
+                if self._is_stale():
+                    await self.check()
+        return self.usable
+
+    def status(self) -> dict[str, Any]:
+        """Get replica routing state for monitoring."""
+        return {
+            "usable": self.usable,
+            "lag_seconds": self.lag_seconds,
+            "max_lag_seconds": self.max_lag_seconds,
+            "pool": self.engine.sync_engine.pool.metrics.snapshot(),
+        }
+
+
+replica_monitor: Optional[ReplicaLagMonitor] = None
+if read_engine is not None:
+    replica_monitor = ReplicaLagMonitor(
+        read_engine,
+        max_lag_seconds=settings.DB_REPLICA_MAX_LAG_SECONDS,
+        check_interval_seconds=settings.DB_REPLICA_LAG_CHECK_INTERVAL_SECONDS,
+        check_timeout_seconds=settings.DB_REPLICA_LAG_CHECK_TIMEOUT_SECONDS,
+    )
 
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
@@ -81,3 +239,23 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
         finally:
             await session.close()
 
+
+async def get_read_db(use_primary: bool = False) -> AsyncGenerator[AsyncSession, None]:
+    """Dependency for getting a read-only database session.
+
+    Uses the read replica when one is configured and within the allowed lag,
+    and the primary otherwise.
+
+    Args:
+        use_primary: Force the primary (e.g. to read the client's own writes)
+    """
+    if use_primary or replica_monitor is None or not await replica_monitor.is_usable():
+        async for session in get_db():
+            yield session
+        return
+
+    async with ReadSessionLocal() as session:
+        try:
+            yield session
+        finally:
+            await session.close()
@@ -1,9 +1,12 @@
 """LLM providers for generating synthetic datasets."""
 
 from app.integrations.llm_providers.base import LLMProvider
+from app.integrations.llm_providers.batch_client import BatchClient, get_batch_client
 from app.integrations.llm_providers.factory import get_provider
+from app.integrations.llm_providers.fake_provider import FakeProvider
 from app.integrations.llm_providers.gemini_provider import GeminiProvider
 from app.integrations.llm_providers.openai_provider import OpenAIProvider
+from app.integrations.llm_providers.router import ProviderRoute, ProviderRouter
 from app.integrations.llm_providers.together_provider import TogetherProvider
 
 __all__ = [
@@ -11,6 +14,11 @@ __all__ = [
     "OpenAIProvider",
     "GeminiProvider",
     "TogetherProvider",
+    "FakeProvider",
+    "BatchClient",
+    "ProviderRoute",
+    "ProviderRouter",
     "get_provider",
+    "get_batch_client",
 ]
 
@@ -1,12 +1,126 @@
 """Base LLM provider interface."""
 
+import json
+import time
 from abc import ABC, abstractmethod
-from typing import Any
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Iterator, Optional
+
+from app.core.exceptions import ExternalServiceError
+from app.core.logging import get_logger
+from app.core.tracing import trace_llm_call
+from app.integrations.llm_providers.json_parsing import (
+    IncrementalJSONValidator,
+    MalformedJSONStreamError,
+    strip_json_fences,
+)
+
+logger = get_logger(__name__)
+
+# Deltas read after the JSON value completes, waiting for the usage block
+MAX_TRAILING_DELTAS = 8
+
+
+class UsageScope:
+    """Usage recorded by the provider calls made inside a ``usage_scope()`` block."""
+
+    def __init__(self, parent: Optional["UsageScope"] = None):
+        self.parent = parent
+        # Usage record of the most recent call
+        self.usage: Optional[dict[str, Any]] = None
+        # Usage block sent at the end of a stream (OpenAI format)
+        self.stream_usage: Optional[dict[str, Any]] = None
+
+
+_current_scope: ContextVar[Optional[UsageScope]] = ContextVar("llm_usage_scope", default=None)
+
+
+@contextmanager
+def usage_scope() -> Iterator[UsageScope]:
+    """Collect the usage of the provider calls made in this block.
+
+    Scopes live in the current task's context, so concurrent generations
+    sharing a provider instance never see each other's usage. On exit the
+    most recent usage record is passed on to the enclosing scope.
+
+    Yields:
+        Scope holding the recorded usage
+    """
+    scope = UsageScope(parent=_current_scope.get())
+    token = _current_scope.set(scope)
+    try:
+        yield scope
+    finally:
+        _current_scope.reset(token)
+        if scope.parent is not None and scope.usage is not None:
+            scope.parent.usage = scope.usage
 
 
 class LLMProvider(ABC):
     """Abstract base class for LLM providers."""
 
+    # Provider name used in logs and errors
+    name: str = "LLM"
+
+    # Usage record of the most recent call on this instance; shared by
+    # concurrent calls, so callers read their own usage from ``usage_scope``
+    last_usage: Optional[dict[str, Any]] = None
+
+    def _record_usage(
+        self,
+        model: str,
+        latency_ms: float,
+        prompt_tokens: Optional[int],
+        completion_tokens: Optional[int],
+        cached_tokens: Optional[int] = None,
+        estimated: bool = False,
+    ) -> dict[str, Any]:
+        """Store a normalized usage record for the most recent call.
+
+        The record also goes to the current ``usage_scope``, if any.
+
+        Args:
+            model: Model identifier
+            latency_ms: Wall-clock latency of the call
+            prompt_tokens: Prompt tokens billed
+            completion_tokens: Completion tokens billed
+            cached_tokens: Prompt tokens served from the provider cache
+            estimated: Whether token counts are estimated from text length
+
+        Returns:
+            Usage record
+        """
+        prompt_tokens = prompt_tokens or 0
+        completion_tokens = completion_tokens or 0
+        cached_tokens = cached_tokens or 0
+        self.last_usage = {
+            "provider": self.name.lower(),
+            "model": model,
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+            "cached_tokens": cached_tokens,
+            "cache_hit": cached_tokens > 0,
+            "latency_ms": round(latency_ms, 2),
+            "estimated": estimated,
+        }
+        scope = _current_scope.get()
+        if scope is not None:
+            scope.usage = self.last_usage
+        return self.last_usage
+
+    def _record_stream_usage(self, usage: dict[str, Any]) -> None:
+        """Store the usage block sent at the end of a stream (OpenAI format).
+
+        Args:
+            usage: Usage block with ``prompt_tokens``, ``completion_tokens``
+                and optionally ``prompt_tokens_details.cached_tokens``
+        """
+        scope = _current_scope.get()
+        if scope is not None:
+            scope.stream_usage = usage
+
     @abstractmethod
     async def generate(
         self,
@@ -57,3 +171,146 @@ class LLMProvider(ABC):
         """
         pass
 
+    async def stream_generate(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        model: str,
+        temperature: float = 0.7,
+        max_tokens: int = 2000,
+        json_mode: bool = False,
+    ) -> AsyncIterator[str]:
+        """Stream generated text as an async iterator of deltas.
+
+        Providers without native streaming yield the full completion once.
+        Providers that report usage at the end of a stream pass it to
+        ``_record_stream_usage``.
+
+        Args:
+            system_prompt: System prompt
+            user_prompt: User prompt
+            model: Model identifier
+            temperature: Sampling temperature
+            max_tokens: Maximum tokens to generate
+            json_mode: Ask the model for a JSON-only completion
+
+        Yields:
+            Text deltas
+
+        Raises:
+            ExternalServiceError: If generation fails
+        """
+        if json_mode:
+            user_prompt = f"{user_prompt}\n\nRespond with valid JSON only."
+        yield await self.generate(
+            system_prompt=system_prompt,
+            user_prompt=user_prompt,
+            model=model,
+            temperature=temperature,
+            max_tokens=max_tokens,
+        )
+
+    @trace_llm_call
+    async def generate_json_stream(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        model: str,
+        temperature: float = 0.7,
+        max_chars: Optional[int] = None,
+        allowed_keys: Optional[set[str]] = None,
+    ) -> Any:
+        """Generate JSON over a stream, aborting early on malformed output.
+
+        The completion is validated incrementally; the stream is closed as
+        soon as the output can no longer be valid JSON, writes a top-level
+        key outside ``allowed_keys`` or exceeds ``max_chars``. Once the
+        top-level value is complete, a few trailing deltas (whitespace or a
+        closing fence) are read for the usage block sent at the end of the
+        stream. Token counts are only estimated (and flagged) when neither
+        that block nor a call made by the stream recorded usage.
+
+        Args:
+            system_prompt: System prompt
+            user_prompt: User prompt
+            model: Model identifier
+            temperature: Sampling temperature
+            max_chars: Completion character budget (optional)
+            allowed_keys: Allowed top-level object keys (optional)
+
+        Returns:
+            Parsed JSON
+
+        Raises:
+            ExternalServiceError: If generation fails or is aborted
+        """
+        start = time.perf_counter()
+        validator = IncrementalJSONValidator(max_chars=max_chars, allowed_keys=allowed_keys)
+        chunks = []
+        trailing = ""
+        trailing_deltas = 0
+        with usage_scope() as scope:
+            stream = self.stream_generate(
+                system_prompt=system_prompt,
+                user_prompt=user_prompt,
+                model=model,
+                temperature=temperature,
+                json_mode=True,
+            )
+            try:
+                async for delta in stream:
+                    if not validator.complete:
+                        validator.feed(delta)
+                        chunks.append(delta)
+                        continue
+                    # Only whitespace or a closing fence may follow the value
+                    trailing += delta
+                    trailing_deltas += 1
+                    if trailing_deltas > MAX_TRAILING_DELTAS or not "```".startswith(
+                        trailing.strip()
+                    ):
+                        break
+            except MalformedJSONStreamError as e:
+                logger.warning(
+                    "Streamed generation aborted",
+                    provider=self.name,
+                    model=model,
+                    reason=e.reason,
+                    chars=validator.chars,
+                )
+                raise ExternalServiceError(
+                    self.name,
+                    f"Aborted streamed generation: {e}",
+                    details={"aborted": True, "reason": e.reason, "chars": validator.chars},
+                ) from e
+            finally:
+                await stream.aclose()
+
+        content = "".join(chunks)
+        latency_ms = (time.perf_counter() - start) * 1000
+        if scope.stream_usage:
+            usage = scope.stream_usage
+            self._record_usage(
+                model=model,
+                latency_ms=latency_ms,
+                prompt_tokens=usage.get("prompt_tokens"),
+                completion_tokens=usage.get("completion_tokens"),
+                cached_tokens=(usage.get("prompt_tokens_details") or {}).get("cached_tokens"),
+            )
+        elif scope.usage is None:
+            # No usage reported: estimate tokens at ~4 characters each
+            self._record_usage(
+                model=model,
+                latency_ms=latency_ms,
+                prompt_tokens=(len(system_prompt) + len(user_prompt)) // 4,
+                completion_tokens=len(content) // 4,
+                estimated=True,
+            )
+
+        content = strip_json_fences(content)
+        if not content:
+            return {}
+        try:
+            return json.loads(content)
+        except ValueError as e:
+            raise ExternalServiceError(self.name, f"Invalid JSON: {e}") from e
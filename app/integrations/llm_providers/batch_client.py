@@ -0,0 +1,376 @@
+"""Batch API client for offline generation (OpenAI Batch-style JSONL)."""
+
+import asyncio
+import json
+import time
+from typing import Any, Optional
+
+import httpx
+
+from app.core.config import get_settings
+from app.core.exceptions import ExternalServiceError
+from app.core.logging import get_logger
+from app.core.tracing import traced
+from app.integrations.llm_providers.json_parsing import strip_json_fences
+
+settings = get_settings()
+logger = get_logger(__name__)
+
+BATCH_ENDPOINT = "/v1/chat/completions"
+BATCH_COMPLETION_WINDOW = "24h"
+BATCH_TERMINAL_STATUSES = {"completed", "failed", "expired", "cancelled"}
+
+
+class BatchClient:
+    """Client for provider batch APIs following the OpenAI Batch protocol.
+
+    Requests are uploaded as a JSONL file, submitted as a batch job, polled
+    until a terminal status and read back from the output file.
+    """
+
+    def __init__(
+        self,
+        provider_name: str,
+        base_url: str,
+        api_key: str,
+        json_mode: bool = True,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        """Initialize batch client.
+
+        Args:
+            provider_name: Provider name used in logs and errors
+            base_url: API base URL (e.g. https://api.openai.com/v1)
+            api_key: API key
+            json_mode: Request ``response_format=json_object`` in each call
+            transport: Optional httpx transport (for local stand-in servers)
+        """
+        self.provider_name = provider_name
+        self.base_url = base_url.rstrip("/")
+        self.json_mode = json_mode
+        self.headers = {"Authorization": f"Bearer {api_key}"}
+        self.transport = transport
+
+    def _client(self) -> httpx.AsyncClient:
+        """Create an HTTP client bound to the provider base URL."""
+        return httpx.AsyncClient(
+            base_url=self.base_url,
+            headers=self.headers,
+            timeout=60.0,
+            transport=self.transport,
+        )
+
+    def build_jsonl(
+        self,
+        requests: list[dict[str, str]],
+        model: str,
+        temperature: float = 0.7,
+        max_tokens: int = 2000,
+    ) -> bytes:
+        """Build the JSONL batch input file.
+
+        Args:
+            requests: Dicts with a unique ``custom_id``, ``system_prompt`` and
+                ``user_prompt``
+            model: Model identifier
+            temperature: Sampling temperature
+            max_tokens: Maximum tokens per completion
+
+        Returns:
+            JSONL file content
+
+        Raises:
+            ValueError: If two requests share a ``custom_id``
+        """
+        lines = []
+        custom_ids = set()
+        for request in requests:
+            # Results are matched back by custom_id, so it must be unique
+            if request["custom_id"] in custom_ids:
+                raise ValueError(f"Duplicate custom_id in batch: {request['custom_id']}")
+            custom_ids.add(request["custom_id"])
+            user_prompt = request["user_prompt"]
+            if not self.json_mode:
+                # Add JSON instruction to prompt
+                user_prompt = f"{user_prompt}\n\nRespond with valid JSON only."
+            body: dict[str, Any] = {
+                "model": model,
+                "messages": [
+                    {"role": "system", "content": request["system_prompt"]},
+                    {"role": "user", "content": user_prompt},
+                ],
+                "temperature": temperature,
+                "max_tokens": max_tokens,
+            }
+            if self.json_mode:
+                body["response_format"] = {"type": "json_object"}
+            lines.append(
+                json.dumps(
+                    {
+                        "custom_id": request["custom_id"],
+                        "method": "POST",
+                        "url": BATCH_ENDPOINT,
+                        "body": body,
+                    }
+                )
+            )
+        return "\n".join(lines).encode("utf-8")
+
+    @traced()
+    async def submit(
+        self,
+        requests: list[dict[str, str]],
+        model: str,
+        temperature: float = 0.7,
+    ) -> str:
+        """Upload requests and create a batch job.
+
+        Args:
+            requests: Dicts with ``custom_id``, ``system_prompt`` and ``user_prompt``
+            model: Model identifier
+            temperature: Sampling temperature
+
+        Returns:
+            Provider batch ID
+
+        Raises:
+            ExternalServiceError: If upload or batch creation fails
+        """
+        content = self.build_jsonl(requests, model=model, temperature=temperature)
+        try:
+            async with self._client() as client:
+                upload = await client.post(
+                    "/files",
+                    data={"purpose": "batch"},
+                    files={"file": ("batch_input.jsonl", content, "application/jsonl")},
+                )
+                upload.raise_for_status()
+                input_file_id = upload.json()["id"]
+
+                response = await client.post(
+                    "/batches",
+                    json={
+                        "input_file_id": input_file_id,
+                        "endpoint": BATCH_ENDPOINT,
+                        "completion_window": BATCH_COMPLETION_WINDOW,
+                    },
+                )
+                response.raise_for_status()
+                batch_id = response.json()["id"]
+
+        except Exception as e:
+            logger.error("Batch submission failed", provider=self.provider_name, error=str(e))
+            raise ExternalServiceError(self.provider_name, str(e)) from e
+
+        logger.info(
+            "Batch submitted",
+            provider=self.provider_name,
+            batch_id=batch_id,
+            request_count=len(requests),
+        )
+        return batch_id
+
+    @traced()
+    async def get_batch(self, batch_id: str) -> dict[str, Any]:
+        """Get the current state of a batch job.
+
+        Args:
+            batch_id: Provider batch ID
+
+        Returns:
+            Batch object
+
+        Raises:
+            ExternalServiceError: If the request fails
+        """
+        try:
+            async with self._client() as client:
+                response = await client.get(f"/batches/{batch_id}")
+                response.raise_for_status()
+                return response.json()
+        except Exception as e:
+            logger.error("Batch polling failed", batch_id=batch_id, error=str(e))
+            raise ExternalServiceError(self.provider_name, str(e)) from e
+
+    @traced()
+    async def wait(
+        self,
+        batch_id: str,
+        poll_interval: Optional[float] = None,
+        timeout: Optional[float] = None,
+    ) -> dict[str, Any]:
+        """Poll a batch job until it reaches a terminal status.
+
+        Args:
+            batch_id: Provider batch ID
+            poll_interval: Seconds between polls (default from settings)
+            timeout: Maximum seconds to wait (default from settings)
+
+        Returns:
+            Final batch object
+
+        Raises:
+            ExternalServiceError: If polling fails, times out or the batch
+                does not complete
+        """
+        poll_interval = poll_interval if poll_interval is not None else settings.BATCH_POLL_INTERVAL_SECONDS
+        timeout = timeout if timeout is not None else settings.BATCH_TIMEOUT_SECONDS
+        deadline = time.monotonic() + timeout
+
+        while True:
+            batch = await self.get_batch(batch_id)
+            status = batch.get("status")
+            if status in BATCH_TERMINAL_STATUSES:
+                break
+            if time.monotonic() >= deadline:
+                raise ExternalServiceError(
+                    self.provider_name,
+                    f"Batch {batch_id} did not finish within {timeout}s",
+                    details={"batch_id": batch_id, "status": status},
+                )
+            await asyncio.sleep(poll_interval)
+
+        if status != "completed":
+            raise ExternalServiceError(
+                self.provider_name,
+                f"Batch {batch_id} ended with status '{status}'",
+                details={"batch_id": batch_id, "status": status},
+            )
+
+        logger.info("Batch completed", provider=self.provider_name, batch_id=batch_id)
+        return batch
+
+    def _parse_record(self, record: dict[str, Any]) -> dict[str, Any]:
+        """Parse one output record into the generated JSON and normalized usage.
+
+        Args:
+            record: Output file record
+
+        Returns:
+            Dict with the parsed JSON ``response`` and a normalized ``usage``
+
+        Raises:
+            ValueError: If the request failed or its completion is not a JSON object
+        """
+        if not isinstance(record, dict):
+            raise ValueError("Record is not a JSON object")
+        if record.get("error"):
+            raise ValueError(record["error"].get("message", "unknown error"))
+        body = record["response"]["body"]
+        if record["response"].get("status_code", 200) >= 400:
+            raise ValueError(body.get("error", {}).get("message", "request failed"))
+        message = body["choices"][0]["message"]["content"] or ""
+        response = json.loads(strip_json_fences(message)) if message else {}
+        if not isinstance(response, dict):
+            raise ValueError("Completion is not a JSON object")
+        usage = body.get("usage") or {}
+        prompt_tokens = usage.get("prompt_tokens") or 0
+        completion_tokens = usage.get("completion_tokens") or 0
+        cached_tokens = (usage.get("prompt_tokens_details") or {}).get("cached_tokens") or 0
+        return {
+            "response": response,
+            "usage": {
+                "provider": self.provider_name.lower(),
+                "model": body.get("model"),
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+                "cached_tokens": cached_tokens,
+                "cache_hit": cached_tokens > 0,
+                "latency_ms": None,
+                "estimated": False,
+            },
+        }
+
+    @traced()
+    async def fetch_results(
+        self,
+        batch: dict[str, Any],
+    ) -> tuple[dict[str, dict[str, Any]], dict[str, str]]:
+        """Download and parse the output and error files of a completed batch.
+
+        Requests rejected by the provider are only listed in the error file.
+        A line that cannot be parsed is reported under ``<file id>:<line
+        number>`` instead of aborting the whole ingest.
+
+        Args:
+            batch: Completed batch object
+
+        Returns:
+            Tuple of (results by custom_id, error messages by custom_id); each
+            result holds the parsed JSON ``response`` and a normalized ``usage``
+
+        Raises:
+            ExternalServiceError: If a result file cannot be downloaded
+        """
+        results: dict[str, dict[str, Any]] = {}
+        errors: dict[str, str] = {}
+
+        for file_id in (batch.get("output_file_id"), batch.get("error_file_id")):
+            if not file_id:
+                continue
+            try:
+                async with self._client() as client:
+                    response = await client.get(f"/files/{file_id}/content")
+                    response.raise_for_status()
+                    content = response.text
+            except Exception as e:
+                logger.error(
+                    "Batch result download failed",
+                    batch_id=batch.get("id"),
+                    file_id=file_id,
+                    error=str(e),
+                )
+                raise ExternalServiceError(self.provider_name, str(e)) from e
+
+            for line_number, line in enumerate(content.splitlines(), start=1):
+                if not line.strip():
+                    continue
+                custom_id = f"{file_id}:{line_number}"
+                try:
+                    record = json.loads(line)
+                    custom_id = record.get("custom_id") or custom_id
+                    results[custom_id] = self._parse_record(record)
+                except Exception as e:
+                    errors[custom_id] = str(e)
+
+        if errors:
+            logger.warning(
+                "Batch requests failed",
+                provider=self.provider_name,
+                batch_id=batch.get("id"),
+                failed=len(errors),
+                succeeded=len(results),
+            )
+        return results, errors
+
+
+def get_batch_client(provider_name: str) -> BatchClient:
+    """Get batch API client for a provider.
+
+    Args:
+        provider_name: Provider name (openai, together)
+
+    Returns:
+        BatchClient instance
+
+    Raises:
+        ExternalServiceError: If provider has no batch API support
+    """
+    clients = {
+        "openai": lambda: BatchClient(
+            "OpenAI", settings.OPENAI_API_BASE_URL, settings.OPENAI_API_KEY, json_mode=True
+        ),
+        "together": lambda: BatchClient(
+            "Together", settings.TOGETHER_API_BASE_URL, settings.TOGETHER_API_KEY, json_mode=False
+        ),
+    }
+
+    factory = clients.get(provider_name.lower())
+    if not factory:
+        raise ExternalServiceError(
+            "BatchClientFactory",
+            f"Provider {provider_name} has no batch API. Supported: {list(clients.keys())}",
+        )
+
+    return factory()
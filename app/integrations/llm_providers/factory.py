@@ -1,6 +1,7 @@
 """Factory for LLM providers."""
 
 from app.core.exceptions import ExternalServiceError
+from app.integrations.llm_providers.fake_provider import FakeProvider
 from app.integrations.llm_providers.gemini_provider import GeminiProvider
 from app.integrations.llm_providers.openai_provider import OpenAIProvider
 from app.integrations.llm_providers.together_provider import TogetherProvider
@@ -10,7 +11,7 @@ def get_provider(provider_name: str):
     """Get LLM provider instance.
 
     Args:
-        provider_name: Provider name (openai, gemini, together)
+        provider_name: Provider name (openai, gemini, together, fake)
 
     Returns:
         LLMProvider instance
@@ -22,6 +23,7 @@ def get_provider(provider_name: str):
         "openai": OpenAIProvider,
         "gemini": GeminiProvider,
         "together": TogetherProvider,
+        "fake": FakeProvider,
     }
 
     provider_class = providers.get(provider_name.lower())
@@ -0,0 +1,280 @@
+"""Deterministic fake LLM provider for offline load testing."""
+
+import asyncio
+import hashlib
+import json
+import math
+import random
+import re
+import time
+from typing import Any, AsyncIterator, Optional
+
+from app.core.config import get_settings
+from app.core.exceptions import ExternalServiceError
+from app.core.tracing import trace_llm_call
+from app.integrations.llm_providers.base import LLMProvider
+
+settings = get_settings()
+
+FAKE_MODEL = "fake-model"
+LATENCY_DISTRIBUTIONS = {"constant", "uniform", "normal", "lognormal"}
+
+# Characters per streamed delta
+STREAM_CHUNK_CHARS = 16
+
+# Prompt markers written by the multi-item generation mode
+_SEGMENT_MARKER = re.compile(r"^\[Segment (\d+)\]$", re.MULTILINE)
+_ITEMS_PER_SEGMENT = re.compile(r"Generate (\d+) distinct training example")
+
+_WORDS = (
+    "account", "analysis", "answer", "approach", "audit", "balance", "case", "claim",
+    "client", "clause", "context", "contract", "data", "detail", "document", "evidence",
+    "example", "factor", "issue", "method", "model", "notice", "option", "policy",
+    "process", "record", "request", "review", "risk", "rule", "section", "service",
+    "standard", "summary", "system", "term", "topic", "update", "value", "version",
+)
+
+
+class FakeProvider(LLMProvider):
+    """Local provider returning deterministic JSON without any network call.
+
+    Completions are derived from a hash of the model and prompts, so the same
+    prompt always yields the same example. Latency and injected failures are
+    drawn from a generator seeded with ``FAKE_LLM_SEED``, so a run is
+    reproducible call by call while retries of a failed prompt can succeed.
+    Prompt tokens of a system prompt already seen by the instance are
+    reported as cached, like a provider prefix cache.
+    """
+
+    name = "Fake"
+
+    def __init__(
+        self,
+        seed: Optional[int] = None,
+        latency_ms: Optional[float] = None,
+        latency_jitter_ms: Optional[float] = None,
+        latency_distribution: Optional[str] = None,
+        error_rate: Optional[float] = None,
+        rate_limit_rate: Optional[float] = None,
+        completion_tokens: Optional[int] = None,
+    ):
+        """Initialize fake provider (defaults from ``FAKE_LLM_*`` settings).
+
+        Args:
+            seed: Seed for latency and failure draws
+            latency_ms: Mean (median for lognormal) call latency
+            latency_jitter_ms: Latency spread (standard deviation or half-range)
+            latency_distribution: constant, uniform, normal or lognormal
+            error_rate: Share of calls failing with a server error
+            rate_limit_rate: Share of calls failing with a 429 response
+            completion_tokens: Completion tokens per call
+
+        Raises:
+            ExternalServiceError: If the latency distribution is unknown
+        """
+        self.latency_ms = settings.FAKE_LLM_LATENCY_MS if latency_ms is None else latency_ms
+        self.latency_jitter_ms = (
+            settings.FAKE_LLM_LATENCY_JITTER_MS if latency_jitter_ms is None else latency_jitter_ms
+        )
+        self.latency_distribution = (
+            latency_distribution or settings.FAKE_LLM_LATENCY_DISTRIBUTION
+        ).lower()
+        if self.latency_distribution not in LATENCY_DISTRIBUTIONS:
+            raise ExternalServiceError(
+                self.name,
+                f"Unknown latency distribution: {self.latency_distribution}. "
+                f"Supported: {sorted(LATENCY_DISTRIBUTIONS)}",
+            )
+        self.error_rate = settings.FAKE_LLM_ERROR_RATE if error_rate is None else error_rate
+        self.rate_limit_rate = (
+            settings.FAKE_LLM_RATE_LIMIT_RATE if rate_limit_rate is None else rate_limit_rate
+        )
+        self.completion_tokens = (
+            settings.FAKE_LLM_COMPLETION_TOKENS if completion_tokens is None else completion_tokens
+        )
+        self.rng = random.Random(settings.FAKE_LLM_SEED if seed is None else seed)
+        self._seen_system_prompts: set[str] = set()
+
+    def _draw_latency_ms(self) -> float:
+        """Draw a call latency from the configured distribution."""
+        mean, jitter = self.latency_ms, self.latency_jitter_ms
+        if self.latency_distribution == "constant" or jitter <= 0 or mean <= 0:
+            latency = mean
+        elif self.latency_distribution == "uniform":
+            latency = self.rng.uniform(mean - jitter, mean + jitter)
+        elif self.latency_distribution == "normal":
+            latency = self.rng.gauss(mean, jitter)
+        else:
+            latency = mean * math.exp(self.rng.gauss(0.0, jitter / mean))
+        return max(0.0, latency)
+
+    async def _simulate_call(self) -> None:
+        """Wait for the simulated latency and inject configured failures.
+
+        Raises:
+            ExternalServiceError: For injected 429 and server errors
+        """
+        latency_ms = self._draw_latency_ms()
+        roll = self.rng.random()
+        if roll < self.rate_limit_rate:
+            # Rate limits are rejected up front, without generation latency
+            raise ExternalServiceError(self.name, "429 Too Many Requests: rate limit exceeded")
+
+        await asyncio.sleep(latency_ms / 1000)
+        if roll < self.rate_limit_rate + self.error_rate:
+            raise ExternalServiceError(self.name, "500 Internal Server Error (injected)")
+
+    def _text(self, rng: random.Random, chars: int) -> str:
+        """Build deterministic filler text of roughly ``chars`` characters."""
+        words: list[str] = []
+        length = 0
+        while length < chars:
+            word = rng.choice(_WORDS)
+            words.append(word)
+            length += len(word) + 1
+        return " ".join(words).capitalize() + "."
+
+    def _example(self, rng: random.Random) -> dict[str, Any]:
+        """Build one training example sized to the configured completion tokens."""
+        budget = max(self.completion_tokens * 4, 40)
+        return {
+            "instruction": self._text(rng, budget // 6),
+            "input": "",
+            "ideal_response": self._text(rng, budget // 2),
+            "bad_response": self._text(rng, budget // 6),
+            "explanation": self._text(rng, budget // 6),
+        }
+
+    def _completion(self, system_prompt: str, user_prompt: str, model: str) -> dict[str, Any]:
+        """Build the deterministic JSON completion for a prompt.
+
+        Prompts from the multi-item generation mode get an ``items`` array
+        with the requested number of examples per numbered segment.
+        """
+        digest = hashlib.sha256(f"{model}\0{system_prompt}\0{user_prompt}".encode("utf-8")).digest()
+        rng = random.Random(digest)
+
+        segments = _SEGMENT_MARKER.findall(user_prompt)
+        if not segments:
+            return self._example(rng)
+
+        match = _ITEMS_PER_SEGMENT.search(system_prompt)
+        items_per_segment = int(match.group(1)) if match else 1
+        items = []
+        for number in segments:
+            for _ in range(items_per_segment):
+                items.append({"segment": int(number), **self._example(rng)})
+        return {"items": items}
+
+    def _record_fake_usage(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        content: str,
+        model: str,
+        start: float,
+    ) -> None:
+        """Record usage for a fake call (~4 characters per prompt token)."""
+        cached_tokens = len(system_prompt) // 4 if system_prompt in self._seen_system_prompts else 0
+        self._seen_system_prompts.add(system_prompt)
+        self._record_usage(
+            model=model,
+            latency_ms=(time.perf_counter() - start) * 1000,
+            prompt_tokens=(len(system_prompt) + len(user_prompt)) // 4,
+            completion_tokens=max(self.completion_tokens, len(content) // 4),
+            cached_tokens=cached_tokens,
+        )
+
+    @trace_llm_call
+    async def generate(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        model: str = FAKE_MODEL,
+        temperature: float = 0.7,
+        max_tokens: int = 2000,
+    ) -> str:
+        """Generate deterministic JSON text.
+
+        Args:
+            system_prompt: System prompt
+            user_prompt: User prompt
+            model: Model identifier
+            temperature: Sampling temperature (ignored)
+            max_tokens: Maximum tokens to generate (ignored)
+
+        Returns:
+            Generated text
+
+        Raises:
+            ExternalServiceError: For injected failures
+        """
+        start = time.perf_counter()
+        await self._simulate_call()
+        content = json.dumps(self._completion(system_prompt, user_prompt, model))
+        self._record_fake_usage(system_prompt, user_prompt, content, model, start)
+        return content
+
+    @trace_llm_call
+    async def generate_json(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        model: str = FAKE_MODEL,
+        temperature: float = 0.7,
+    ) -> dict[str, Any]:
+        """Generate a deterministic JSON response.
+
+        Args:
+            system_prompt: System prompt
+            user_prompt: User prompt
+            model: Model identifier
+            temperature: Sampling temperature (ignored)
+
+        Returns:
+            Generated JSON as dict
+
+        Raises:
+            ExternalServiceError: For injected failures
+        """
+        start = time.perf_counter()
+        await self._simulate_call()
+        response = self._completion(system_prompt, user_prompt, model)
+        self._record_fake_usage(system_prompt, user_prompt, json.dumps(response), model, start)
+        return response
+
+    async def stream_generate(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        model: str = FAKE_MODEL,
+        temperature: float = 0.7,
+        max_tokens: int = 2000,
+        json_mode: bool = False,
+    ) -> AsyncIterator[str]:
+        """Stream deterministic JSON text in fixed-size deltas.
+
+        The simulated latency is spent before the first delta; usage is
+        recorded after the last one, like a usage block ending the stream.
+
+        Args:
+            system_prompt: System prompt
+            user_prompt: User prompt
+            model: Model identifier
+            temperature: Sampling temperature (ignored)
+            max_tokens: Maximum tokens to generate (ignored)
+            json_mode: Ask the model for a JSON-only completion (always JSON)
+
+        Yields:
+            Text deltas
+
+        Raises:
+            ExternalServiceError: For injected failures
+        """
+        start = time.perf_counter()
+        await self._simulate_call()
+        content = json.dumps(self._completion(system_prompt, user_prompt, model))
+        for i in range(0, len(content), STREAM_CHUNK_CHARS):
+            yield content[i : i + STREAM_CHUNK_CHARS]
+            await asyncio.sleep(0)
+        self._record_fake_usage(system_prompt, user_prompt, content, model, start)
@@ -1,12 +1,14 @@
 """Google Gemini LLM provider."""
 
 import json
-from typing import Any
+import time
+from typing import Any, AsyncIterator
 
 import google.generativeai as genai
 
 from app.core.config import get_settings
 from app.core.exceptions import ExternalServiceError
+from app.core.tracing import trace_llm_call
 from app.core.logging import get_logger
 from app.integrations.llm_providers.base import LLMProvider
 
@@ -20,6 +22,26 @@ genai.configure(api_key=settings.GOOGLE_GEMINI_API_KEY)
 class GeminiProvider(LLMProvider):
     """Google Gemini LLM provider."""
 
+    name = "Gemini"
+
+    def _record_response_usage(self, response: Any, model: str, start: float) -> None:
+        """Record usage from a Gemini response.
+
+        Args:
+            response: Gemini generate_content response
+            model: Model identifier
+            start: ``time.perf_counter()`` value taken before the call
+        """
+        usage = getattr(response, "usage_metadata", None)
+        self._record_usage(
+            model=model,
+            latency_ms=(time.perf_counter() - start) * 1000,
+            prompt_tokens=getattr(usage, "prompt_token_count", None),
+            completion_tokens=getattr(usage, "candidates_token_count", None),
+            cached_tokens=getattr(usage, "cached_content_token_count", None),
+        )
+
+    @trace_llm_call
     async def generate(
         self,
         system_prompt: str,
@@ -47,6 +69,7 @@ class GeminiProvider(LLMProvider):
             model_instance = genai.GenerativeModel(model)
             full_prompt = f"{system_prompt}\n\n{user_prompt}"
 
+            start = time.perf_counter()
             response = await model_instance.generate_content_async(
                 full_prompt,
                 generation_config={
@@ -54,6 +77,7 @@ class GeminiProvider(LLMProvider):
                     "max_output_tokens": max_tokens,
                 },
             )
+            self._record_response_usage(response, model, start)
 
             content = response.text
             logger.info("Gemini generation completed", model=model)
@@ -63,6 +87,7 @@ class GeminiProvider(LLMProvider):
             logger.error("Gemini generation failed", error=str(e), model=model)
             raise ExternalServiceError("Gemini", str(e)) from e
 
+    @trace_llm_call
     async def generate_json(
         self,
         system_prompt: str,
@@ -88,12 +113,14 @@ class GeminiProvider(LLMProvider):
             model_instance = genai.GenerativeModel(model)
             full_prompt = f"{system_prompt}\n\n{user_prompt}\n\nRespond with valid JSON only."
 
+            start = time.perf_counter()
             response = await model_instance.generate_content_async(
                 full_prompt,
                 generation_config={
                     "temperature": temperature,
                 },
             )
+            self._record_response_usage(response, model, start)
 
             content = response.text
             if content:
@@ -113,3 +140,63 @@ class GeminiProvider(LLMProvider):
             logger.error("Gemini JSON generation failed", error=str(e), model=model)
             raise ExternalServiceError("Gemini", str(e)) from e
 
+    async def stream_generate(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        model: str = "gemini-pro",
+        temperature: float = 0.7,
+        max_tokens: int = 2000,
+        json_mode: bool = False,
+    ) -> AsyncIterator[str]:
+        """Stream generated text from Gemini.
+
+        The ``usage_metadata`` of the last chunk is recorded as the stream usage.
+
+        Args:
+            system_prompt: System prompt
+            user_prompt: User prompt
+            model: Model identifier
+            temperature: Sampling temperature
+            max_tokens: Maximum tokens to generate
+            json_mode: Ask the model for a JSON-only completion
+
+        Yields:
+            Text deltas
+
+        Raises:
+            ExternalServiceError: If generation fails
+        """
+        full_prompt = f"{system_prompt}\n\n{user_prompt}"
+        if json_mode:
+            full_prompt = f"{full_prompt}\n\nRespond with valid JSON only."
+
+        try:
+            model_instance = genai.GenerativeModel(model)
+            response = await model_instance.generate_content_async(
+                full_prompt,
+                generation_config={
+                    "temperature": temperature,
+                    "max_output_tokens": max_tokens,
+                },
+                stream=True,
+            )
+            async for chunk in response:
+                usage = getattr(chunk, "usage_metadata", None)
+                if usage and getattr(usage, "prompt_token_count", None):
+                    # Cumulative counts, in the OpenAI format read by generate_json_stream
+                    self._record_stream_usage(
+                        {
+                            "prompt_tokens": usage.prompt_token_count,
+                            "completion_tokens": getattr(usage, "candidates_token_count", None),
+                            "prompt_tokens_details": {
+                                "cached_tokens": getattr(usage, "cached_content_token_count", None)
+                            },
+                        }
+                    )
+                if chunk.parts and chunk.text:
+                    yield chunk.text
+
+        except Exception as e:
+            logger.error("Gemini streaming generation failed", error=str(e), model=model)
+            raise ExternalServiceError("Gemini", str(e)) from e
@@ -0,0 +1,160 @@
+"""JSON parsing helpers for LLM completions."""
+
+from typing import Optional
+
+# Characters allowed outside strings besides structure and whitespace
+_LITERAL_CHARS = set("0123456789-+.eEtruefalsn")
+_WHITESPACE = set(" \t\r\n")
+_FENCE_PREFIXES = ("```json", "```")
+
+
+def strip_json_fences(content: str) -> str:
+    """Strip markdown code fences around a JSON completion.
+
+    Args:
+        content: Raw completion text
+
+    Returns:
+        Text with surrounding ```json / ``` fences removed
+    """
+    content = content.strip()
+    if content.startswith("```json"):
+        content = content[7:]
+    if content.startswith("```"):
+        content = content[3:]
+    if content.endswith("```"):
+        content = content[:-3]
+    return content.strip()
+
+
+class MalformedJSONStreamError(Exception):
+    """Raised when a streamed completion can no longer become valid JSON."""
+
+    def __init__(self, reason: str, message: str):
+        self.reason = reason
+        super().__init__(message)
+
+
+class IncrementalJSONValidator:
+    """Validate a JSON completion chunk by chunk as it streams in.
+
+    Tracks string/escape state and bracket nesting so that a stream can be
+    aborted as soon as it is structurally invalid, writes an unexpected
+    top-level key, or exceeds its character budget, instead of after the
+    whole completion has been paid for. A leading markdown code fence is
+    tolerated.
+    """
+
+    def __init__(
+        self,
+        max_chars: Optional[int] = None,
+        allowed_keys: Optional[set[str]] = None,
+    ):
+        """Initialize validator.
+
+        Args:
+            max_chars: Maximum completion length before aborting (optional)
+            allowed_keys: Allowed top-level object keys (optional)
+        """
+        self.max_chars = max_chars
+        self.allowed_keys = allowed_keys
+        self.chars = 0
+        self.started = False
+        self.complete = False
+        self._prefix = ""
+        self._stack: list[str] = []
+        self._in_string = False
+        self._escape = False
+        self._expect_key = False
+        self._key_buffer: Optional[list[str]] = None
+
+    def feed(self, chunk: str) -> None:
+        """Consume the next chunk of the completion.
+
+        Args:
+            chunk: Text delta
+
+        Raises:
+            MalformedJSONStreamError: If the completion can no longer be valid
+        """
+        self.chars += len(chunk)
+        if self.max_chars is not None and self.chars > self.max_chars:
+            raise MalformedJSONStreamError(
+                "budget_exceeded",
+                f"Completion exceeded {self.max_chars} characters",
+            )
+        for char in chunk:
+            if self.complete:
+                return
+            if not self.started:
+                self._consume_prefix(char)
+            else:
+                self._consume(char)
+
+    def _consume_prefix(self, char: str) -> None:
+        """Consume characters before the top-level value starts."""
+        if char in "{[":
+            if self._prefix.strip() not in ("",) + _FENCE_PREFIXES:
+                raise MalformedJSONStreamError(
+                    "leading_text", "Unexpected text before JSON value"
+                )
+            self.started = True
+            self._consume(char)
+            return
+
+        self._prefix += char
+        stripped = self._prefix.lstrip()
+        if stripped and not any(fence.startswith(stripped.rstrip()) for fence in _FENCE_PREFIXES):
+            raise MalformedJSONStreamError("leading_text", "Unexpected text before JSON value")
+
+    def _consume(self, char: str) -> None:
+        """Consume a character inside the top-level value."""
+        if self._in_string:
+            if self._escape:
+                self._escape = False
+            elif char == "\\":
+                self._escape = True
+            elif char == '"':
+                self._in_string = False
+                if self._key_buffer is not None:
+                    self._check_key("".join(self._key_buffer))
+                    self._key_buffer = None
+                return
+            elif ord(char) < 0x20:
+                raise MalformedJSONStreamError(
+                    "control_character", "Unescaped control character in string"
+                )
+            if self._key_buffer is not None:
+                self._key_buffer.append(char)
+            return
+
+        if char in _WHITESPACE or char == ":":
+            return
+        if char == '"':
+            self._in_string = True
+            if self._expect_key and self._stack == ["}"]:
+                self._key_buffer = []
+            self._expect_key = False
+            return
+        if char in "{[":
+            self._stack.append("}" if char == "{" else "]")
+            self._expect_key = self._stack == ["}"]
+            return
+        if char in "}]":
+            if not self._stack or self._stack[-1] != char:
+                raise MalformedJSONStreamError("mismatched_bracket", f"Unexpected '{char}'")
+            self._stack.pop()
+            self._expect_key = False
+            if not self._stack:
+                self.complete = True
+            return
+        if char == ",":
+            self._expect_key = self._stack == ["}"]
+            return
+        if char not in _LITERAL_CHARS:
+            raise MalformedJSONStreamError("unexpected_character", f"Unexpected '{char}'")
+
+    def _check_key(self, key: str) -> None:
+        """Check a completed top-level key against the allowed keys."""
+        if self.allowed_keys is not None and key not in self.allowed_keys:
+            raise MalformedJSONStreamError("unexpected_key", f"Unexpected top-level key '{key}'")
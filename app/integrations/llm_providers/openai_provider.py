@@ -1,12 +1,14 @@
 """OpenAI LLM provider."""
 
 import json
-from typing import Any
+import time
+from typing import Any, AsyncIterator
 
 from openai import AsyncOpenAI
 
 from app.core.config import get_settings
 from app.core.exceptions import ExternalServiceError
+from app.core.tracing import trace_llm_call
 from app.core.logging import get_logger
 from app.integrations.llm_providers.base import LLMProvider
 
@@ -17,10 +19,31 @@ logger = get_logger(__name__)
 class OpenAIProvider(LLMProvider):
     """OpenAI LLM provider."""
 
+    name = "OpenAI"
+
     def __init__(self):
         """Initialize OpenAI client."""
         self.client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
 
+    def _record_response_usage(self, response: Any, model: str, start: float) -> None:
+        """Record usage from a chat completion response.
+
+        Args:
+            response: Chat completion response
+            model: Model identifier
+            start: ``time.perf_counter()`` value taken before the call
+        """
+        usage = response.usage
+        details = getattr(usage, "prompt_tokens_details", None) if usage else None
+        self._record_usage(
+            model=model,
+            latency_ms=(time.perf_counter() - start) * 1000,
+            prompt_tokens=usage.prompt_tokens if usage else None,
+            completion_tokens=usage.completion_tokens if usage else None,
+            cached_tokens=getattr(details, "cached_tokens", None),
+        )
+
+    @trace_llm_call
     async def generate(
         self,
         system_prompt: str,
@@ -45,6 +68,7 @@ class OpenAIProvider(LLMProvider):
             ExternalServiceError: If generation fails
         """
         try:
+            start = time.perf_counter()
             response = await self.client.chat.completions.create(
                 model=model,
                 messages=[
@@ -54,6 +78,7 @@ class OpenAIProvider(LLMProvider):
                 temperature=temperature,
                 max_tokens=max_tokens,
             )
+            self._record_response_usage(response, model, start)
 
             content = response.choices[0].message.content
             logger.info("OpenAI generation completed", model=model, tokens=response.usage.total_tokens)
@@ -63,6 +88,7 @@ class OpenAIProvider(LLMProvider):
             logger.error("OpenAI generation failed", error=str(e), model=model)
             raise ExternalServiceError("OpenAI", str(e)) from e
 
+    @trace_llm_call
     async def generate_json(
         self,
         system_prompt: str,
@@ -85,6 +111,7 @@ class OpenAIProvider(LLMProvider):
             ExternalServiceError: If generation fails
         """
         try:
+            start = time.perf_counter()
             response = await self.client.chat.completions.create(
                 model=model,
                 messages=[
@@ -94,6 +121,7 @@ class OpenAIProvider(LLMProvider):
                 temperature=temperature,
                 response_format={"type": "json_object"},
             )
+            self._record_response_usage(response, model, start)
 
             content = response.choices[0].message.content
             if content:
@@ -104,3 +132,68 @@ class OpenAIProvider(LLMProvider):
             logger.error("OpenAI JSON generation failed", error=str(e), model=model)
             raise ExternalServiceError("OpenAI", str(e)) from e
 
+    async def stream_generate(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        model: str = "gpt-4-turbo-preview",
+        temperature: float = 0.7,
+        max_tokens: int = 2000,
+        json_mode: bool = False,
+    ) -> AsyncIterator[str]:
+        """Stream generated text from OpenAI.
+
+        Args:
+            system_prompt: System prompt
+            user_prompt: User prompt
+            model: Model identifier
+            temperature: Sampling temperature
+            max_tokens: Maximum tokens to generate
+            json_mode: Request a JSON object completion
+
+        The usage block OpenAI sends in the last chunk is recorded as the
+        stream usage.
+
+        Yields:
+            Text deltas
+
+        Raises:
+            ExternalServiceError: If generation fails
+        """
+        extra_args = {}
+        if json_mode:
+            extra_args["response_format"] = {"type": "json_object"}
+
+        try:
+            stream = await self.client.chat.completions.create(
+                model=model,
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": user_prompt},
+                ],
+                temperature=temperature,
+                max_tokens=max_tokens,
+                stream=True,
+                # Not a named argument in this client version
+                extra_body={"stream_options": {"include_usage": True}},
+                **extra_args,
+            )
+        except Exception as e:
+            logger.error("OpenAI streaming generation failed", error=str(e), model=model)
+            raise ExternalServiceError("OpenAI", str(e)) from e
+
+        try:
+            async for chunk in stream:
+                usage = getattr(chunk, "usage", None)
+                if usage:
+                    self._record_stream_usage(
+                        usage if isinstance(usage, dict) else usage.model_dump()
+                    )
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+        except Exception as e:
+            logger.error("OpenAI streaming generation failed", error=str(e), model=model)
+            raise ExternalServiceError("OpenAI", str(e)) from e
+        finally:
+            # Closing the response stops token generation when the caller aborts
+            await stream.response.aclose()
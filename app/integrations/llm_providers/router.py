@@ -0,0 +1,325 @@
+"""Weighted multi-provider routing with failover for LLM generation."""
+
+import random
+import time
+from typing import Any, Optional
+
+from app.core.exceptions import ExternalServiceError
+from app.core.logging import get_logger
+from app.core.metrics import LLM_ERRORS, observe_llm_call
+from app.integrations.llm_providers.base import LLMProvider, usage_scope
+from app.integrations.llm_providers.factory import get_provider
+
+logger = get_logger(__name__)
+
+DEFAULT_MODELS = {
+    "openai": "gpt-4-turbo-preview",
+    "gemini": "gemini-pro",
+    "together": "meta-llama/Llama-3-8b-chat-hf",
+    "fake": "fake-model",
+}
+
+# Smoothing factor for latency / error-rate moving averages
+EWMA_ALPHA = 0.2
+
+# Seconds a route is skipped after a failure / a rate-limit response
+ERROR_COOLDOWN_SECONDS = 5.0
+RATE_LIMIT_COOLDOWN_SECONDS = 30.0
+
+
+def _is_rate_limit_error(error: Exception) -> bool:
+    """Check whether a provider error looks like a rate-limit response."""
+    message = str(error).lower()
+    return "429" in message or "rate limit" in message or "rate_limit" in message
+
+
+class ProviderRoute:
+    """A provider/model pair in the routing pool with live health stats."""
+
+    def __init__(
+        self,
+        provider_name: str,
+        model: str,
+        weight: float = 1.0,
+        max_requests: Optional[int] = None,
+        provider: Optional[LLMProvider] = None,
+    ):
+        """Initialize route.
+
+        Args:
+            provider_name: Provider name (openai, gemini, together, fake)
+            model: Model identifier
+            weight: Static routing weight
+            max_requests: Request quota for this run (None for unlimited)
+            provider: Provider instance (created lazily when omitted)
+        """
+        self.provider_name = provider_name.lower()
+        self.model = model
+        self.weight = weight
+        self.remaining_quota = max_requests
+        self._provider = provider
+        self.latency_ms: Optional[float] = None
+        self.error_rate = 0.0
+        self.cooldown_until = 0.0
+        self.requests = 0
+        self.failures = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.cached_tokens = 0
+
+    @property
+    def provider(self) -> LLMProvider:
+        """Get (and lazily create) the provider instance."""
+        if self._provider is None:
+            self._provider = get_provider(self.provider_name)
+        return self._provider
+
+    def is_available(self, now: float) -> bool:
+        """Check whether the route has quota left and is not cooling down."""
+        if self.remaining_quota is not None and self.remaining_quota <= 0:
+            return False
+        return now >= self.cooldown_until
+
+    def score(self, reference_latency_ms: float) -> float:
+        """Compute the effective routing weight from live stats.
+
+        Args:
+            reference_latency_ms: Latency of the fastest known route
+
+        Returns:
+            Effective weight (higher is preferred)
+        """
+        latency_factor = 1.0
+        if self.latency_ms and reference_latency_ms:
+            latency_factor = reference_latency_ms / self.latency_ms
+        health_factor = max(0.05, 1.0 - self.error_rate)
+        return self.weight * latency_factor * health_factor
+
+    def record_success(self, latency_ms: float, usage: Optional[dict[str, Any]] = None) -> None:
+        """Update stats after a successful call."""
+        observe_llm_call(self.provider_name, self.model, latency_ms, usage)
+        self.requests += 1
+        if usage:
+            self.prompt_tokens += usage.get("prompt_tokens", 0)
+            self.completion_tokens += usage.get("completion_tokens", 0)
+            self.cached_tokens += usage.get("cached_tokens") or 0
+        if self.remaining_quota is not None:
+            self.remaining_quota -= 1
+        if self.latency_ms is None:
+            self.latency_ms = latency_ms
+        else:
+            self.latency_ms += EWMA_ALPHA * (latency_ms - self.latency_ms)
+        self.error_rate -= EWMA_ALPHA * self.error_rate
+
+    def record_failure(self, error: Exception, now: float) -> None:
+        """Update stats and cool the route down after a failed call."""
+        LLM_ERRORS.labels(
+            provider=self.provider_name,
+            model=self.model,
+            reason="rate_limit" if _is_rate_limit_error(error) else "error",
+        ).inc()
+        self.requests += 1
+        self.failures += 1
+        if self.remaining_quota is not None:
+            self.remaining_quota -= 1
+        self.error_rate += EWMA_ALPHA * (1.0 - self.error_rate)
+        cooldown = RATE_LIMIT_COOLDOWN_SECONDS if _is_rate_limit_error(error) else ERROR_COOLDOWN_SECONDS
+        self.cooldown_until = now + cooldown
+
+    def stats(self) -> dict[str, Any]:
+        """Get a snapshot of route stats for logging."""
+        return {
+            "provider": self.provider_name,
+            "model": self.model,
+            "requests": self.requests,
+            "failures": self.failures,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "cached_tokens": self.cached_tokens,
+            "cached_ratio": (
+                round(self.cached_tokens / self.prompt_tokens, 3) if self.prompt_tokens else 0.0
+            ),
+            "latency_ms": round(self.latency_ms, 2) if self.latency_ms is not None else None,
+            "error_rate": round(self.error_rate, 3),
+            "remaining_quota": self.remaining_quota,
+        }
+
+
+class ProviderRouter:
+    """Spread generation requests across a weighted pool of providers.
+
+    Each call picks a route at random, weighted by its static weight, live
+    latency and error rate, skipping routes that are out of quota or cooling
+    down after a failure. Failed calls fail over to the remaining routes.
+    """
+
+    def __init__(self, routes: list[ProviderRoute], rng: Optional[random.Random] = None):
+        """Initialize router.
+
+        Args:
+            routes: Routing pool
+            rng: Random generator (for reproducible routing)
+
+        Raises:
+            ExternalServiceError: If the pool is empty
+        """
+        if not routes:
+            raise ExternalServiceError("ProviderRouter", "Routing pool is empty")
+        self.routes = routes
+        self.rng = rng or random.Random()
+
+    @classmethod
+    def from_config(
+        cls,
+        pool_config: Optional[list[dict[str, Any]]],
+        default_provider: str,
+        default_model: Optional[str] = None,
+    ) -> "ProviderRouter":
+        """Build a router from a ``generation_config["providers"]`` list.
+
+        Each entry accepts ``provider``, ``model``, ``weight`` and
+        ``max_requests``. Without a pool the router wraps the single
+        default provider.
+
+        Args:
+            pool_config: Pool entries (optional)
+            default_provider: Provider used when no pool is configured
+            default_model: Model used when no pool is configured
+
+        Returns:
+            ProviderRouter instance
+
+        Raises:
+            ExternalServiceError: If a provider is unknown
+        """
+        if not pool_config:
+            model = default_model or "gpt-4-turbo-preview"
+            return cls([ProviderRoute(default_provider, model)])
+
+        routes = []
+        for entry in pool_config:
+            provider_name = entry["provider"].lower()
+            if provider_name not in DEFAULT_MODELS:
+                raise ExternalServiceError(
+                    "ProviderRouter",
+                    f"Unknown provider: {provider_name}. Supported: {list(DEFAULT_MODELS.keys())}",
+                )
+            routes.append(
+                ProviderRoute(
+                    provider_name=provider_name,
+                    model=entry.get("model") or DEFAULT_MODELS[provider_name],
+                    weight=float(entry.get("weight", 1.0)),
+                    max_requests=entry.get("max_requests"),
+                )
+            )
+        return cls(routes)
+
+    def _ranked_routes(self) -> list[ProviderRoute]:
+        """Order available routes by weighted random draw (without replacement)."""
+        now = time.monotonic()
+        candidates = [route for route in self.routes if route.is_available(now)]
+        if not candidates:
+            # Everything is cooling down: fall back to routes with quota left
+            candidates = [
+                route
+                for route in self.routes
+                if route.remaining_quota is None or route.remaining_quota > 0
+            ]
+
+        latencies = [route.latency_ms for route in candidates if route.latency_ms]
+        reference_latency = min(latencies) if latencies else 0.0
+
+        ranked = []
+        while candidates:
+            weights = [route.score(reference_latency) for route in candidates]
+            route = self.rng.choices(candidates, weights=weights, k=1)[0]
+            ranked.append(route)
+            candidates.remove(route)
+        return ranked
+
+    async def generate_json(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        temperature: float = 0.7,
+        stream: bool = False,
+        max_chars: Optional[int] = None,
+        allowed_keys: Optional[set[str]] = None,
+    ) -> tuple[Any, ProviderRoute, dict[str, Any]]:
+        """Generate JSON on the best available route, failing over on errors.
+
+        Args:
+            system_prompt: System prompt
+            user_prompt: User prompt
+            temperature: Sampling temperature
+            stream: Stream the completion and abort early on malformed output
+            max_chars: Completion character budget when streaming (optional)
+            allowed_keys: Allowed top-level keys when streaming (optional)
+
+        Returns:
+            Tuple of (generated JSON, route that served the request, usage record)
+
+        Raises:
+            ExternalServiceError: If every route fails or none has quota left
+        """
+        ranked = self._ranked_routes()
+        if not ranked:
+            raise ExternalServiceError("ProviderRouter", "No provider has quota left")
+
+        last_error: Optional[Exception] = None
+        for route in ranked:
+            start = time.perf_counter()
+            try:
+                # Usage of this call only, even if the provider instance is shared
+                with usage_scope() as scope:
+                    if stream:
+                        response = await route.provider.generate_json_stream(
+                            system_prompt=system_prompt,
+                            user_prompt=user_prompt,
+                            model=route.model,
+                            temperature=temperature,
+                            max_chars=max_chars,
+                            allowed_keys=allowed_keys,
+                        )
+                    else:
+                        response = await route.provider.generate_json(
+                            system_prompt=system_prompt,
+                            user_prompt=user_prompt,
+                            model=route.model,
+                            temperature=temperature,
+                        )
+            except Exception as e:
+                route.record_failure(e, time.monotonic())
+                last_error = e
+                logger.warning(
+                    "Provider call failed, failing over",
+                    provider=route.provider_name,
+                    model=route.model,
+                    error=str(e),
+                )
+                continue
+
+            latency_ms = (time.perf_counter() - start) * 1000
+            usage = scope.usage or {
+                "provider": route.provider_name,
+                "model": route.model,
+                "prompt_tokens": 0,
+                "completion_tokens": 0,
+                "total_tokens": 0,
+                "cached_tokens": 0,
+                "cache_hit": False,
+                "latency_ms": round(latency_ms, 2),
+                "estimated": True,
+            }
+            route.record_success(latency_ms, usage)
+            return response, route, usage
+
+        raise ExternalServiceError(
+            "ProviderRouter",
+            f"All providers failed: {last_error}",
+            details={"routes": [route.stats() for route in ranked]},
+        )
+
+    def stats(self) -> list[dict[str, Any]]:
+        """Get stats for every route in the pool."""
+        return [route.stats() for route in self.routes]
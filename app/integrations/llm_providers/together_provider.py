@@ -1,12 +1,14 @@
 """Together AI LLM provider."""
 
 import json
-from typing import Any
+import time
+from typing import Any, AsyncIterator, Optional
 
 import httpx
 
 from app.core.config import get_settings
 from app.core.exceptions import ExternalServiceError
+from app.core.tracing import trace_llm_call
 from app.core.logging import get_logger
 from app.integrations.llm_providers.base import LLMProvider
 
@@ -19,14 +21,39 @@ TOGETHER_API_URL = "https://api.together.xyz/v1/chat/completions"
 class TogetherProvider(LLMProvider):
     """Together AI LLM provider."""
 
-    def __init__(self):
-        """Initialize Together client."""
+    name = "Together"
+
+    def __init__(self, transport: Optional[httpx.AsyncBaseTransport] = None):
+        """Initialize Together client.
+
+        Args:
+            transport: Optional httpx transport (for local stand-in servers)
+        """
+        self.transport = transport
         self.api_key = settings.TOGETHER_API_KEY
         self.headers = {
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json",
         }
 
+    def _record_response_usage(self, data: dict[str, Any], model: str, start: float) -> None:
+        """Record usage from a chat completion payload.
+
+        Args:
+            data: Chat completion JSON payload
+            model: Model identifier
+            start: ``time.perf_counter()`` value taken before the call
+        """
+        usage = data.get("usage") or {}
+        self._record_usage(
+            model=model,
+            latency_ms=(time.perf_counter() - start) * 1000,
+            prompt_tokens=usage.get("prompt_tokens"),
+            completion_tokens=usage.get("completion_tokens"),
+            cached_tokens=(usage.get("prompt_tokens_details") or {}).get("cached_tokens"),
+        )
+
+    @trace_llm_call
     async def generate(
         self,
         system_prompt: str,
@@ -51,7 +78,8 @@ class TogetherProvider(LLMProvider):
             ExternalServiceError: If generation fails
         """
         try:
-            async with httpx.AsyncClient() as client:
+            start = time.perf_counter()
+            async with httpx.AsyncClient(transport=self.transport) as client:
                 response = await client.post(
                     TOGETHER_API_URL,
                     headers=self.headers,
@@ -68,6 +96,7 @@ class TogetherProvider(LLMProvider):
                 )
                 response.raise_for_status()
                 data = response.json()
+                self._record_response_usage(data, model, start)
 
                 content = data["choices"][0]["message"]["content"]
                 logger.info("Together generation completed", model=model)
@@ -77,6 +106,7 @@ class TogetherProvider(LLMProvider):
             logger.error("Together generation failed", error=str(e), model=model)
             raise ExternalServiceError("Together", str(e)) from e
 
+    @trace_llm_call
     async def generate_json(
         self,
         system_prompt: str,
@@ -102,7 +132,8 @@ class TogetherProvider(LLMProvider):
             # Add JSON instruction to prompt
             json_prompt = f"{user_prompt}\n\nRespond with valid JSON only."
 
-            async with httpx.AsyncClient() as client:
+            start = time.perf_counter()
+            async with httpx.AsyncClient(transport=self.transport) as client:
                 response = await client.post(
                     TOGETHER_API_URL,
                     headers=self.headers,
@@ -119,6 +150,7 @@ class TogetherProvider(LLMProvider):
                 )
                 response.raise_for_status()
                 data = response.json()
+                self._record_response_usage(data, model, start)
 
                 content = data["choices"][0]["message"]["content"]
                 if content:
@@ -138,3 +170,72 @@ class TogetherProvider(LLMProvider):
             logger.error("Together JSON generation failed", error=str(e), model=model)
             raise ExternalServiceError("Together", str(e)) from e
 
+    async def stream_generate(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        model: str = "meta-llama/Llama-3-8b-chat-hf",
+        temperature: float = 0.7,
+        max_tokens: int = 2000,
+        json_mode: bool = False,
+    ) -> AsyncIterator[str]:
+        """Stream generated text from Together AI (server-sent events).
+
+        Args:
+            system_prompt: System prompt
+            user_prompt: User prompt
+            model: Model identifier
+            temperature: Sampling temperature
+            max_tokens: Maximum tokens to generate
+            json_mode: Ask the model for a JSON-only completion
+
+        The usage block sent with the last event is recorded as the stream
+        usage.
+
+        Yields:
+            Text deltas
+
+        Raises:
+            ExternalServiceError: If generation fails
+        """
+        if json_mode:
+            # Add JSON instruction to prompt
+            user_prompt = f"{user_prompt}\n\nRespond with valid JSON only."
+
+        try:
+            async with httpx.AsyncClient(transport=self.transport) as client:
+                async with client.stream(
+                    "POST",
+                    TOGETHER_API_URL,
+                    headers=self.headers,
+                    json={
+                        "model": model,
+                        "messages": [
+                            {"role": "system", "content": system_prompt},
+                            {"role": "user", "content": user_prompt},
+                        ],
+                        "temperature": temperature,
+                        "max_tokens": max_tokens,
+                        "stream": True,
+                        "stream_options": {"include_usage": True},
+                    },
+                    timeout=60.0,
+                ) as response:
+                    response.raise_for_status()
+                    async for line in response.aiter_lines():
+                        if not line.startswith("data:"):
+                            continue
+                        payload = line[5:].strip()
+                        if payload == "[DONE]":
+                            break
+                        data = json.loads(payload)
+                        if data.get("usage"):
+                            self._record_stream_usage(data["usage"])
+                        choice = (data.get("choices") or [{}])[0]
+                        delta = (choice.get("delta") or {}).get("content")
+                        if delta:
+                            yield delta
+
+        except Exception as e:
+            logger.error("Together streaming generation failed", error=str(e), model=model)
+            raise ExternalServiceError("Together", str(e)) from e
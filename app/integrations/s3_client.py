@@ -1,6 +1,7 @@
 """AWS S3 client for file storage."""
 
 import io
+import time
 from typing import BinaryIO, Optional
 
 import boto3
@@ -9,6 +10,8 @@ from botocore.exceptions import ClientError
 from app.core.config import get_settings
 from app.core.exceptions import StorageError
 from app.core.logging import get_logger
+from app.core.metrics import S3_REQUEST_DURATION, S3_TRANSFER_BYTES
+from app.core.tracing import traced
 
 settings = get_settings()
 logger = get_logger(__name__)
@@ -24,9 +27,11 @@ class S3Client:
             aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
             aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
             region_name=settings.AWS_S3_REGION,
+            endpoint_url=settings.AWS_S3_ENDPOINT_URL or None,
         )
         self.bucket_name = settings.AWS_S3_BUCKET_NAME
 
+    @traced("s3.upload")
     async def upload_file(
         self,
         file_content: bytes | BinaryIO,
@@ -46,6 +51,7 @@ class S3Client:
         Raises:
             StorageError: If upload fails
         """
+        start = time.perf_counter()
         try:
             extra_args = {}
             if content_type:
@@ -61,13 +67,22 @@ class S3Client:
                 ExtraArgs=extra_args,
             )
 
+            S3_REQUEST_DURATION.labels(operation="upload", outcome="success").observe(
+                time.perf_counter() - start
+            )
+            if isinstance(file_content, io.BytesIO):
+                S3_TRANSFER_BYTES.labels(operation="upload").inc(file_content.getbuffer().nbytes)
             logger.info("File uploaded to S3", s3_key=s3_key, bucket=self.bucket_name)
             return s3_key
 
         except ClientError as e:
+            S3_REQUEST_DURATION.labels(operation="upload", outcome="error").observe(
+                time.perf_counter() - start
+            )
             logger.error("S3 upload failed", error=str(e), s3_key=s3_key)
             raise StorageError("upload", str(e)) from e
 
+    @traced("s3.download")
     async def download_file(self, s3_key: str) -> bytes:
         """Download file from S3.
 
@@ -80,16 +95,25 @@ class S3Client:
         Raises:
             StorageError: If download fails
         """
+        start = time.perf_counter()
         try:
             response = self.s3_client.get_object(Bucket=self.bucket_name, Key=s3_key)
             content = response["Body"].read()
+            S3_REQUEST_DURATION.labels(operation="download", outcome="success").observe(
+                time.perf_counter() - start
+            )
+            S3_TRANSFER_BYTES.labels(operation="download").inc(len(content))
             logger.info("File downloaded from S3", s3_key=s3_key)
             return content
 
         except ClientError as e:
+            S3_REQUEST_DURATION.labels(operation="download", outcome="error").observe(
+                time.perf_counter() - start
+            )
             logger.error("S3 download failed", error=str(e), s3_key=s3_key)
             raise StorageError("download", str(e)) from e
 
+    @traced("s3.delete")
     async def delete_file(self, s3_key: str) -> None:
         """Delete file from S3.
 
@@ -7,14 +7,30 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 
 from app.api.v1.router import api_router
+from app.core.compression import CompressionMiddleware
 from app.core.config import get_settings
 from app.core.exceptions import VRForgeException
 from app.core.gunicorn_logging import setup_gunicorn_logging
 from app.core.logging import configure_logging, get_logger, get_request_id
-from app.core.middleware import CORSLoggingMiddleware, LoggingMiddleware
+from app.core.metrics import MetricsMiddleware
+from app.core.middleware import ReadYourWritesMiddleware, RequestLoggingMiddleware
+from app.core.profiling import ProfilingMiddleware
+from app.core.tracing import configure_tracing, shutdown_tracing
 
 settings = get_settings()
-configure_logging(settings.LOG_LEVEL, settings.APP_ENV)
+configure_logging(
+    settings.LOG_LEVEL,
+    settings.APP_ENV,
+    async_sink=settings.LOG_ASYNC,
+    queue_size=settings.LOG_QUEUE_SIZE,
+    batch_size=settings.LOG_BATCH_SIZE,
+    trace_context=settings.TRACING_ENABLED,
+)
+configure_tracing(
+    settings.TRACING_ENABLED,
+    exporter=settings.TRACING_EXPORTER,
+    sample_ratio=settings.TRACING_SAMPLE_RATIO,
+)
 logger = get_logger(__name__)
 
 # Setup Gunicorn logging handler for invalid requests
@@ -24,9 +40,31 @@ setup_gunicorn_logging()
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan events."""
-    logger.info("Starting VRForge application", app_name=settings.APP_NAME, version="0.1.0")
+    from app.core.system_log import system_log_writer
+    from app.db.partitions import partition_maintainer
+    from app.db.session import engine, read_engine
+
+    logger.info(
+        "Starting VRForge application",
+        app_name=settings.APP_NAME,
+        version="0.1.0",
+        workers=settings.WORKERS,
+        db_pool_size=settings.DB_POOL_SIZE,
+        db_max_overflow=settings.DB_MAX_OVERFLOW,
+        db_max_connections_per_node=settings.WORKERS
+        * (settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW),
+        db_read_replica=read_engine is not None,
+    )
+    partition_maintainer.start()
+    system_log_writer.start()
     yield
     logger.info("Shutting down VRForge application")
+    await system_log_writer.stop()
+    await partition_maintainer.stop()
+    await engine.dispose()
+    if read_engine is not None:
+        await read_engine.dispose()
+    shutdown_tracing()
 
 
 app = FastAPI(
@@ -36,18 +74,6 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
-# Add logging middleware (must be first to capture all requests)
-# Enable request body logging only in DEBUG mode
-log_request_body = settings.LOG_LEVEL.upper() == "DEBUG"
-app.add_middleware(
-    LoggingMiddleware,
-    log_request_body=log_request_body,
-    log_response_body=False,  # Disabled by default, enable per-route if needed
-)
-
-# Add CORS logging middleware
-app.add_middleware(CORSLoggingMiddleware)
-
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -57,6 +83,30 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Read-your-writes cookie of write requests, for any response class
+if settings.DATABASE_READ_REPLICA_URL:
+    app.add_middleware(ReadYourWritesMiddleware)
+
+# Response compression (brotli/gzip), inside the metrics so latency includes it
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(CompressionMiddleware)
+
+# Request latency metrics per route template
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
+# Per-request profiles on demand (X-Profile header); not installed without an admin key
+if settings.PROFILING_ADMIN_KEY:
+    app.add_middleware(ProfilingMiddleware)
+
+# Request logging middleware (added last, so it is the outermost one and
+# also sees CORS preflights and CORS headers)
+# Enable request body logging only in DEBUG mode
+app.add_middleware(
+    RequestLoggingMiddleware,
+    log_request_body=settings.LOG_LEVEL.upper() == "DEBUG",
+)
+
 
 # Exception handlers
 @app.exception_handler(VRForgeException)
@@ -120,8 +170,10 @@ async def global_exception_handler(request: Request, exc: Exception):
 
 # Include routers
 # Health check at root level (no prefix) for EasyPanel
-from app.api.v1 import health
+from app.api.v1 import health, metrics
 app.include_router(health.router, tags=["health"])
+if settings.METRICS_ENABLED:
+    app.include_router(metrics.router, tags=["metrics"])
 # API v1 routes
 app.include_router(api_router, prefix="/api/v1")
 
@@ -31,6 +31,10 @@ class Dataset(Base, UUIDMixin, TimestampMixin):
     version: Mapped[int] = mapped_column(Integer, default=1, nullable=False)
     generation_config: Mapped[dict[str, Any]] = mapped_column(JSONB, default=dict, nullable=False)
     segment_filter: Mapped[dict[str, Any]] = mapped_column(JSONB, default=dict, nullable=False)
+    # Batch jobs of the latest offline generation (see SyntheticGeneratorService)
+    generation_state: Mapped[dict[str, Any]] = mapped_column(
+        JSONB, default=dict, server_default="{}", nullable=False
+    )
     total_items: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
     approved_items: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
     rejected_items: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
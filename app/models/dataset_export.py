@@ -1,8 +1,9 @@
 """Dataset export model."""
 
+from datetime import datetime
 from typing import Any
 
-from sqlalchemy import ForeignKey, Integer, String
+from sqlalchemy import DateTime, ForeignKey, Integer, String, func
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -24,6 +25,11 @@ class DatasetExport(Base, UUIDMixin):
     status: Mapped[str] = mapped_column(String(50), default="completed", nullable=False)
     item_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
     filters_applied: Mapped[dict[str, Any]] = mapped_column(JSONB, default=dict, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+    )
 
     # Relationships
     dataset: Mapped["Dataset"] = relationship("Dataset", back_populates="exports")
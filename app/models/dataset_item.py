@@ -2,7 +2,7 @@
 
 from typing import Any, Optional
 
-from sqlalchemy import Float, ForeignKey, String, Text
+from sqlalchemy import Boolean, Float, ForeignKey, Index, Integer, String, Text, text
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -13,6 +13,17 @@ class DatasetItem(Base, UUIDMixin, TimestampMixin):
     """Dataset item model representing a single training example."""
 
     __tablename__ = "dataset_items"
+    # Per-run usage index (migration 002) and query-shape indexes (review
+    # queue, export; migration 003)
+    __table_args__ = (
+        Index("idx_dataset_items_generation_run_id", "dataset_id", "generation_run_id"),
+        Index("idx_dataset_items_dataset_status", "dataset_id", "status", "created_at"),
+        Index(
+            "idx_dataset_items_pending_review",
+            "created_at",
+            postgresql_where=text("status = 'pending_review'"),
+        ),
+    )
 
     dataset_id: Mapped[str] = mapped_column(
         ForeignKey("datasets.id", ondelete="CASCADE"),
@@ -23,6 +34,16 @@ class DatasetItem(Base, UUIDMixin, TimestampMixin):
         nullable=True,
     )
     source_provider: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)
+    source_model: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
+    generation_run_id: Mapped[Optional[str]] = mapped_column(String(36), nullable=True)
+    prompt_tokens: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    completion_tokens: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    cached_tokens: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    latency_ms: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    # Token counts estimated from text length (stream without a usage block)
+    usage_estimated: Mapped[bool] = mapped_column(
+        Boolean, default=False, server_default=text("false"), nullable=False
+    )
     instruction: Mapped[str] = mapped_column(Text, nullable=False)
     input_text: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     ideal_response: Mapped[str] = mapped_column(Text, nullable=False)
@@ -3,7 +3,7 @@
 from datetime import datetime
 from typing import Any, Optional
 
-from sqlalchemy import DateTime, ForeignKey, Integer, String, Text, func
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, String, Text, func
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -14,6 +14,12 @@ class Segment(Base, UUIDMixin):
     """Segment model representing text units extracted from documents."""
 
     __tablename__ = "segments"
+    # Query-shape indexes (segment selection for generation); see migration 003
+    __table_args__ = (
+        Index("idx_segments_domain", "domain_id", "id"),
+        Index("idx_segments_domain_use_case", "domain_id", "use_case", "id"),
+        Index("idx_segments_domain_use_case_type", "domain_id", "use_case", "segment_type", "id"),
+    )
 
     domain_id: Mapped[str] = mapped_column(
         ForeignKey("domains.id", ondelete="CASCADE"),
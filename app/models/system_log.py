@@ -11,9 +11,14 @@ from app.db.base import Base, UUIDMixin
 
 
 class SystemLog(Base, UUIDMixin):
-    """System log model for application logging."""
+    """System log model for application logging.
+
+    The table is range-partitioned by month of ``created_at`` (see
+    ``app.db.partitions``), so ``created_at`` is part of the primary key.
+    """
 
     __tablename__ = "system_logs"
+    __table_args__ = {"postgresql_partition_by": "RANGE (created_at)"}
 
     level: Mapped[str] = mapped_column(String(20), nullable=False)
     module: Mapped[str] = mapped_column(String(100), nullable=False)
@@ -24,6 +29,7 @@ class SystemLog(Base, UUIDMixin):
     request_id: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
+        primary_key=True,
         server_default=func.now(),
         nullable=False,
     )
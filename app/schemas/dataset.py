@@ -1,6 +1,6 @@
 """Dataset schemas."""
 
-from typing import Any, Optional
+from typing import Any, Literal, Optional
 
 from pydantic import BaseModel, ConfigDict, Field
 
@@ -28,6 +28,10 @@ class DatasetGenerate(BaseModel):
     segment_ids: Optional[list[str]] = Field(None, description="Specific segment IDs to use")
     max_items: Optional[int] = Field(None, ge=1, le=10000, description="Maximum items to generate")
     batch_size: int = Field(10, ge=1, le=100, description="Batch size for generation")
+    mode: Literal["interactive", "offline"] = Field(
+        "interactive",
+        description="interactive: one call per item; offline: provider batch API",
+    )
 
 
 class DatasetResponse(BaseResponse):
@@ -61,6 +65,12 @@ class DatasetItemResponse(BaseModel):
     dataset_id: str
     segment_id: Optional[str]
     source_provider: Optional[str]
+    source_model: Optional[str] = None
+    generation_run_id: Optional[str] = None
+    prompt_tokens: Optional[int] = None
+    completion_tokens: Optional[int] = None
+    cached_tokens: Optional[int] = None
+    latency_ms: Optional[float] = None
     instruction: str
     input_text: Optional[str]
     ideal_response: str
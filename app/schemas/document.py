@@ -1,5 +1,6 @@
 """Document schemas."""
 
+from datetime import datetime
 from typing import Any, Optional
 
 from pydantic import BaseModel, ConfigDict, Field
@@ -37,8 +38,8 @@ class DocumentResponse(BaseModel):
     file_size: Optional[int]
     status: str
     metadata: dict[str, Any] = Field(alias="meta_data")
-    created_at: str
-    updated_at: str
+    created_at: datetime
+    updated_at: datetime
 
 
 class DocumentVersionResponse(BaseModel):
@@ -52,5 +53,5 @@ class DocumentVersionResponse(BaseModel):
     s3_key: Optional[str]
     extracted_text: Optional[str]
     processing_metadata: dict[str, Any]
-    created_at: str
+    created_at: datetime
 
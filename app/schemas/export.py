@@ -1,5 +1,6 @@
 """Export schemas."""
 
+from datetime import datetime
 from typing import Any, Optional
 
 from pydantic import BaseModel, ConfigDict, Field
@@ -27,5 +28,5 @@ class ExportResponse(BaseModel):
     item_count: int
     filters_applied: dict[str, Any]
     download_url: Optional[str] = None
-    created_at: str
+    created_at: datetime
 
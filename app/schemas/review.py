@@ -1,5 +1,6 @@
 """Review schemas."""
 
+from datetime import datetime
 from typing import Any, Optional
 
 from pydantic import BaseModel, ConfigDict, Field
@@ -61,5 +62,5 @@ class PendingReviewItem(BaseModel):
     explanation: Optional[str]
     quality_score: Optional[float]
     quality_flags: dict[str, Any]
-    created_at: str  # Keep as string since it's not from a model directly
+    created_at: datetime
 
@@ -1,5 +1,6 @@
 """Segment schemas."""
 
+from datetime import datetime
 from typing import Any, Optional
 
 from pydantic import BaseModel, ConfigDict, Field
@@ -19,7 +20,7 @@ class SegmentResponse(BaseModel):
     content: str
     position: int
     metadata: dict[str, Any] = Field(alias="meta_data")
-    created_at: str
+    created_at: datetime
 
 
 class SegmentFilter(BaseModel):
@@ -0,0 +1,55 @@
+"""Token usage and cost report schemas."""
+
+from datetime import datetime
+from typing import Optional
+
+from pydantic import BaseModel, ConfigDict
+
+
+class UsageBreakdown(BaseModel):
+    """Usage of one provider/model within a generation run."""
+
+    model_config = ConfigDict(protected_namespaces=())
+
+    provider: Optional[str]
+    model: Optional[str]
+    items: int
+    # Items whose token counts were estimated from text length
+    estimated_items: int = 0
+    prompt_tokens: int
+    completion_tokens: int
+    cached_tokens: int
+    avg_latency_ms: Optional[float]
+    avg_segment_chars: Optional[float]
+    cost_usd: Optional[float]
+
+
+class GenerationRunUsage(BaseModel):
+    """Usage and throughput of one generation run."""
+
+    generation_run_id: Optional[str]
+    items: int
+    estimated_items: int = 0
+    prompt_tokens: int
+    completion_tokens: int
+    cached_tokens: int
+    cost_usd: Optional[float]
+    started_at: Optional[datetime]
+    finished_at: Optional[datetime]
+    duration_seconds: Optional[float]
+    items_per_second: Optional[float]
+    tokens_per_item: Optional[float]
+    models: list[UsageBreakdown]
+
+
+class DatasetUsageReport(BaseModel):
+    """Usage, cost and throughput report for a dataset."""
+
+    dataset_id: str
+    items: int
+    estimated_items: int = 0
+    prompt_tokens: int
+    completion_tokens: int
+    cached_tokens: int
+    cost_usd: Optional[float]
+    runs: list[GenerationRunUsage]
@@ -7,6 +7,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.exceptions import NotFoundError
 from app.core.logging import get_logger
+from app.core.tracing import traced
 from app.models.domain import Domain
 
 logger = get_logger(__name__)
@@ -16,6 +17,7 @@ class DomainService:
     """Service for domain operations."""
 
     @staticmethod
+    @traced()
     async def create(
         db: AsyncSession,
         name: str,
@@ -48,6 +50,7 @@ class DomainService:
         return domain
 
     @staticmethod
+    @traced()
     async def get_by_id(db: AsyncSession, domain_id: str) -> Domain:
         """Get domain by ID.
 
@@ -68,6 +71,7 @@ class DomainService:
         return domain
 
     @staticmethod
+    @traced()
     async def get_by_slug(db: AsyncSession, slug: str) -> Optional[Domain]:
         """Get domain by slug.
 
@@ -82,6 +86,7 @@ class DomainService:
         return result.scalar_one_or_none()
 
     @staticmethod
+    @traced()
     async def list_all(db: AsyncSession, active_only: bool = True) -> list[Domain]:
         """List all domains.
 
@@ -99,6 +104,7 @@ class DomainService:
         return list(result.scalars().all())
 
     @staticmethod
+    @traced()
     async def update(
         db: AsyncSession,
         domain_id: str,
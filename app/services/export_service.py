@@ -4,11 +4,12 @@ import io
 import json
 from typing import Optional
 
-from sqlalchemy import select
+from sqlalchemy import Select, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.exceptions import NotFoundError
 from app.core.logging import get_logger
+from app.core.tracing import traced
 from app.integrations.s3_client import S3Client
 from app.models.dataset import Dataset
 from app.models.dataset_export import DatasetExport
@@ -24,6 +25,25 @@ class ExportService:
         """Initialize export service."""
         self.s3_client = S3Client()
 
+    @staticmethod
+    def items_query(dataset_id: str, approved_only: bool = True) -> Select:
+        """Build the query for the items of a dataset export.
+
+        Args:
+            dataset_id: Dataset ID
+            approved_only: Export only approved items
+
+        Returns:
+            Select over the exported items
+        """
+        query = select(DatasetItem).where(DatasetItem.dataset_id == dataset_id)
+
+        if approved_only:
+            query = query.where(DatasetItem.status == "approved")
+
+        return query
+
+    @traced()
     async def export_jsonl(
         self,
         db: AsyncSession,
@@ -52,12 +72,7 @@ class ExportService:
             raise NotFoundError("Dataset", dataset_id)
 
         # Get items
-        query = select(DatasetItem).where(DatasetItem.dataset_id == dataset_id)
-
-        if approved_only:
-            query = query.where(DatasetItem.status == "approved")
-
-        result = await db.execute(query)
+        result = await db.execute(ExportService.items_query(dataset_id, approved_only))
         items = list(result.scalars().all())
 
         # Generate JSONL content
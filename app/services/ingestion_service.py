@@ -1,5 +1,6 @@
 """Document ingestion service."""
 
+import time
 import uuid
 from datetime import datetime
 from typing import Optional
@@ -8,6 +9,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.exceptions import NotFoundError, ProcessingError
 from app.core.logging import get_logger
+from app.core.metrics import EXTRACTION_DURATION
+from app.core.tracing import traced
 from app.integrations.s3_client import S3Client
 from app.integrations.text_extractors.factory import get_extractor
 from app.models.document import Document, DocumentVersion
@@ -23,6 +26,7 @@ class IngestionService:
         """Initialize ingestion service."""
         self.s3_client = S3Client()
 
+    @traced()
     async def upload_document(
         self,
         db: AsyncSession,
@@ -83,6 +87,7 @@ class IngestionService:
         logger.info("Document uploaded", document_id=document.id, filename=filename)
         return document
 
+    @traced()
     async def process_document(
         self,
         db: AsyncSession,
@@ -122,7 +127,11 @@ class IngestionService:
 
             # Extract text
             extractor = get_extractor(document.content_type or "")
+            extract_start = time.perf_counter()
             extracted_text = await extractor.extract(file_content)
+            EXTRACTION_DURATION.labels(content_type=document.content_type).observe(
+                time.perf_counter() - extract_start
+            )
 
             # Get next version number
             from sqlalchemy import select, desc
@@ -7,6 +7,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.exceptions import NotFoundError
 from app.core.logging import get_logger
+from app.core.tracing import traced
 from app.models.model import Model
 
 logger = get_logger(__name__)
@@ -16,6 +17,7 @@ class ModelService:
     """Service for model operations."""
 
     @staticmethod
+    @traced()
     async def create(
         db: AsyncSession,
         domain_id: Optional[str],
@@ -62,6 +64,7 @@ class ModelService:
         return model
 
     @staticmethod
+    @traced()
     async def get_by_id(db: AsyncSession, model_id: str) -> Model:
         """Get model by ID.
 
@@ -82,6 +85,7 @@ class ModelService:
         return model
 
     @staticmethod
+    @traced()
     async def list_all(
         db: AsyncSession,
         domain_id: Optional[str] = None,
@@ -0,0 +1,223 @@
+"""Compiled prompt templates for dataset generation."""
+
+import json
+import re
+import string
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Optional
+
+from app.core.exceptions import ValidationError
+
+# Variables a user prompt template may reference
+TEMPLATE_VARIABLES = {"content", "domain", "use_case", "segment_type"}
+METADATA_PREFIX = "metadata."
+
+# Variables resolved once per run; the rest change per segment
+RUN_VARIABLES = {"domain", "use_case"}
+
+# Placeholders: {name} or {metadata.key}; any other brace is literal text
+_PLACEHOLDER_PATTERN = re.compile(r"\{([A-Za-z_][A-Za-z0-9_]*(?:\.[A-Za-z0-9_-]+)?)\}")
+
+DEFAULT_SYSTEM_PROMPT = "You are an expert at creating high-quality training examples for AI models."
+# Fixed instructions first and segment content last, so the prompt prefix
+# is identical across calls and can be served from provider prompt caches
+DEFAULT_USER_PROMPT_TEMPLATE = (
+    "Create a training example based on the content below. Generate an instruction, "
+    "input (if needed), ideal response, bad response, and explanation.\n\n"
+    "Content:\n{content}"
+)
+
+
+def _is_declared(name: str) -> bool:
+    """Check whether a placeholder name is a declared template variable."""
+    if name in TEMPLATE_VARIABLES:
+        return True
+    return name.startswith(METADATA_PREFIX) and len(name) > len(METADATA_PREFIX)
+
+
+class CompiledTemplate:
+    """A pre-parsed user prompt template.
+
+    The template is split once into literal text and variable slots, so
+    rendering is a single join and cannot fail on braces in the text.
+    """
+
+    def __init__(self, parts: list[tuple[bool, str]]):
+        """Initialize compiled template.
+
+        Args:
+            parts: Sequence of (is_variable, literal text or variable name)
+        """
+        self._parts = parts
+        self.variables = {value for is_variable, value in parts if is_variable}
+        self.uses_segment_metadata = any(
+            name == "segment_type" or name.startswith(METADATA_PREFIX) for name in self.variables
+        )
+
+        # Only literal text and run-level variables before the first
+        # segment-level variable form a prefix shared across calls
+        segment_slots = [
+            index
+            for index, (is_variable, value) in enumerate(parts)
+            if is_variable and value not in RUN_VARIABLES
+        ]
+        trailing = parts[segment_slots[-1] + 1 :] if segment_slots else []
+        self.segment_content_last = not any(
+            is_variable or value.strip() for is_variable, value in trailing
+        )
+
+    def render(
+        self,
+        content: str,
+        context: Optional[dict[str, Any]] = None,
+        metadata: Optional[dict[str, Any]] = None,
+    ) -> str:
+        """Render the template.
+
+        Missing values render as an empty string.
+
+        Args:
+            content: Segment content
+            context: Run-level values (domain, use_case, segment_type)
+            metadata: Segment metadata for ``{metadata.<key>}`` placeholders
+
+        Returns:
+            Rendered prompt
+        """
+        context = context or {}
+        metadata = metadata or {}
+        rendered = []
+        for is_variable, value in self._parts:
+            if not is_variable:
+                rendered.append(value)
+            elif value == "content":
+                rendered.append(content)
+            elif value.startswith(METADATA_PREFIX):
+                rendered.append(str(metadata.get(value[len(METADATA_PREFIX) :], "")))
+            else:
+                field = context.get(value)
+                rendered.append("" if field is None else str(field))
+        return "".join(rendered)
+
+
+def render_few_shot_examples(examples: Optional[list[Any]]) -> str:
+    """Render few-shot examples as a fixed prompt block.
+
+    Args:
+        examples: Example objects (or strings) from ``GenerationTemplate.config``
+
+    Returns:
+        Rendered block, or an empty string when there are no examples
+    """
+    if not examples:
+        return ""
+    rendered = []
+    for number, example in enumerate(examples, start=1):
+        if isinstance(example, str):
+            body = example
+        else:
+            body = json.dumps(example, ensure_ascii=False, sort_keys=True)
+        rendered.append(f"Example {number}:\n{body}")
+    return "Examples of good training examples:\n\n" + "\n\n".join(rendered)
+
+
+def _parse_format_style(text: str) -> Optional[list[tuple[bool, str]]]:
+    """Parse a ``str.format``-style template ({{ and }} as escaped braces).
+
+    Returns:
+        Parsed parts, or None if the text is not a valid format string
+        over declared variables only
+    """
+    try:
+        parsed = list(string.Formatter().parse(text))
+    except ValueError:
+        return None
+
+    parts: list[tuple[bool, str]] = []
+    for literal_text, field_name, format_spec, conversion in parsed:
+        if literal_text:
+            parts.append((False, literal_text))
+        if field_name is None:
+            continue
+        if format_spec or conversion or not _is_declared(field_name):
+            return None
+        parts.append((True, field_name))
+    return parts
+
+
+def _parse_literal_style(text: str) -> list[tuple[bool, str]]:
+    """Parse a template where only ``{variable}`` placeholders are special.
+
+    Raises:
+        ValidationError: If a placeholder names an undeclared variable
+    """
+    parts: list[tuple[bool, str]] = []
+    position = 0
+    for match in _PLACEHOLDER_PATTERN.finditer(text):
+        name = match.group(1)
+        if not _is_declared(name):
+            raise ValidationError(
+                f"Unknown template variable '{{{name}}}'",
+                details={
+                    "variable": name,
+                    "allowed": sorted(TEMPLATE_VARIABLES) + [f"{METADATA_PREFIX}<key>"],
+                },
+            )
+        if match.start() > position:
+            parts.append((False, text[position : match.start()]))
+        parts.append((True, name))
+        position = match.end()
+    if position < len(text):
+        parts.append((False, text[position:]))
+    return parts
+
+
+def compile_template(text: str) -> CompiledTemplate:
+    """Compile and validate a user prompt template.
+
+    Templates written for ``str.format`` (with ``{{``/``}}`` escapes) keep
+    their meaning. Otherwise only ``{variable}`` placeholders are
+    substituted and every other brace is kept verbatim, so JSON examples
+    can be embedded without escaping.
+
+    Args:
+        text: User prompt template
+
+    Returns:
+        CompiledTemplate instance
+
+    Raises:
+        ValidationError: If the template references an unknown variable or
+            has no ``{content}`` placeholder
+    """
+    parts = _parse_format_style(text)
+    if parts is None:
+        parts = _parse_literal_style(text)
+
+    compiled = CompiledTemplate(parts)
+    if "content" not in compiled.variables:
+        raise ValidationError("Template must contain a '{content}' placeholder")
+    return compiled
+
+
+@lru_cache(maxsize=256)
+def get_compiled_template(
+    template_id: Optional[str],
+    updated_at: Optional[datetime],
+    text: str,
+) -> CompiledTemplate:
+    """Get a compiled template, cached per template id and version.
+
+    Args:
+        template_id: Template ID (None for the built-in default)
+        updated_at: Template last update time
+        text: User prompt template
+
+    Returns:
+        CompiledTemplate instance
+
+    Raises:
+        ValidationError: If the template is invalid
+    """
+    return compile_template(text)
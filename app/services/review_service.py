@@ -2,11 +2,12 @@
 
 from typing import Optional
 
-from sqlalchemy import select
+from sqlalchemy import Select, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.exceptions import NotFoundError
 from app.core.logging import get_logger
+from app.core.tracing import traced
 from app.models.dataset import Dataset
 from app.models.dataset_item import DatasetItem
 from app.models.review import DatasetReview
@@ -18,6 +19,55 @@ class ReviewService:
     """Service for reviewing dataset items."""
 
     @staticmethod
+    def pending_query(dataset_id: Optional[str] = None) -> Select:
+        """Build the review queue query, oldest items first.
+
+        Args:
+            dataset_id: Filter by dataset ID
+
+        Returns:
+            Select over pending review items
+        """
+        query = select(DatasetItem).where(DatasetItem.status == "pending_review")
+
+        if dataset_id:
+            query = query.where(DatasetItem.dataset_id == dataset_id)
+
+        return query.order_by(DatasetItem.created_at)
+
+    @staticmethod
+    def pending_items_query(dataset_id: Optional[str] = None) -> Select:
+        """Build the review queue query as flat rows with the dataset name.
+
+        Selects only the columns of a ``PendingReviewItem`` (no ORM objects and
+        no per-item dataset lookup).
+
+        Args:
+            dataset_id: Filter by dataset ID
+
+        Returns:
+            Select over pending review rows
+        """
+        return (
+            ReviewService.pending_query(dataset_id)
+            .with_only_columns(
+                DatasetItem.id,
+                DatasetItem.dataset_id,
+                Dataset.name.label("dataset_name"),
+                DatasetItem.instruction,
+                DatasetItem.input_text,
+                DatasetItem.ideal_response,
+                DatasetItem.bad_response,
+                DatasetItem.explanation,
+                DatasetItem.quality_score,
+                DatasetItem.quality_flags,
+                DatasetItem.created_at,
+            )
+            .join_from(DatasetItem, Dataset, Dataset.id == DatasetItem.dataset_id)
+        )
+
+    @staticmethod
+    @traced()
     async def list_pending(
         db: AsyncSession,
         dataset_id: Optional[str] = None,
@@ -31,15 +81,11 @@ class ReviewService:
         Returns:
             List of pending items
         """
-        query = select(DatasetItem).where(DatasetItem.status == "pending_review")
-
-        if dataset_id:
-            query = query.where(DatasetItem.dataset_id == dataset_id)
-
-        result = await db.execute(query.order_by(DatasetItem.created_at))
+        result = await db.execute(ReviewService.pending_query(dataset_id))
         return list(result.scalars().all())
 
     @staticmethod
+    @traced()
     async def approve(
         db: AsyncSession,
         item_id: str,
@@ -95,6 +141,7 @@ class ReviewService:
         return review
 
     @staticmethod
+    @traced()
     async def reject(
         db: AsyncSession,
         item_id: str,
@@ -149,6 +196,7 @@ class ReviewService:
         return review
 
     @staticmethod
+    @traced()
     async def edit(
         db: AsyncSession,
         item_id: str,
@@ -2,10 +2,11 @@
 
 from typing import Optional
 
-from sqlalchemy import select
+from sqlalchemy import Select, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.logging import get_logger
+from app.core.tracing import traced
 from app.models.segment import Segment
 
 logger = get_logger(__name__)
@@ -15,6 +16,7 @@ class SegmenterService:
     """Service for segmenting documents."""
 
     @staticmethod
+    @traced()
     async def create_segments_from_text(
         db: AsyncSession,
         domain_id: str,
@@ -74,24 +76,22 @@ class SegmenterService:
         return segments
 
     @staticmethod
-    async def get_segments(
-        db: AsyncSession,
+    def segments_query(
         domain_id: Optional[str] = None,
         document_id: Optional[str] = None,
         use_case: Optional[str] = None,
         segment_type: Optional[str] = None,
-    ) -> list[Segment]:
-        """Get segments with filters.
+    ) -> Select:
+        """Build the query of segments matching the filters.
 
         Args:
-            db: Database session
             domain_id: Filter by domain
             document_id: Filter by document
             use_case: Filter by use case
             segment_type: Filter by segment type
 
         Returns:
-            List of segments
+            Segments query
         """
         query = select(Segment)
 
@@ -103,7 +103,30 @@ class SegmenterService:
             query = query.where(Segment.use_case == use_case)
         if segment_type:
             query = query.where(Segment.segment_type == segment_type)
+        return query
+
+    @staticmethod
+    @traced()
+    async def get_segments(
+        db: AsyncSession,
+        domain_id: Optional[str] = None,
+        document_id: Optional[str] = None,
+        use_case: Optional[str] = None,
+        segment_type: Optional[str] = None,
+    ) -> list[Segment]:
+        """Get segments with filters.
 
+        Args:
+            db: Database session
+            domain_id: Filter by domain
+            document_id: Filter by document
+            use_case: Filter by use case
+            segment_type: Filter by segment type
+
+        Returns:
+            List of segments
+        """
+        query = SegmenterService.segments_query(domain_id, document_id, use_case, segment_type)
         result = await db.execute(query)
         return list(result.scalars().all())
 
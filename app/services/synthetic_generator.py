@@ -1,36 +1,588 @@
 """Synthetic dataset generator service."""
 
+import copy
 import json
-from typing import Optional
+import time
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Container, Optional
+from uuid import UUID, uuid4
 
-from sqlalchemy import select
+from sqlalchemy import Select, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.exceptions import NotFoundError
+from app.core.config import get_settings
+from app.core.exceptions import ExternalServiceError, NotFoundError, ValidationError
 from app.core.logging import get_logger
-from app.integrations.llm_providers.factory import get_provider
+from app.core.metrics import GENERATION_DURATION, GENERATION_ITEMS
+from app.core.tracing import traced
+from app.integrations.llm_providers.batch_client import (
+    BATCH_TERMINAL_STATUSES,
+    get_batch_client,
+)
+from app.integrations.llm_providers.router import ProviderRouter
 from app.models.dataset import Dataset
 from app.models.dataset_item import DatasetItem
+from app.models.domain import Domain
 from app.models.generation_template import GenerationTemplate
 from app.models.segment import Segment
+from app.services.prompt_template import (
+    DEFAULT_SYSTEM_PROMPT,
+    DEFAULT_USER_PROMPT_TEMPLATE,
+    CompiledTemplate,
+    get_compiled_template,
+    render_few_shot_examples,
+)
 from app.services.quality_engine import QualityEngine
 
+settings = get_settings()
 logger = get_logger(__name__)
 
+# Maximum number of ids bound into a single IN (...) clause
+SEGMENT_ID_CHUNK_SIZE = 1000
+
+# Top-level keys of a generated example / of a multi-item response
+ITEM_KEYS = {"instruction", "input", "ideal_response", "bad_response", "explanation"}
+MULTI_ITEM_KEYS = {"items", "examples"}
+# A multi-item call may also answer with a single example object
+MULTI_ITEM_RESPONSE_KEYS = MULTI_ITEM_KEYS | ITEM_KEYS | {"segment"}
+
+# Defaults for multi-item generation (overridable via Dataset.generation_config)
+DEFAULT_PACK_MAX_CHARS = 4000
+
+# Fixed per run, so it is sent as part of the cacheable system prompt
+MULTI_ITEM_INSTRUCTIONS = (
+    "Generate {items_per_segment} distinct training example(s) for each numbered segment "
+    "in the user message. Respond with a JSON object of the form "
+    '{{"items": [{{"segment": <segment number>, "instruction": "...", "input": "...", '
+    '"ideal_response": "...", "bad_response": "...", "explanation": "..."}}]}}.'
+)
+
 
 class SyntheticGeneratorService:
     """Service for generating synthetic dataset items."""
 
     @staticmethod
+    def _segment_columns(include_metadata: bool = False) -> list:
+        """Get the segment columns needed to render prompts.
+
+        Args:
+            include_metadata: Also fetch ``segment_type`` and ``meta_data``
+
+        Returns:
+            List of Segment columns
+        """
+        columns = [Segment.id, Segment.content]
+        if include_metadata:
+            columns += [Segment.segment_type, Segment.meta_data]
+        return columns
+
+    @staticmethod
+    @traced()
+    async def _load_segments_by_ids(
+        db: AsyncSession,
+        segment_ids: list[str],
+        include_metadata: bool = False,
+    ) -> list:
+        """Load segment ids and contents in chunks, preserving request order.
+
+        Only the ``id`` and ``content`` columns (plus ``segment_type`` and
+        ``meta_data`` when requested) are fetched, one ``IN (...)`` query
+        per chunk instead of one query per segment.
+
+        Args:
+            db: Database session
+            segment_ids: Segment IDs to load
+            include_metadata: Also fetch ``segment_type`` and ``meta_data``
+
+        Returns:
+            List of rows exposing ``id`` and ``content``
+
+        Raises:
+            NotFoundError: If any segment ID does not exist
+        """
+        columns = SyntheticGeneratorService._segment_columns(include_metadata)
+        unique_ids = list(dict.fromkeys(segment_ids))
+        rows_by_id = {}
+        for i in range(0, len(unique_ids), SEGMENT_ID_CHUNK_SIZE):
+            chunk = unique_ids[i : i + SEGMENT_ID_CHUNK_SIZE]
+            result = await db.execute(
+                select(*columns).where(Segment.id.in_(chunk))
+            )
+            for row in result:
+                rows_by_id[str(row.id)] = row
+
+        SyntheticGeneratorService._raise_missing_segments(unique_ids, rows_by_id)
+        return [rows_by_id[seg_id] for seg_id in segment_ids]
+
+    @staticmethod
+    def _raise_missing_segments(unique_ids: list[str], found_ids: Container[str]) -> None:
+        """Raise NotFoundError listing the requested segment IDs that were not found."""
+        missing_ids = [seg_id for seg_id in unique_ids if seg_id not in found_ids]
+        if missing_ids:
+            raise NotFoundError(
+                "Segment",
+                missing_ids[0],
+                details={"missing_ids": missing_ids, "missing_count": len(missing_ids)},
+            )
+
+    @staticmethod
+    async def _find_segment_ids(
+        db: AsyncSession, segment_ids: list[str], domain_id: Optional[str] = None
+    ) -> set[str]:
+        """Get which of the given segment IDs exist, fetching only the ``id`` column.
+
+        Args:
+            db: Database session
+            segment_ids: Segment IDs to look up
+            domain_id: Only count segments of this domain (optional)
+
+        Returns:
+            IDs that exist
+        """
+        unique_ids = list(dict.fromkeys(segment_ids))
+        found_ids = set()
+        for i in range(0, len(unique_ids), SEGMENT_ID_CHUNK_SIZE):
+            chunk = unique_ids[i : i + SEGMENT_ID_CHUNK_SIZE]
+            query = select(Segment.id).where(Segment.id.in_(chunk))
+            if domain_id is not None:
+                query = query.where(Segment.domain_id == domain_id)
+            result = await db.execute(query)
+            found_ids.update(str(seg_id) for seg_id in result.scalars())
+        return found_ids
+
+    @staticmethod
+    async def _check_segment_ids(db: AsyncSession, segment_ids: list[str]) -> None:
+        """Check that every segment ID exists.
+
+        Args:
+            db: Database session
+            segment_ids: Segment IDs to check
+
+        Raises:
+            NotFoundError: If any segment ID does not exist
+        """
+        unique_ids = list(dict.fromkeys(segment_ids))
+        found_ids = await SyntheticGeneratorService._find_segment_ids(db, unique_ids)
+        SyntheticGeneratorService._raise_missing_segments(unique_ids, found_ids)
+
+    @staticmethod
+    @traced()
+    async def _resolve_prompts(
+        db: AsyncSession,
+        dataset: Dataset,
+    ) -> tuple[str, CompiledTemplate, dict[str, Any]]:
+        """Resolve the system prompt and compiled user prompt template for a dataset.
+
+        The template is compiled once per version and reused across runs;
+        run-level variables are resolved here so rendering never queries.
+        Few-shot examples from ``GenerationTemplate.config`` are appended to
+        the system prompt, keeping every fixed part of the request ahead of
+        the segment content so providers can serve it from their prompt
+        cache.
+
+        Args:
+            db: Database session
+            dataset: Dataset being generated
+
+        Returns:
+            Tuple of (system_prompt, compiled user template, run-level variables)
+
+        Raises:
+            ValidationError: If the stored template is invalid
+        """
+        template = None
+        if dataset.template_id:
+            result = await db.execute(
+                select(GenerationTemplate).where(GenerationTemplate.id == dataset.template_id)
+            )
+            template = result.scalar_one_or_none()
+
+        if template:
+            few_shot = render_few_shot_examples((template.config or {}).get("few_shot_examples"))
+            system_prompt = (
+                f"{template.system_prompt}\n\n{few_shot}" if few_shot else template.system_prompt
+            )
+            user_template = get_compiled_template(
+                template.id, template.updated_at, template.user_prompt_template
+            )
+        else:
+            system_prompt = DEFAULT_SYSTEM_PROMPT
+            user_template = get_compiled_template(None, None, DEFAULT_USER_PROMPT_TEMPLATE)
+
+        context: dict[str, Any] = {"use_case": dataset.use_case}
+        if "domain" in user_template.variables:
+            result = await db.execute(select(Domain.name).where(Domain.id == dataset.domain_id))
+            context["domain"] = result.scalar_one_or_none()
+
+        if not user_template.segment_content_last:
+            logger.warning(
+                "Template has fixed text after segment variables; move them to the end "
+                "to benefit from provider prompt caching",
+                template_id=dataset.template_id,
+            )
+
+        return system_prompt, user_template, context
+
+    @staticmethod
+    def _render_user_prompt(
+        user_template: CompiledTemplate,
+        context: dict[str, Any],
+        segment: Any,
+        content: Optional[str] = None,
+    ) -> str:
+        """Render the user prompt for a segment.
+
+        Args:
+            user_template: Compiled user prompt template
+            context: Run-level variables
+            segment: Segment row exposing ``content`` (and optionally
+                ``segment_type`` / ``meta_data``)
+            content: Content to render instead of the segment content (optional)
+
+        Returns:
+            Rendered user prompt
+        """
+        if user_template.uses_segment_metadata:
+            context = {**context, "segment_type": getattr(segment, "segment_type", None)}
+        return user_template.render(
+            segment.content if content is None else content,
+            context,
+            getattr(segment, "meta_data", None),
+        )
+
+    @staticmethod
+    def _build_item(
+        dataset: Dataset,
+        segment_id: Optional[str],
+        response: dict[str, Any],
+        source_provider: Optional[str] = None,
+        usage: Optional[dict[str, Any]] = None,
+        generation_run_id: Optional[str] = None,
+        meta_data: Optional[dict[str, Any]] = None,
+    ) -> DatasetItem:
+        """Build a quality-scored dataset item from a generated JSON response.
+
+        Args:
+            dataset: Dataset the item belongs to
+            segment_id: Source segment ID
+            response: Generated JSON response
+            source_provider: Provider that served the request (defaults to dataset provider)
+            usage: Normalized usage record of the call (optional)
+            generation_run_id: Generation run that produced the item (optional)
+            meta_data: Item metadata (optional)
+
+        Returns:
+            Unsaved dataset item
+        """
+        # Extract fields
+        instruction = response.get("instruction", "")
+        input_text = response.get("input", "")
+        ideal_response = response.get("ideal_response", "")
+        bad_response = response.get("bad_response", "")
+        explanation = response.get("explanation", "")
+
+        # Validate quality
+        quality_score, quality_flags = QualityEngine.validate_item(
+            instruction=instruction,
+            ideal_response=ideal_response,
+            input_text=input_text,
+        )
+
+        usage = usage or {}
+        return DatasetItem(
+            dataset_id=dataset.id,
+            segment_id=segment_id,
+            source_provider=source_provider or dataset.provider,
+            source_model=usage.get("model"),
+            generation_run_id=generation_run_id,
+            prompt_tokens=usage.get("prompt_tokens"),
+            completion_tokens=usage.get("completion_tokens"),
+            cached_tokens=usage.get("cached_tokens"),
+            latency_ms=usage.get("latency_ms"),
+            usage_estimated=bool(usage.get("estimated")),
+            instruction=instruction,
+            input_text=input_text if input_text else None,
+            ideal_response=ideal_response,
+            bad_response=bad_response if bad_response else None,
+            explanation=explanation if explanation else None,
+            status="pending_review",
+            quality_score=quality_score,
+            quality_flags=quality_flags,
+            meta_data=meta_data or {},
+        )
+
+    @staticmethod
+    def _split_usage(usage: dict[str, Any], parts: int) -> list[dict[str, Any]]:
+        """Split the usage of one call across the items it produced.
+
+        Token counts are divided evenly with the remainder assigned to the
+        first share, so per-item sums match the call totals.
+
+        Args:
+            usage: Usage record of the call
+            parts: Number of items produced by the call
+
+        Returns:
+            One usage record per item
+        """
+        if parts <= 1:
+            return [usage] * parts
+        shares = [dict(usage) for _ in range(parts)]
+        for key in ("prompt_tokens", "completion_tokens", "total_tokens", "cached_tokens"):
+            total = usage.get(key) or 0
+            share, remainder = divmod(total, parts)
+            for index, record in enumerate(shares):
+                record[key] = share + (remainder if index == 0 else 0)
+        for record in shares:
+            record["latency_ms"] = round((usage.get("latency_ms") or 0) / parts, 2)
+        return shares
+
+    @staticmethod
+    def _multi_item_config(dataset: Dataset) -> tuple[int, int, int]:
+        """Read multi-item generation settings from the dataset config.
+
+        ``items_per_segment`` asks for several examples per segment in one
+        call; ``pack_segments`` packs several small segments (up to
+        ``pack_max_chars`` of content) into one call.
+
+        Args:
+            dataset: Dataset being generated
+
+        Returns:
+            Tuple of (items_per_segment, pack_segments, pack_max_chars)
+        """
+        config = dataset.generation_config or {}
+        items_per_segment = max(1, int(config.get("items_per_segment", 1)))
+        pack_segments = max(1, int(config.get("pack_segments", 1)))
+        pack_max_chars = max(1, int(config.get("pack_max_chars", DEFAULT_PACK_MAX_CHARS)))
+        return items_per_segment, pack_segments, pack_max_chars
+
+    @staticmethod
+    def _pack_segments(batch: list, pack_segments: int, pack_max_chars: int) -> list[list]:
+        """Group consecutive segments into packs for a single LLM call.
+
+        A segment longer than ``pack_max_chars`` always gets a pack of its own.
+
+        Args:
+            batch: Segment rows exposing ``id`` and ``content``
+            pack_segments: Maximum segments per pack
+            pack_max_chars: Maximum combined content length per pack
+
+        Returns:
+            List of segment packs
+        """
+        packs: list[list] = []
+        current: list = []
+        current_chars = 0
+        for segment in batch:
+            length = len(segment.content)
+            if current and (
+                len(current) >= pack_segments or current_chars + length > pack_max_chars
+            ):
+                packs.append(current)
+                current = []
+                current_chars = 0
+            current.append(segment)
+            current_chars += length
+        if current:
+            packs.append(current)
+        return packs
+
+    @staticmethod
+    def _render_multi_item_prompt(
+        user_template: CompiledTemplate,
+        context: dict[str, Any],
+        pack: list,
+    ) -> str:
+        """Render the user prompt for a pack of numbered segments.
+
+        The response format instructions live in the system prompt (see
+        ``MULTI_ITEM_INSTRUCTIONS``). Segment-level variables are taken from
+        the first segment of the pack.
+
+        Args:
+            user_template: Compiled user prompt template
+            context: Run-level variables
+            pack: Segment rows exposing ``id`` and ``content``
+
+        Returns:
+            Rendered user prompt
+        """
+        content = "\n\n".join(
+            f"[Segment {number}]\n{segment.content}" for number, segment in enumerate(pack, start=1)
+        )
+        return SyntheticGeneratorService._render_user_prompt(
+            user_template, context, pack[0], content=content
+        )
+
+    @staticmethod
+    def _batch_segment_id(custom_id: str) -> Optional[str]:
+        """Get the segment ID of a batch request ID (``<segment id>:<n>``), or None."""
+        segment_id = custom_id.rsplit(":", 1)[0]
+        try:
+            UUID(segment_id)
+        except ValueError:
+            return None
+        return segment_id
+
+    @staticmethod
+    def _is_complete_example(example: Any) -> bool:
+        """Check that an example is an object with a non-empty instruction and ideal response."""
+        if not isinstance(example, dict):
+            return False
+        return all(
+            isinstance(example.get(key), str) and example[key].strip()
+            for key in ("instruction", "ideal_response")
+        )
+
+    @staticmethod
+    def _parse_multi_item_response(response: Any, pack: list) -> tuple[list[tuple[str, dict[str, Any]]], int]:
+        """Extract and attribute the examples of a multi-item response.
+
+        Accepts a bare JSON array, an object wrapping the array under
+        ``items`` or ``examples``, or a single example object. Each example
+        must carry a non-empty ``instruction`` and ``ideal_response`` and be
+        attributable to a segment of the pack (by ``segment`` number, or
+        implicitly when the pack holds a single segment).
+
+        Args:
+            response: Parsed JSON response
+            pack: Segment rows the prompt was built from
+
+        Returns:
+            Tuple of (list of (segment_id, example) pairs, number of rejected examples)
+        """
+        if isinstance(response, dict):
+            candidates = response.get("items", response.get("examples"))
+            if candidates is None:
+                candidates = [response]
+        else:
+            candidates = response
+        if not isinstance(candidates, list):
+            return [], 1
+
+        accepted = []
+        rejected = 0
+        for candidate in candidates:
+            if not SyntheticGeneratorService._is_complete_example(candidate):
+                rejected += 1
+                continue
+
+            number = candidate.get("segment")
+            if number is None and len(pack) == 1:
+                number = 1
+            try:
+                index = int(number) - 1
+            except (TypeError, ValueError):
+                rejected += 1
+                continue
+            if not 0 <= index < len(pack):
+                rejected += 1
+                continue
+
+            accepted.append((pack[index].id, candidate))
+
+        return accepted, rejected
+
+    @staticmethod
+    def segment_filter_query(dataset: Dataset, include_metadata: bool = False) -> Select:
+        """Build the segment selection query of a dataset, ordered by ID.
+
+        Args:
+            dataset: Dataset whose domain, use case and segment filter apply
+            include_metadata: Also fetch ``segment_type`` and ``meta_data``
+
+        Returns:
+            Select over the matching segment rows
+        """
+        columns = SyntheticGeneratorService._segment_columns(include_metadata)
+        query = select(*columns).where(Segment.domain_id == dataset.domain_id)
+        if dataset.use_case:
+            query = query.where(Segment.use_case == dataset.use_case)
+        if dataset.segment_filter.get("segment_type"):
+            query = query.where(
+                Segment.segment_type == dataset.segment_filter["segment_type"]
+            )
+        return query.order_by(Segment.id)
+
+    @staticmethod
+    async def _iter_segment_batches(
+        db: AsyncSession,
+        dataset: Dataset,
+        segment_ids: Optional[list[str]],
+        max_items: Optional[int],
+        batch_size: int,
+        include_metadata: bool = False,
+    ) -> AsyncIterator[list]:
+        """Yield batches of segments to generate from.
+
+        Filter-based selection pages through the domain with keyset
+        pagination on ``Segment.id`` and pushes ``max_items`` down as a SQL
+        ``LIMIT``, so at most one page of segment rows is held in memory.
+        Keyset pages (rather than one open cursor) survive the per-batch
+        commits issued by the generation loop.
+
+        Args:
+            db: Database session
+            dataset: Dataset being generated
+            segment_ids: Specific segment IDs to use (optional)
+            max_items: Maximum number of segments to yield
+            batch_size: Number of segments per batch
+            include_metadata: Also fetch ``segment_type`` and ``meta_data``
+
+        Yields:
+            Lists of rows exposing ``id`` and ``content``
+
+        Raises:
+            NotFoundError: If any requested segment ID does not exist
+        """
+        if segment_ids:
+            if max_items and len(segment_ids) > max_items:
+                # Only the first max_items are loaded, but every ID must exist
+                await SyntheticGeneratorService._check_segment_ids(db, segment_ids)
+                segment_ids = segment_ids[:max_items]
+            segments = await SyntheticGeneratorService._load_segments_by_ids(
+                db, segment_ids, include_metadata=include_metadata
+            )
+            for i in range(0, len(segments), batch_size):
+                yield segments[i : i + batch_size]
+            return
+
+        # Use segment filter from dataset
+        query = SyntheticGeneratorService.segment_filter_query(dataset, include_metadata)
+
+        remaining = max_items
+        last_id = None
+        while remaining is None or remaining > 0:
+            page_size = batch_size if remaining is None else min(batch_size, remaining)
+            page_query = query if last_id is None else query.where(Segment.id > last_id)
+            result = await db.execute(page_query.limit(page_size))
+            batch = list(result.all())
+            if not batch:
+                return
+
+            yield batch
+
+            last_id = batch[-1].id
+            if remaining is not None:
+                remaining -= len(batch)
+            if len(batch) < page_size:
+                return
+
+    @staticmethod
+    @traced()
     async def generate_items(
         db: AsyncSession,
         dataset_id: str,
         segment_ids: Optional[list[str]] = None,
         max_items: Optional[int] = None,
         batch_size: int = 10,
-    ) -> list[DatasetItem]:
+    ) -> int:
         """Generate synthetic dataset items.
 
+        Items are committed after each batch and not kept afterwards, so
+        memory is bounded by ``batch_size`` rather than by the run.
+
         Args:
             db: Database session
             dataset_id: Dataset ID
@@ -39,7 +591,7 @@ class SyntheticGeneratorService:
             batch_size: Batch size for generation
 
         Returns:
-            List of generated dataset items
+            Number of generated dataset items
 
         Raises:
             NotFoundError: If dataset or segments not found
@@ -50,102 +602,134 @@ class SyntheticGeneratorService:
         if not dataset:
             raise NotFoundError("Dataset", dataset_id)
 
-        # Get template if available
-        template = None
-        if dataset.template_id:
-            result = await db.execute(
-                select(GenerationTemplate).where(GenerationTemplate.id == dataset.template_id)
-            )
-            template = result.scalar_one_or_none()
+        # Get LLM provider pool
+        router = ProviderRouter.from_config(
+            (dataset.generation_config or {}).get("providers"),
+            default_provider=dataset.provider,
+            default_model=dataset.target_model_family,
+        )
 
-        # Get segments
-        if segment_ids:
-            segments = []
-            for seg_id in segment_ids:
-                result = await db.execute(select(Segment).where(Segment.id == seg_id))
-                segment = result.scalar_one_or_none()
-                if not segment:
-                    raise NotFoundError("Segment", seg_id)
-                segments.append(segment)
-        else:
-            # Use segment filter from dataset
-            query = select(Segment).where(Segment.domain_id == dataset.domain_id)
-            if dataset.use_case:
-                query = query.where(Segment.use_case == dataset.use_case)
-            if dataset.segment_filter.get("segment_type"):
-                query = query.where(
-                    Segment.segment_type == dataset.segment_filter["segment_type"]
-                )
+        # Prepare prompts
+        system_prompt, user_template, context = await SyntheticGeneratorService._resolve_prompts(
+            db, dataset
+        )
 
-            result = await db.execute(query)
-            segments = list(result.scalars().all())
+        items_per_segment, pack_segments, pack_max_chars = (
+            SyntheticGeneratorService._multi_item_config(dataset)
+        )
+        multi_item = items_per_segment > 1 or pack_segments > 1
+        if multi_item:
+            instructions = MULTI_ITEM_INSTRUCTIONS.format(items_per_segment=items_per_segment)
+            system_prompt = f"{system_prompt}\n\n{instructions}"
 
-        if max_items:
-            segments = segments[:max_items]
+        # Streaming validates completions as they arrive and aborts bad ones early
+        generation_config = dataset.generation_config or {}
+        stream = bool(generation_config.get("stream", False))
+        max_output_chars = generation_config.get("max_output_chars")
 
-        # Get LLM provider
-        provider = get_provider(dataset.provider)
+        # Each segment yields items_per_segment items, so fewer segments are needed
+        max_segments = max_items
+        if max_items and multi_item:
+            max_segments = -(-max_items // items_per_segment)
 
-        # Prepare prompts
-        system_prompt = (
-            template.system_prompt
-            if template
-            else "You are an expert at creating high-quality training examples for AI models."
-        )
-        user_template = (
-            template.user_prompt_template
-            if template
-            else "Create a training example based on this content:\n\n{content}\n\nGenerate an instruction, input (if needed), ideal response, bad response, and explanation."
+        # Generate items, streaming segments one batch at a time
+        run_id = str(uuid4())
+        run_start = time.perf_counter()
+        items_generated = GENERATION_ITEMS.labels(mode="online")
+        generated_count = 0
+        segment_batches = SyntheticGeneratorService._iter_segment_batches(
+            db=db,
+            dataset=dataset,
+            segment_ids=segment_ids,
+            max_items=max_segments,
+            batch_size=batch_size,
+            include_metadata=user_template.uses_segment_metadata,
         )
+        async for batch in segment_batches:
+            if multi_item:
+                for pack in SyntheticGeneratorService._pack_segments(
+                    batch, pack_segments, pack_max_chars
+                ):
+                    try:
+                        user_prompt = SyntheticGeneratorService._render_multi_item_prompt(
+                            user_template, context, pack
+                        )
+
+                        # Generate with LLM
+                        response, route, usage = await router.generate_json(
+                            system_prompt=system_prompt,
+                            user_prompt=user_prompt,
+                            stream=stream,
+                            max_chars=max_output_chars,
+                            allowed_keys=MULTI_ITEM_RESPONSE_KEYS,
+                        )
+
+                        examples, rejected = SyntheticGeneratorService._parse_multi_item_response(
+                            response, pack
+                        )
+                        if rejected:
+                            logger.warning(
+                                "Discarded invalid examples from multi-item response",
+                                segment_ids=[segment.id for segment in pack],
+                                rejected=rejected,
+                            )
+
+                        usage_shares = SyntheticGeneratorService._split_usage(usage, len(examples))
+                        for (segment_id, example), item_usage in zip(examples, usage_shares):
+                            if max_items and generated_count >= max_items:
+                                break
+                            item = SyntheticGeneratorService._build_item(
+                                dataset=dataset,
+                                segment_id=segment_id,
+                                response=example,
+                                source_provider=route.provider_name,
+                                usage=item_usage,
+                                generation_run_id=run_id,
+                                meta_data={"multi_item": True, "call_size": len(examples)},
+                            )
+                            db.add(item)
+                            generated_count += 1
+                            items_generated.inc()
+
+                    except Exception as e:
+                        logger.error(
+                            "Failed to generate items for segment pack",
+                            segment_ids=[segment.id for segment in pack],
+                            error=str(e),
+                        )
+                        continue
+
+                await db.commit()
+                continue
 
-        # Generate items
-        generated_items = []
-        for i in range(0, len(segments), batch_size):
-            batch = segments[i : i + batch_size]
             for segment in batch:
                 try:
-                    # Format user prompt
-                    user_prompt = user_template.format(content=segment.content)
+                    # Render user prompt
+                    user_prompt = SyntheticGeneratorService._render_user_prompt(
+                        user_template, context, segment
+                    )
 
                     # Generate with LLM
-                    response = await provider.generate_json(
+                    response, route, usage = await router.generate_json(
                         system_prompt=system_prompt,
                         user_prompt=user_prompt,
-                        model=dataset.target_model_family or "gpt-4-turbo-preview",
-                    )
-
-                    # Extract fields
-                    instruction = response.get("instruction", "")
-                    input_text = response.get("input", "")
-                    ideal_response = response.get("ideal_response", "")
-                    bad_response = response.get("bad_response", "")
-                    explanation = response.get("explanation", "")
-
-                    # Validate quality
-                    quality_score, quality_flags = QualityEngine.validate_item(
-                        instruction=instruction,
-                        ideal_response=ideal_response,
-                        input_text=input_text,
+                        stream=stream,
+                        max_chars=max_output_chars,
+                        allowed_keys=ITEM_KEYS,
                     )
 
-                    # Create dataset item
-                    item = DatasetItem(
-                        dataset_id=dataset_id,
+                    item = SyntheticGeneratorService._build_item(
+                        dataset=dataset,
                         segment_id=segment.id,
-                        source_provider=dataset.provider,
-                        instruction=instruction,
-                        input_text=input_text if input_text else None,
-                        ideal_response=ideal_response,
-                        bad_response=bad_response if bad_response else None,
-                        explanation=explanation if explanation else None,
-                        status="pending_review",
-                        quality_score=quality_score,
-                        quality_flags=quality_flags,
-                        meta_data={},
+                        response=response,
+                        source_provider=route.provider_name,
+                        usage=usage,
+                        generation_run_id=run_id,
                     )
 
                     db.add(item)
-                    generated_items.append(item)
+                    generated_count += 1
+                    items_generated.inc()
 
                 except Exception as e:
                     logger.error(
@@ -158,19 +742,295 @@ class SyntheticGeneratorService:
             await db.commit()
 
         # Update dataset stats
-        dataset.total_items = len(generated_items)
-        dataset.pending_items = len(generated_items)
+        dataset.total_items = generated_count
+        dataset.pending_items = generated_count
         dataset.status = "ready"
         await db.commit()
 
-        for item in generated_items:
-            await db.refresh(item)
-
+        GENERATION_DURATION.labels(mode="online").observe(time.perf_counter() - run_start)
         logger.info(
             "Dataset items generated",
             dataset_id=dataset_id,
-            count=len(generated_items),
+            count=generated_count,
+            generation_run_id=run_id,
+            routes=router.stats(),
+        )
+
+        return generated_count
+
+    @staticmethod
+    @traced()
+    async def submit_offline(
+        db: AsyncSession,
+        dataset_id: str,
+        segment_ids: Optional[list[str]] = None,
+        max_items: Optional[int] = None,
+    ) -> dict[str, Any]:
+        """Submit offline generation of dataset items to the provider batch API.
+
+        Prompts are rendered up front and packaged into one or more batch
+        jobs (each request tagged with ``<segment ID>:<request number>``).
+        The jobs are recorded in ``Dataset.generation_state`` and the dataset
+        is marked ``generating``; results are ingested later by
+        ``ingest_offline``, so nothing waits for the provider here.
+
+        Args:
+            db: Database session
+            dataset_id: Dataset ID
+            segment_ids: Specific segment IDs to use (optional)
+            max_items: Maximum items to generate
+
+        Returns:
+            Generation state (run ID and batch jobs)
+
+        Raises:
+            NotFoundError: If dataset or segments not found
+            ValidationError: If an offline run of the dataset is still in progress
+            ExternalServiceError: If the provider has no batch API or a submission fails
+        """
+        result = await db.execute(select(Dataset).where(Dataset.id == dataset_id))
+        dataset = result.scalar_one_or_none()
+        if not dataset:
+            raise NotFoundError("Dataset", dataset_id)
+
+        batches = (dataset.generation_state or {}).get("batches") or {}
+        if any(entry["status"] == "submitted" for entry in batches.values()):
+            raise ValidationError(
+                "An offline generation of this dataset is still in progress",
+                details={"generation_state": dataset.generation_state},
+            )
+
+        batch_client = get_batch_client(dataset.provider)
+        system_prompt, user_template, context = await SyntheticGeneratorService._resolve_prompts(
+            db, dataset
+        )
+        model = dataset.target_model_family or "gpt-4-turbo-preview"
+        job_size = settings.BATCH_MAX_REQUESTS_PER_JOB
+
+        # Render prompts and submit one batch job per job_size requests
+        run_id = str(uuid4())
+        batch_ids: list[str] = []
+        request_count = 0
+        requests: list[dict[str, str]] = []
+        segment_batches = SyntheticGeneratorService._iter_segment_batches(
+            db=db,
+            dataset=dataset,
+            segment_ids=segment_ids,
+            max_items=max_items,
+            batch_size=SEGMENT_ID_CHUNK_SIZE,
+            include_metadata=user_template.uses_segment_metadata,
+        )
+        try:
+            async for batch in segment_batches:
+                for segment in batch:
+                    user_prompt = SyntheticGeneratorService._render_user_prompt(
+                        user_template, context, segment
+                    )
+                    requests.append(
+                        {
+                            # Suffixed so a segment requested twice gets two results
+                            "custom_id": f"{segment.id}:{request_count}",
+                            "system_prompt": system_prompt,
+                            "user_prompt": user_prompt,
+                        }
+                    )
+                    request_count += 1
+                    if len(requests) >= job_size:
+                        batch_ids.append(await batch_client.submit(requests, model=model))
+                        requests = []
+            if requests:
+                batch_ids.append(await batch_client.submit(requests, model=model))
+        except Exception:
+            if batch_ids:
+                # Already running at the provider, but never ingested
+                logger.error(
+                    "Offline generation submission failed; abandoning submitted batches",
+                    dataset_id=dataset_id,
+                    batch_ids=batch_ids,
+                )
+            raise
+
+        dataset.generation_state = {
+            "mode": "offline",
+            "generation_run_id": run_id,
+            "previous_status": dataset.status,
+            "submitted_at": datetime.now(timezone.utc).isoformat(),
+            "batches": {batch_id: {"status": "submitted"} for batch_id in batch_ids},
+        }
+        # Nothing to wait for when no segment matched
+        dataset.status = "generating" if batch_ids else "ready"
+        await db.commit()
+
+        logger.info(
+            "Offline generation submitted",
+            dataset_id=dataset_id,
+            requests=request_count,
+            batches=len(batch_ids),
+            generation_run_id=run_id,
         )
+        return dataset.generation_state
+
+    @staticmethod
+    @traced()
+    async def ingest_offline(db: AsyncSession, dataset_id: str) -> dict[str, Any]:
+        """Poll the dataset's offline batch jobs once and ingest the finished ones.
 
-        return generated_items
+        Each submitted job is checked once (no waiting). Completed jobs are
+        ingested in bulk; failed, expired or cancelled jobs, and jobs still
+        running ``BATCH_TIMEOUT_SECONDS`` after submission, are marked
+        failed. Once no job is left running the dataset becomes ``ready``,
+        or returns to its previous status when every job failed. Jobs are
+        fetched without holding a lock; the dataset row is then locked and
+        only jobs still submitted are applied, so concurrent polls never
+        ingest a job twice.
 
+        Args:
+            db: Database session
+            dataset_id: Dataset ID
+
+        Returns:
+            Dataset status, run ID, items created by this call and per-job state
+
+        Raises:
+            NotFoundError: If the dataset or its offline generation is not found
+            ExternalServiceError: If the provider has no batch API
+        """
+        result = await db.execute(select(Dataset).where(Dataset.id == dataset_id))
+        dataset = result.scalar_one_or_none()
+        if not dataset:
+            raise NotFoundError("Dataset", dataset_id)
+        state = dataset.generation_state or {}
+        if state.get("mode") != "offline":
+            raise NotFoundError("Offline generation", dataset_id)
+
+        batch_client = get_batch_client(dataset.provider)
+        pending = [
+            batch_id
+            for batch_id, entry in state["batches"].items()
+            if entry["status"] == "submitted"
+        ]
+        outcomes = {}
+        for batch_id in pending:
+            try:
+                batch = await batch_client.get_batch(batch_id)
+                status = batch.get("status")
+                results, errors = {}, {}
+                if status == "completed":
+                    results, errors = await batch_client.fetch_results(batch)
+            except ExternalServiceError as e:
+                # Transient: the job is checked again on the next poll
+                logger.warning("Offline batch poll failed", batch_id=batch_id, error=str(e))
+                continue
+            outcomes[batch_id] = (status, results, errors)
+
+        result = await db.execute(
+            select(Dataset)
+            .where(Dataset.id == dataset_id)
+            .with_for_update()
+            .execution_options(populate_existing=True)
+        )
+        dataset = result.scalar_one_or_none()
+        if not dataset:
+            raise NotFoundError("Dataset", dataset_id)
+        state = copy.deepcopy(dataset.generation_state or {})
+        if state.get("mode") != "offline":
+            raise NotFoundError("Offline generation", dataset_id)
+
+        run_id = state["generation_run_id"]
+        submitted_at = datetime.fromisoformat(state["submitted_at"])
+        expired = (
+            datetime.now(timezone.utc) - submitted_at
+        ).total_seconds() > settings.BATCH_TIMEOUT_SECONDS
+
+        was_running = any(entry["status"] == "submitted" for entry in state["batches"].values())
+        items_created = 0
+        newly_failed = []
+        for batch_id, (status, results, errors) in outcomes.items():
+            entry = state["batches"].get(batch_id)
+            if entry is None or entry["status"] != "submitted":
+                # Applied by a concurrent poll, or replaced by a new generation
+                continue
+
+            if status not in BATCH_TERMINAL_STATUSES:
+                if expired:
+                    entry.update(
+                        status="failed",
+                        error=f"Not finished within {settings.BATCH_TIMEOUT_SECONDS}s",
+                    )
+                    newly_failed.append(batch_id)
+                continue
+            if status != "completed":
+                entry.update(status="failed", error=f"Batch ended with status '{status}'")
+                newly_failed.append(batch_id)
+                continue
+            for custom_id, error in errors.items():
+                logger.error(
+                    "Failed to generate item for segment",
+                    custom_id=custom_id,
+                    batch_id=batch_id,
+                    error=error,
+                )
+            # Incomplete examples and segments deleted since submission are
+            # counted as failed instead of aborting the poll at commit
+            rows = [
+                (SyntheticGeneratorService._batch_segment_id(custom_id), result)
+                for custom_id, result in results.items()
+                if SyntheticGeneratorService._is_complete_example(result["response"])
+            ]
+            found_ids = await SyntheticGeneratorService._find_segment_ids(
+                db, [segment_id for segment_id, _ in rows if segment_id], dataset.domain_id
+            )
+            items = [
+                SyntheticGeneratorService._build_item(
+                    dataset=dataset,
+                    segment_id=segment_id,
+                    response=result["response"],
+                    usage=result["usage"],
+                    generation_run_id=run_id,
+                    meta_data={"batch_id": batch_id},
+                )
+                for segment_id, result in rows
+                if segment_id in found_ids
+            ]
+            skipped = len(results) - len(items)
+            if skipped:
+                logger.warning("Offline batch results skipped", batch_id=batch_id, skipped=skipped)
+            db.add_all(items)
+            entry.update(status="ingested", items=len(items), failed=len(errors) + skipped)
+            items_created += len(items)
+            GENERATION_ITEMS.labels(mode="offline").inc(len(items))
+
+        dataset.total_items += items_created
+        dataset.pending_items += items_created
+        batches = state["batches"].values()
+        if was_running and all(entry["status"] != "submitted" for entry in batches):
+            if any(entry["status"] == "ingested" for entry in batches):
+                dataset.status = "ready"
+            else:
+                dataset.status = state["previous_status"]
+            GENERATION_DURATION.labels(mode="offline").observe(
+                (datetime.now(timezone.utc) - submitted_at).total_seconds()
+            )
+        dataset.generation_state = state
+        await db.commit()
+
+        for batch_id in newly_failed:
+            logger.error(
+                "Offline batch failed",
+                dataset_id=dataset_id,
+                batch_id=batch_id,
+                error=state["batches"][batch_id]["error"],
+            )
+        logger.info(
+            "Offline generation polled",
+            dataset_id=dataset_id,
+            status=dataset.status,
+            items_created=items_created,
+            generation_run_id=run_id,
+        )
+        return {
+            "status": dataset.status,
+            "generation_run_id": run_id,
+            "items_created": items_created,
+            "batches": state["batches"],
+        }
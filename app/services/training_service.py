@@ -7,6 +7,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.exceptions import NotFoundError
 from app.core.logging import get_logger
+from app.core.tracing import traced
 from app.models.training_job import TrainingJob
 
 logger = get_logger(__name__)
@@ -16,6 +17,7 @@ class TrainingService:
     """Service for training job operations."""
 
     @staticmethod
+    @traced()
     async def create_job(
         db: AsyncSession,
         model_id: str,
@@ -68,6 +70,7 @@ class TrainingService:
         return job
 
     @staticmethod
+    @traced()
     async def get_by_id(db: AsyncSession, job_id: str) -> TrainingJob:
         """Get training job by ID.
 
@@ -88,6 +91,7 @@ class TrainingService:
         return job
 
     @staticmethod
+    @traced()
     async def list_all(
         db: AsyncSession,
         model_id: Optional[str] = None,
@@ -0,0 +1,174 @@
+"""Usage service for token, cost and throughput reports."""
+
+from typing import Any, Optional
+
+from sqlalchemy import Select, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.core.exceptions import NotFoundError
+from app.core.tracing import traced
+from app.models.dataset import Dataset
+from app.models.dataset_item import DatasetItem
+from app.models.segment import Segment
+
+settings = get_settings()
+
+
+class UsageService:
+    """Service for aggregating generation usage per dataset and run."""
+
+    @staticmethod
+    def estimate_cost(
+        model: Optional[str],
+        prompt_tokens: int,
+        completion_tokens: int,
+        cached_tokens: int = 0,
+    ) -> Optional[float]:
+        """Estimate the cost of a usage total from ``settings.LLM_PRICING``.
+
+        Args:
+            model: Model identifier
+            prompt_tokens: Prompt tokens (including cached ones)
+            completion_tokens: Completion tokens
+            cached_tokens: Prompt tokens served from the provider cache
+
+        Returns:
+            Cost in USD, or None if the model has no configured price
+        """
+        pricing = settings.LLM_PRICING.get(model or "")
+        if not pricing:
+            return None
+        prompt_price = pricing.get("prompt", 0.0)
+        cached_price = pricing.get("cached_prompt", prompt_price)
+        completion_price = pricing.get("completion", 0.0)
+        cost = (
+            (prompt_tokens - cached_tokens) * prompt_price
+            + cached_tokens * cached_price
+            + completion_tokens * completion_price
+        ) / 1_000_000
+        return round(cost, 6)
+
+    @staticmethod
+    def usage_query(dataset_id: str) -> Select:
+        """Build the per-run, per-provider usage aggregation of a dataset.
+
+        Args:
+            dataset_id: Dataset ID
+
+        Returns:
+            Select with one row per generation run and provider/model
+        """
+        return (
+            select(
+                DatasetItem.generation_run_id,
+                DatasetItem.source_provider,
+                DatasetItem.source_model,
+                func.count(DatasetItem.id).label("items"),
+                func.count(DatasetItem.id)
+                .filter(DatasetItem.usage_estimated)
+                .label("estimated_items"),
+                func.coalesce(func.sum(DatasetItem.prompt_tokens), 0).label("prompt_tokens"),
+                func.coalesce(func.sum(DatasetItem.completion_tokens), 0).label("completion_tokens"),
+                func.coalesce(func.sum(DatasetItem.cached_tokens), 0).label("cached_tokens"),
+                func.avg(DatasetItem.latency_ms).label("avg_latency_ms"),
+                func.avg(func.length(Segment.content)).label("avg_segment_chars"),
+                func.min(DatasetItem.created_at).label("started_at"),
+                func.max(DatasetItem.created_at).label("finished_at"),
+            )
+            .outerjoin(Segment, Segment.id == DatasetItem.segment_id)
+            .where(DatasetItem.dataset_id == dataset_id)
+            .group_by(
+                DatasetItem.generation_run_id,
+                DatasetItem.source_provider,
+                DatasetItem.source_model,
+            )
+        )
+
+    @staticmethod
+    @traced()
+    async def get_dataset_usage(db: AsyncSession, dataset_id: str) -> dict[str, Any]:
+        """Aggregate token usage, cost and throughput for a dataset.
+
+        Args:
+            db: Database session
+            dataset_id: Dataset ID
+
+        Returns:
+            Report with dataset totals and a breakdown per generation run
+            and provider/model
+
+        Raises:
+            NotFoundError: If dataset not found
+        """
+        result = await db.execute(select(Dataset.id).where(Dataset.id == dataset_id))
+        if result.scalar_one_or_none() is None:
+            raise NotFoundError("Dataset", dataset_id)
+
+        result = await db.execute(UsageService.usage_query(dataset_id))
+
+        runs: dict[Optional[str], dict[str, Any]] = {}
+        for row in result:
+            cost = UsageService.estimate_cost(
+                row.source_model, row.prompt_tokens, row.completion_tokens, row.cached_tokens
+            )
+            run = runs.setdefault(
+                row.generation_run_id,
+                {
+                    "generation_run_id": row.generation_run_id,
+                    "items": 0,
+                    "estimated_items": 0,
+                    "prompt_tokens": 0,
+                    "completion_tokens": 0,
+                    "cached_tokens": 0,
+                    "cost_usd": 0.0,
+                    "started_at": row.started_at,
+                    "finished_at": row.finished_at,
+                    "models": [],
+                },
+            )
+            run["items"] += row.items
+            run["estimated_items"] += row.estimated_items
+            run["prompt_tokens"] += row.prompt_tokens
+            run["completion_tokens"] += row.completion_tokens
+            run["cached_tokens"] += row.cached_tokens
+            run["cost_usd"] = None if cost is None or run["cost_usd"] is None else run["cost_usd"] + cost
+            run["started_at"] = min(run["started_at"], row.started_at)
+            run["finished_at"] = max(run["finished_at"], row.finished_at)
+            run["models"].append(
+                {
+                    "provider": row.source_provider,
+                    "model": row.source_model,
+                    "items": row.items,
+                    "estimated_items": row.estimated_items,
+                    "prompt_tokens": row.prompt_tokens,
+                    "completion_tokens": row.completion_tokens,
+                    "cached_tokens": row.cached_tokens,
+                    "avg_latency_ms": round(row.avg_latency_ms, 2) if row.avg_latency_ms is not None else None,
+                    "avg_segment_chars": round(float(row.avg_segment_chars), 1) if row.avg_segment_chars is not None else None,
+                    "cost_usd": cost,
+                }
+            )
+
+        for run in runs.values():
+            duration = (run["finished_at"] - run["started_at"]).total_seconds()
+            run["duration_seconds"] = round(duration, 3)
+            run["items_per_second"] = round(run["items"] / duration, 3) if duration > 0 else None
+            run["tokens_per_item"] = (
+                round((run["prompt_tokens"] + run["completion_tokens"]) / run["items"], 1)
+                if run["items"]
+                else None
+            )
+
+        ordered_runs = sorted(runs.values(), key=lambda run: run["started_at"])
+        costs = [run["cost_usd"] for run in ordered_runs]
+        return {
+            "dataset_id": dataset_id,
+            "items": sum(run["items"] for run in ordered_runs),
+            "estimated_items": sum(run["estimated_items"] for run in ordered_runs),
+            "prompt_tokens": sum(run["prompt_tokens"] for run in ordered_runs),
+            "completion_tokens": sum(run["completion_tokens"] for run in ordered_runs),
+            "cached_tokens": sum(run["cached_tokens"] for run in ordered_runs),
+            "cost_usd": None if None in costs else round(sum(costs), 6),
+            "runs": ordered_runs,
+        }
@@ -0,0 +1,360 @@
+"""Index usage report for the review, export and generation queries.
+
+Seeds a scratch Postgres database with skewed synthetic data (many
+datasets, few pending items, several domains, use cases and segment types),
+runs ``EXPLAIN (ANALYZE, BUFFERS)`` on the queries the services build and
+checks that each one is served by its index without a sequential scan of
+the hot table or an explicit sort:
+
+    python -m benchmarks.index_report --items 500000 --check
+
+The target database must exist and is wiped (all tables dropped and
+recreated) on every run. Indexes come from the model metadata, which
+mirrors the Alembic migrations for these tables.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from typing import Any, Optional
+from uuid import uuid4
+
+from sqlalchemy import Select, text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.logging import configure_logging
+from app.db.base import Base
+from app.models import Dataset, DatasetItem, Domain, Segment
+from app.services.export_service import ExportService
+from app.services.review_service import ReviewService
+from app.services.synthetic_generator import SyntheticGeneratorService
+from app.services.usage_service import UsageService
+from benchmarks.pipeline import (
+    _bulk_insert,
+    check_scratch_database,
+    scratch_database_url,
+    synthetic_text,
+)
+
+
+USE_CASES = ("qa", "summarization", "classification")
+SEGMENT_TYPES = ("paragraph", "section", "table")
+# Page size of the generation segment query
+SEGMENT_PAGE_SIZE = 500
+
+
+@dataclass
+class QueryCase:
+    """A service query and the plan it is expected to get."""
+
+    name: str
+    query: Select
+    table: str
+    # Any of these indexes serves the query
+    expected_indexes: tuple[str, ...]
+    allow_sort: bool = False
+
+
+@dataclass
+class QueryResult:
+    """Plan summary of one explained query."""
+
+    case: QueryCase
+    execution_ms: float
+    rows: int
+    node_types: list[str] = field(default_factory=list)
+    indexes: list[str] = field(default_factory=list)
+    seq_scans: list[str] = field(default_factory=list)
+    shared_hit_blocks: int = 0
+    shared_read_blocks: int = 0
+
+    @property
+    def problems(self) -> list[str]:
+        """Reasons the plan does not match the expected access path."""
+        problems = []
+        if self.case.table in self.seq_scans:
+            problems.append(f"sequential scan on {self.case.table}")
+        if not self.case.allow_sort and "Sort" in self.node_types:
+            problems.append("explicit sort")
+        if not set(self.case.expected_indexes) & set(self.indexes):
+            problems.append(f"none of {', '.join(self.case.expected_indexes)} used")
+        return problems
+
+    def report(self) -> dict[str, Any]:
+        """Build the machine-readable query report."""
+        return {
+            "table": self.case.table,
+            "expected_indexes": list(self.case.expected_indexes),
+            "indexes": self.indexes,
+            "node_types": self.node_types,
+            "rows": self.rows,
+            "execution_ms": round(self.execution_ms, 3),
+            "shared_hit_blocks": self.shared_hit_blocks,
+            "shared_read_blocks": self.shared_read_blocks,
+            "ok": not self.problems,
+            "problems": self.problems,
+        }
+
+
+async def seed(session: AsyncSession, args: argparse.Namespace, rng: random.Random) -> dict:
+    """Seed domains, segments, datasets and dataset items.
+
+    Returns:
+        IDs of the seeded domain and dataset used by the query cases
+    """
+    domain_ids = [str(uuid4()) for _ in range(args.domains)]
+    await _bulk_insert(
+        session,
+        Domain,
+        [{"id": d, "name": f"index-{d}", "slug": f"index-{d}"} for d in domain_ids],
+    )
+
+    paragraph = synthetic_text(rng, 1)
+    segments = [
+        {
+            "id": str(uuid4()),
+            "domain_id": rng.choice(domain_ids),
+            "use_case": rng.choice(USE_CASES),
+            "segment_type": rng.choice(SEGMENT_TYPES),
+            "content": paragraph,
+            "position": index,
+            "meta_data": {},
+        }
+        for index in range(args.segments)
+    ]
+    await _bulk_insert(session, Segment, segments)
+
+    dataset_ids = [str(uuid4()) for _ in range(args.datasets)]
+    await _bulk_insert(
+        session,
+        Dataset,
+        [
+            {
+                "id": dataset_id,
+                "domain_id": domain_ids[index % len(domain_ids)],
+                "name": f"index-{index}",
+                "provider": "fake",
+                "target_model_family": "fake-model",
+                "status": "ready",
+                "generation_config": {},
+                "segment_filter": {},
+            }
+            for index, dataset_id in enumerate(dataset_ids)
+        ],
+    )
+
+    start = datetime.now(timezone.utc) - timedelta(days=90)
+    items = []
+    for index in range(args.items):
+        roll = rng.random()
+        if roll < args.pending_ratio:
+            status = "pending_review"
+        elif roll < args.pending_ratio + (1 - args.pending_ratio) * 0.7:
+            status = "approved"
+        else:
+            status = "rejected"
+        items.append(
+            {
+                "id": str(uuid4()),
+                "dataset_id": rng.choice(dataset_ids),
+                "segment_id": segments[index % len(segments)]["id"],
+                "source_provider": "fake",
+                "source_model": "fake-model",
+                "generation_run_id": str(uuid4()) if index % 1000 == 0 else None,
+                "instruction": "Summarize the terms.",
+                "ideal_response": paragraph,
+                "status": status,
+                "quality_flags": {},
+                "meta_data": {},
+                "created_at": start + timedelta(seconds=index),
+            }
+        )
+    await _bulk_insert(session, DatasetItem, items)
+    return {"domain_id": domain_ids[0], "dataset_id": dataset_ids[0]}
+
+
+def query_cases(domain_id: str, dataset_id: str) -> list[QueryCase]:
+    """Build the service queries to explain."""
+
+    def dataset(use_case: Optional[str], segment_type: Optional[str] = None) -> Any:
+        segment_filter = {"segment_type": segment_type} if segment_type else {}
+        return SimpleNamespace(
+            domain_id=domain_id, use_case=use_case, segment_filter=segment_filter
+        )
+
+    segments_query = SyntheticGeneratorService.segment_filter_query
+    return [
+        QueryCase(
+            "review_queue",
+            ReviewService.pending_query(),
+            "dataset_items",
+            ("idx_dataset_items_pending_review",),
+        ),
+        QueryCase(
+            "review_queue_by_dataset",
+            ReviewService.pending_query(dataset_id),
+            "dataset_items",
+            ("idx_dataset_items_dataset_status",),
+        ),
+        QueryCase(
+            "export_approved",
+            ExportService.items_query(dataset_id, approved_only=True),
+            "dataset_items",
+            ("idx_dataset_items_dataset_status",),
+        ),
+        QueryCase(
+            "export_all",
+            ExportService.items_query(dataset_id, approved_only=False),
+            "dataset_items",
+            ("idx_dataset_items_dataset_status", "idx_dataset_items_generation_run_id"),
+        ),
+        QueryCase(
+            "usage_report",
+            UsageService.usage_query(dataset_id),
+            "dataset_items",
+            ("idx_dataset_items_dataset_status", "idx_dataset_items_generation_run_id"),
+            allow_sort=True,
+        ),
+        QueryCase(
+            "generation_segments",
+            segments_query(dataset(None)).limit(SEGMENT_PAGE_SIZE),
+            "segments",
+            ("idx_segments_domain",),
+        ),
+        QueryCase(
+            "generation_segments_use_case",
+            segments_query(dataset(USE_CASES[0])).limit(SEGMENT_PAGE_SIZE),
+            "segments",
+            ("idx_segments_domain_use_case",),
+        ),
+        QueryCase(
+            "generation_segments_use_case_type",
+            segments_query(dataset(USE_CASES[0], SEGMENT_TYPES[0])).limit(SEGMENT_PAGE_SIZE),
+            "segments",
+            ("idx_segments_domain_use_case_type",),
+        ),
+    ]
+
+
+def _walk(node: dict[str, Any], result: QueryResult) -> None:
+    """Collect node types, indexes and sequential scans of a plan tree."""
+    node_type = node["Node Type"]
+    result.node_types.append(node_type)
+    if node.get("Index Name") and node["Index Name"] not in result.indexes:
+        result.indexes.append(node["Index Name"])
+    if node_type == "Seq Scan":
+        result.seq_scans.append(node.get("Relation Name", ""))
+    for child in node.get("Plans", []):
+        _walk(child, result)
+
+
+async def explain(session: AsyncSession, case: QueryCase) -> QueryResult:
+    """Run EXPLAIN ANALYZE on a query case and summarize its plan."""
+    sql = case.query.compile(
+        dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+    )
+    result = await session.execute(text(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {sql}"))
+    document = result.scalar_one()
+    if isinstance(document, str):
+        document = json.loads(document)
+    plan = document[0]["Plan"]
+
+    summary = QueryResult(
+        case=case,
+        execution_ms=document[0]["Execution Time"],
+        rows=plan.get("Actual Rows", 0),
+        shared_hit_blocks=plan.get("Shared Hit Blocks", 0),
+        shared_read_blocks=plan.get("Shared Read Blocks", 0),
+    )
+    _walk(plan, summary)
+    return summary
+
+
+async def run(args: argparse.Namespace) -> dict[str, Any]:
+    """Seed the database, explain every query case and build the report."""
+    rng = random.Random(args.seed)
+    engine = create_async_engine(args.database_url, echo=False)
+    session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+
+    try:
+        async with session_factory() as session:
+            seeded = await seed(session, args, rng)
+        async with engine.connect() as conn:
+            await conn.execute(text("ANALYZE"))
+            await conn.commit()
+
+        queries = {}
+        async with session_factory() as session:
+            for case in query_cases(seeded["domain_id"], seeded["dataset_id"]):
+                queries[case.name] = (await explain(session, case)).report()
+    finally:
+        await engine.dispose()
+
+    return {
+        "scale": {
+            "domains": args.domains,
+            "segments": args.segments,
+            "datasets": args.datasets,
+            "items": args.items,
+            "pending_ratio": args.pending_ratio,
+        },
+        "queries": queries,
+    }
+
+
+def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--database-url",
+        default=scratch_database_url(),
+        help="Scratch database (wiped on every run)",
+    )
+    parser.add_argument("--domains", type=int, default=4)
+    parser.add_argument("--segments", type=int, default=100_000)
+    parser.add_argument("--datasets", type=int, default=50)
+    parser.add_argument("--items", type=int, default=200_000)
+    parser.add_argument(
+        "--pending-ratio", type=float, default=0.05, help="Share of items pending review"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write the JSON report to this file (default: stdout)")
+    parser.add_argument(
+        "--check", action="store_true", help="Fail when a query misses its expected index"
+    )
+    args = parser.parse_args(argv)
+    check_scratch_database(parser, args.database_url)
+    return args
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """Run the index report from the command line."""
+    args = parse_args(argv)
+    configure_logging(log_level="WARNING", app_env="production")
+
+    report = asyncio.run(run(args))
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+    failed = {name: q["problems"] for name, q in report["queries"].items() if not q["ok"]}
+    for name, problems in failed.items():
+        print(f"{name}: {', '.join(problems)}", file=sys.stderr)
+    return 1 if args.check and failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,423 @@
+"""HTTP load-test scenarios for the public API.
+
+Runs a mix of virtual users against a running instance, ramping concurrency
+step by step, and reports throughput, latency percentiles and error rates
+per route and step as JSON:
+
+    python -m benchmarks.load_test --base-url http://localhost:8000 \\
+        --ramp 1,10,25,50 --step-seconds 30 --output load.json \\
+        --max-p95-ms 500 --max-error-rate 1
+
+Scenarios (weights set with ``--mix``):
+
+- ``reviewer``: list pending items, then approve or reject one
+- ``uploader``: upload a text document and process it into segments
+- ``listing``: list datasets and documents
+- ``export``: export the dataset, get the download URL and download it
+
+A setup phase creates a domain, a corpus and a dataset whose items are
+generated with the ``fake`` provider, so the instance must run with S3
+pointed at a local stand-in (see ``docker-compose.loadtest.yml``). With
+SLO thresholds the script exits non-zero when a step breaches them, and
+the report names the highest concurrency that met them; use it to size
+``WEB_CONCURRENCY`` (gunicorn workers) and the database pool.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Any, Optional
+from urllib.parse import urlsplit, urlunsplit
+from uuid import uuid4
+
+import httpx
+
+from benchmarks.stats import latency_summary
+
+API_PREFIX = "/api/v1"
+DEFAULT_MIX = "reviewer=6,uploader=1,listing=2,export=1"
+
+# Pending items each reviewer picks from
+REVIEW_PAGE = 50
+
+_WORDS = (
+    "agreement", "balance", "client", "clause", "contract", "coverage", "deadline",
+    "evidence", "invoice", "liability", "notice", "payment", "policy", "premium",
+)
+
+
+def corpus_text(rng: random.Random, size_kb: int) -> str:
+    """Build a text document of roughly ``size_kb`` KB with short paragraphs."""
+    paragraphs = []
+    size = 0
+    while size < size_kb * 1024:
+        paragraph = " ".join(rng.choice(_WORDS) for _ in range(40)).capitalize() + "."
+        paragraphs.append(paragraph)
+        size += len(paragraph) + 2
+    return "\n\n".join(paragraphs)
+
+
+class RouteStats:
+    """Request outcomes per route for one ramp step."""
+
+    def __init__(self):
+        """Initialize stats."""
+        self.latencies_ms: dict[str, list[float]] = defaultdict(list)
+        self.errors: dict[str, int] = defaultdict(int)
+        self.statuses: dict[str, dict[str, int]] = defaultdict(lambda: defaultdict(int))
+
+    def record(self, route: str, latency_ms: float, status: str, error: bool) -> None:
+        """Record one request outcome."""
+        self.latencies_ms[route].append(latency_ms)
+        self.statuses[route][status] += 1
+        if error:
+            self.errors[route] += 1
+
+    def report(self, seconds: float) -> dict[str, Any]:
+        """Build the per-route report for the step."""
+        routes = {}
+        for route, samples in sorted(self.latencies_ms.items()):
+            routes[route] = {
+                "requests": len(samples),
+                "requests_per_second": round(len(samples) / seconds, 3) if seconds else None,
+                "error_rate": round(self.errors[route] / len(samples) * 100, 3),
+                "statuses": dict(self.statuses[route]),
+                "latency_ms": latency_summary(samples),
+            }
+        all_samples = [sample for samples in self.latencies_ms.values() for sample in samples]
+        total_errors = sum(self.errors.values())
+        error_rate = total_errors / len(all_samples) * 100 if all_samples else 0.0
+        return {
+            "routes": routes,
+            "total": {
+                "requests": len(all_samples),
+                "requests_per_second": round(len(all_samples) / seconds, 3) if seconds else None,
+                "error_rate": round(error_rate, 3),
+                "latency_ms": latency_summary(all_samples),
+            },
+        }
+
+
+class LoadTest:
+    """Virtual-user scenarios against one API instance."""
+
+    def __init__(self, client: httpx.AsyncClient, args: argparse.Namespace):
+        """Initialize load test.
+
+        Args:
+            client: HTTP client bound to the API base URL
+            args: Command line arguments
+        """
+        self.client = client
+        self.args = args
+        self.rng = random.Random(args.seed)
+        self.stats = RouteStats()
+        self.domain_id: Optional[str] = None
+        self.dataset_id: Optional[str] = None
+        self.upload_body = corpus_text(self.rng, args.upload_kb).encode("utf-8")
+
+    async def request(
+        self,
+        method: str,
+        route: str,
+        url: str,
+        **kwargs: Any,
+    ) -> Optional[httpx.Response]:
+        """Send a request and record it under ``route``.
+
+        Returns:
+            Response, or None if the request failed at the transport level
+        """
+        start = time.perf_counter()
+        try:
+            response = await self.client.request(method, url, **kwargs)
+        except httpx.HTTPError as e:
+            self.stats.record(route, (time.perf_counter() - start) * 1000, type(e).__name__, True)
+            return None
+        latency_ms = (time.perf_counter() - start) * 1000
+        self.stats.record(route, latency_ms, str(response.status_code), response.status_code >= 400)
+        return response
+
+    async def setup(self) -> None:
+        """Create the domain, corpus and dataset used by the scenarios.
+
+        Raises:
+            httpx.HTTPStatusError: If any setup call fails
+        """
+        slug = f"loadtest-{uuid4().hex[:8]}"
+        response = await self.client.post(
+            f"{API_PREFIX}/domains", json={"name": slug, "slug": slug}
+        )
+        response.raise_for_status()
+        self.domain_id = response.json()["id"]
+
+        corpus = corpus_text(self.rng, self.args.corpus_kb).encode("utf-8")
+        response = await self.client.post(
+            f"{API_PREFIX}/documents/upload",
+            params={"domain_id": self.domain_id},
+            files={"file": ("corpus.txt", corpus, "text/plain")},
+        )
+        response.raise_for_status()
+        document_id = response.json()["id"]
+        response = await self.client.post(
+            f"{API_PREFIX}/documents/{document_id}/process",
+            json={"segment_type": "paragraph"},
+        )
+        response.raise_for_status()
+
+        response = await self.client.post(
+            f"{API_PREFIX}/datasets",
+            json={
+                "domain_id": self.domain_id,
+                "name": slug,
+                "provider": "fake",
+                "target_model_family": "fake-model",
+            },
+        )
+        response.raise_for_status()
+        self.dataset_id = response.json()["id"]
+
+        remaining = self.args.setup_items
+        while remaining > 0:
+            batch = min(remaining, 10000)
+            response = await self.client.post(
+                f"{API_PREFIX}/datasets/generate",
+                json={"dataset_id": self.dataset_id, "max_items": batch, "batch_size": 100},
+                timeout=None,
+            )
+            response.raise_for_status()
+            created = response.json()["items_created"]
+            if not created:
+                break
+            remaining -= created
+
+    async def reviewer(self) -> None:
+        """List pending items and approve or reject one."""
+        response = await self.request(
+            "GET",
+            "GET /dataset/review/pending",
+            f"{API_PREFIX}/dataset/review/pending",
+            params={"dataset_id": self.dataset_id},
+        )
+        if response is None or response.status_code >= 400:
+            return
+        items = response.json()[:REVIEW_PAGE]
+        if not items:
+            return
+        item_id = self.rng.choice(items)["id"]
+        if self.rng.random() < 0.7:
+            await self.request(
+                "POST",
+                "POST /dataset/review/{id}/approve",
+                f"{API_PREFIX}/dataset/review/{item_id}/approve",
+                json={"reviewer_id": "loadtest"},
+            )
+        else:
+            await self.request(
+                "POST",
+                "POST /dataset/review/{id}/reject",
+                f"{API_PREFIX}/dataset/review/{item_id}/reject",
+                json={"reviewer_id": "loadtest", "justification": "Load test rejection"},
+            )
+
+    async def uploader(self) -> None:
+        """Upload a document and process it into segments."""
+        response = await self.request(
+            "POST",
+            "POST /documents/upload",
+            f"{API_PREFIX}/documents/upload",
+            params={"domain_id": self.domain_id},
+            files={"file": (f"upload-{uuid4().hex[:8]}.txt", self.upload_body, "text/plain")},
+        )
+        if response is None or response.status_code >= 400:
+            return
+        await self.request(
+            "POST",
+            "POST /documents/{id}/process",
+            f"{API_PREFIX}/documents/{response.json()['id']}/process",
+            json={"segment_type": "paragraph"},
+        )
+
+    async def listing(self) -> None:
+        """List datasets and documents."""
+        await self.request("GET", "GET /datasets", f"{API_PREFIX}/datasets")
+        await self.request(
+            "GET",
+            "GET /documents",
+            f"{API_PREFIX}/documents",
+            params={"domain_id": self.domain_id},
+        )
+
+    async def export(self) -> None:
+        """Export the dataset and download the file through its presigned URL."""
+        response = await self.request(
+            "POST",
+            "POST /datasets/{id}/export",
+            f"{API_PREFIX}/datasets/{self.dataset_id}/export",
+            json={"approved_only": False},
+        )
+        if response is None or response.status_code >= 400:
+            return
+        response = await self.request(
+            "GET",
+            "GET /datasets/exports/{id}/download",
+            f"{API_PREFIX}/datasets/exports/{response.json()['id']}/download",
+        )
+        if response is None or response.status_code >= 400:
+            return
+        download_url, headers = self._public_url(response.json()["download_url"])
+        await self.request("GET", "GET <s3 object>", download_url, headers=headers)
+
+    def _public_url(self, url: str) -> tuple[str, dict[str, str]]:
+        """Rewrite a presigned URL to the S3 endpoint reachable from here.
+
+        The signed ``Host`` is kept as a header so the signature stays valid.
+        """
+        if not self.args.s3_public_url:
+            return url, {}
+        public = urlsplit(self.args.s3_public_url)
+        parts = urlsplit(url)
+        rewritten = urlunsplit((public.scheme, public.netloc, parts.path, parts.query, parts.fragment))
+        return rewritten, {"Host": parts.netloc}
+
+    async def virtual_user(
+        self,
+        scenarios: list[str],
+        weights: list[float],
+        deadline: float,
+    ) -> None:
+        """Run weighted scenario iterations until the deadline."""
+        while time.monotonic() < deadline:
+            scenario = self.rng.choices(scenarios, weights=weights, k=1)[0]
+            await getattr(self, scenario)()
+
+    async def run_step(self, concurrency: int, mix: dict[str, float]) -> dict[str, Any]:
+        """Run one ramp step at a fixed concurrency."""
+        self.stats = RouteStats()
+        scenarios, weights = list(mix), list(mix.values())
+        start = time.monotonic()
+        deadline = start + self.args.step_seconds
+        await asyncio.gather(
+            *(self.virtual_user(scenarios, weights, deadline) for _ in range(concurrency))
+        )
+        seconds = time.monotonic() - start
+        return {
+            "concurrency": concurrency,
+            "seconds": round(seconds, 3),
+            **self.stats.report(seconds),
+        }
+
+
+def parse_mix(value: str) -> dict[str, float]:
+    """Parse ``name=weight`` pairs into a scenario mix."""
+    mix = {}
+    for pair in value.split(","):
+        name, _, weight = pair.partition("=")
+        name = name.strip()
+        if name not in {"reviewer", "uploader", "listing", "export"}:
+            raise argparse.ArgumentTypeError(f"Unknown scenario: {name}")
+        mix[name] = float(weight or 1)
+    return {name: weight for name, weight in mix.items() if weight > 0}
+
+
+def meets_slo(step: dict[str, Any], args: argparse.Namespace) -> bool:
+    """Check a step against the p95 latency and error-rate thresholds."""
+    for route in step["routes"].values():
+        if args.max_error_rate is not None and route["error_rate"] > args.max_error_rate:
+            return False
+        p95 = route["latency_ms"]["p95"]
+        if args.max_p95_ms is not None and p95 is not None and p95 > args.max_p95_ms:
+            return False
+    return True
+
+
+async def run(args: argparse.Namespace) -> dict[str, Any]:
+    """Run setup and every ramp step."""
+    mix = parse_mix(args.mix)
+    peak = max(args.ramp)
+    limits = httpx.Limits(max_connections=peak * 2, max_keepalive_connections=peak)
+    client = httpx.AsyncClient(base_url=args.base_url, timeout=args.timeout, limits=limits)
+    async with client:
+        load_test = LoadTest(client, args)
+        await load_test.setup()
+        print(
+            f"setup done: domain={load_test.domain_id} dataset={load_test.dataset_id}",
+            file=sys.stderr,
+        )
+
+        steps = []
+        for concurrency in args.ramp:
+            step = await load_test.run_step(concurrency, mix)
+            step["meets_slo"] = meets_slo(step, args)
+            steps.append(step)
+            total = step["total"]
+            print(
+                f"c={concurrency:<4} {total['requests_per_second']:>8} req/s  "
+                f"p95={total['latency_ms']['p95']}ms  errors={total['error_rate']}%",
+                file=sys.stderr,
+            )
+
+    sustained = [step["concurrency"] for step in steps if step["meets_slo"]]
+    return {
+        "meta": {
+            "base_url": args.base_url,
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "mix": mix,
+            "step_seconds": args.step_seconds,
+            "slo": {"max_p95_ms": args.max_p95_ms, "max_error_rate": args.max_error_rate},
+        },
+        "max_sustained_concurrency": max(sustained) if sustained else None,
+        "steps": steps,
+    }
+
+
+def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument(
+        "--ramp",
+        type=lambda value: [int(step) for step in value.split(",")],
+        default=[1, 5, 10, 25, 50],
+        help="Comma-separated concurrency steps",
+    )
+    parser.add_argument("--step-seconds", type=float, default=30.0)
+    parser.add_argument(
+        "--mix", default=DEFAULT_MIX, help="Scenario weights, e.g. reviewer=6,export=1"
+    )
+    parser.add_argument("--setup-items", type=int, default=5000, help="Items generated for review")
+    parser.add_argument("--corpus-kb", type=int, default=512, help="Size of the setup corpus")
+    parser.add_argument("--upload-kb", type=int, default=64, help="Size of each uploaded document")
+    parser.add_argument("--s3-public-url", help="Rewrite presigned URLs to this S3 endpoint")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Request timeout in seconds")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-p95-ms", type=float, help="p95 latency SLO per route")
+    parser.add_argument("--max-error-rate", type=float, help="Error-rate SLO per route (%%)")
+    parser.add_argument("--output", help="Write the JSON report to this file (default: stdout)")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """Run the load test from the command line."""
+    args = parse_args(argv)
+    report = asyncio.run(run(args))
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+    if all(step["meets_slo"] for step in report["steps"]):
+        return 0
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
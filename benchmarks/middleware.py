@@ -0,0 +1,300 @@
+"""Per-request overhead of the application's middleware stack.
+
+Drives the middleware configured on ``app.main.app`` in-process (no server,
+no sockets) around a small JSON endpoint and a streaming endpoint, and
+compares it with the bare endpoints for each ``LOG_REQUEST_DETAILS`` level.
+Log output is discarded but still rendered, as in production:
+
+    python -m benchmarks.middleware --requests 20000 --output after.json
+
+The script only relies on ``app.main.app.user_middleware``, so a before/after
+comparison can run it from a checkout of the previous revision:
+
+    git worktree add /tmp/before <commit>
+    cp benchmarks/middleware.py /tmp/before/benchmarks/
+    (cd /tmp/before && python -m benchmarks.middleware --output /tmp/before.json)
+    python -m benchmarks.middleware --baseline /tmp/before.json
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import platform
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Any, Optional
+
+from app.core.config import get_settings
+from app.core.logging import configure_logging
+from benchmarks.pipeline import _git_commit
+from benchmarks.stats import latency_summary
+
+settings = get_settings()
+
+DETAIL_LEVELS = ("minimal", "standard", "verbose")
+JSON_BODY = json.dumps({"items": [{"id": i, "status": "pending_review"} for i in range(20)]})
+
+
+async def json_endpoint(scope: dict, receive: Any, send: Any) -> None:
+    """Return a small JSON document."""
+    body = JSON_BODY.encode("utf-8")
+    await send(
+        {
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode("latin-1")),
+            ],
+        }
+    )
+    await send({"type": "http.response.body", "body": body})
+
+
+def stream_endpoint(chunks: int, delay_ms: float) -> Any:
+    """Build an endpoint streaming NDJSON lines with a delay between them."""
+
+    async def endpoint(scope: dict, receive: Any, send: Any) -> None:
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [(b"content-type", b"application/x-ndjson")],
+            }
+        )
+        for index in range(chunks):
+            if delay_ms:
+                await asyncio.sleep(delay_ms / 1000)
+            line = json.dumps({"index": index}).encode("utf-8") + b"\n"
+            await send({"type": "http.response.body", "body": line, "more_body": True})
+        await send({"type": "http.response.body", "body": b""})
+
+    return endpoint
+
+
+def wrap_with_middleware(application: Any, endpoint: Any) -> Any:
+    """Wrap an endpoint with the user middleware stack of an application."""
+    wrapped = endpoint
+    for cls, args, kwargs in reversed(application.user_middleware):
+        wrapped = cls(wrapped, *args, **kwargs)
+    return wrapped
+
+
+def build_scope(origin: Optional[str]) -> dict[str, Any]:
+    """Build an HTTP request scope resembling a browser API call."""
+    headers = [
+        (b"host", b"localhost:8000"),
+        (b"user-agent", b"Mozilla/5.0 (benchmark)"),
+        (b"accept", b"application/json"),
+        (b"accept-encoding", b"gzip, deflate, br"),
+        (b"referer", b"http://localhost:3000/review"),
+        (b"cookie", b"session=abc"),
+    ]
+    if origin:
+        headers.append((b"origin", origin.encode("latin-1")))
+    return {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/api/v1/datasets",
+        "raw_path": b"/api/v1/datasets",
+        "root_path": "",
+        "query_string": b"domain_id=42",
+        "headers": headers,
+        "client": ("127.0.0.1", 50000),
+        "server": ("localhost", 8000),
+    }
+
+
+async def call(app: Any, scope: dict[str, Any]) -> tuple[float, Optional[float]]:
+    """Run one request through an ASGI app.
+
+    Returns:
+        Total latency and time to the first body byte, in milliseconds
+    """
+    done = asyncio.Event()
+    request_sent = False
+    first_byte: Optional[float] = None
+
+    async def receive() -> dict[str, Any]:
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await done.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message: dict[str, Any]) -> None:
+        nonlocal first_byte
+        if message["type"] == "http.response.body":
+            if first_byte is None and message.get("body"):
+                first_byte = time.perf_counter()
+            if not message.get("more_body", False):
+                done.set()
+
+    start = time.perf_counter()
+    await app(dict(scope), receive, send)
+    end = time.perf_counter()
+    ttfb = (first_byte - start) * 1000 if first_byte is not None else None
+    return (end - start) * 1000, ttfb
+
+
+async def measure(app: Any, scope: dict[str, Any], requests: int, warmup: int) -> dict[str, Any]:
+    """Measure latency of sequential requests through an app."""
+    for _ in range(warmup):
+        await call(app, scope)
+
+    latencies: list[float] = []
+    ttfbs: list[float] = []
+    start = time.perf_counter()
+    for _ in range(requests):
+        latency, ttfb = await call(app, scope)
+        latencies.append(latency)
+        if ttfb is not None:
+            ttfbs.append(ttfb)
+    seconds = time.perf_counter() - start
+
+    return {
+        "requests": requests,
+        "requests_per_second": round(requests / seconds, 1) if seconds else None,
+        "mean_us": round(sum(latencies) / len(latencies) * 1000, 2),
+        "latency_ms": latency_summary(latencies),
+        "ttfb_ms": latency_summary(ttfbs),
+    }
+
+
+async def run(args: argparse.Namespace, application: Any) -> dict[str, Any]:
+    """Measure every endpoint bare and behind the middleware stack of ``application``."""
+    scope = build_scope(args.origin)
+    endpoints = {
+        "json": (json_endpoint, args.requests),
+        "stream": (
+            stream_endpoint(args.stream_chunks, args.stream_delay_ms),
+            args.stream_requests,
+        ),
+    }
+
+    scenarios: dict[str, Any] = {}
+    for name, (endpoint, requests) in endpoints.items():
+        results = {"bare": await measure(endpoint, scope, requests, args.warmup)}
+        for level in args.levels:
+            # Middleware may read the detail level when built or per request
+            settings.LOG_REQUEST_DETAILS = level
+            app = wrap_with_middleware(application, endpoint)
+            result = await measure(app, scope, requests, args.warmup)
+            result["overhead_us"] = round(result["mean_us"] - results["bare"]["mean_us"], 2)
+            results[level] = result
+        scenarios[name] = results
+
+    return {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "log_level": args.log_level,
+        },
+        "scenarios": scenarios,
+    }
+
+
+def compare(
+    report: dict[str, Any],
+    baseline: dict[str, Any],
+    max_regression: Optional[float],
+) -> bool:
+    """Print middleware overhead changes against a baseline report.
+
+    Args:
+        report: Current report
+        baseline: Baseline report
+        max_regression: Allowed overhead increase in percent (optional)
+
+    Returns:
+        False if any overhead regressed beyond ``max_regression``
+    """
+    ok = True
+    print(f"{'scenario':<18} {'before us':>10} {'after us':>10} {'change':>8}", file=sys.stderr)
+    for name, results in report["scenarios"].items():
+        for level, current in results.items():
+            previous = baseline.get("scenarios", {}).get(name, {}).get(level)
+            if level == "bare" or not previous:
+                continue
+            before, after = previous["overhead_us"], current["overhead_us"]
+            change = (after - before) / before * 100 if before > 0 else 0.0
+            print(
+                f"{name + '/' + level:<18} {before:>10.1f} {after:>10.1f} {change:>+7.1f}%",
+                file=sys.stderr,
+            )
+            if max_regression is not None and change > max_regression:
+                ok = False
+    return ok
+
+
+def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=20_000, help="JSON requests per run")
+    parser.add_argument("--stream-requests", type=int, default=500)
+    parser.add_argument("--stream-chunks", type=int, default=50)
+    parser.add_argument("--stream-delay-ms", type=float, default=0.0)
+    parser.add_argument("--warmup", type=int, default=200)
+    parser.add_argument(
+        "--levels",
+        type=lambda value: value.split(","),
+        default=list(DETAIL_LEVELS),
+        help="Comma-separated LOG_REQUEST_DETAILS levels",
+    )
+    parser.add_argument("--log-level", default="INFO")
+    parser.add_argument(
+        "--origin", default="http://localhost:3000", help="Origin header (empty for none)"
+    )
+    parser.add_argument("--output", help="Write the JSON report to this file (default: stdout)")
+    parser.add_argument("--baseline", help="Compare against a previous JSON report")
+    parser.add_argument(
+        "--max-regression", type=float, help="Fail when overhead grows by more than this %%"
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """Run the benchmark from the command line."""
+    args = parse_args(argv)
+
+    # Logs are rendered as in production but written to /dev/null
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        settings.LOG_LEVEL = args.log_level
+        from app.main import app as application
+
+        # Importing the app configures logging from settings; use production rendering
+        configure_logging(
+            log_level=args.log_level,
+            app_env="production",
+            async_sink=settings.LOG_ASYNC,
+            queue_size=settings.LOG_QUEUE_SIZE,
+            batch_size=settings.LOG_BATCH_SIZE,
+        )
+        report = asyncio.run(run(args, application))
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if not compare(report, baseline, args.max_regression):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,538 @@
+"""End-to-end benchmark of the ingest -> segment -> generate -> review -> export pipeline.
+
+Seeds a scratch Postgres database with synthetic domains, documents,
+segments and dataset items, runs each pipeline stage and writes throughput,
+latency percentiles and peak memory per stage as JSON, so results can be
+compared between commits:
+
+    python -m benchmarks.pipeline --segments 100000 --output before.json
+    python -m benchmarks.pipeline --segments 100000 --baseline before.json
+
+Generation uses the ``fake`` provider with zero latency, so the numbers
+measure our own overhead rather than the provider's.
+
+The target database must exist and is wiped (all tables dropped and
+recreated) on every run.
+"""
+
+import argparse
+import asyncio
+import io
+import json
+import platform
+import random
+import resource
+import subprocess
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Any, Iterator, Optional
+from uuid import uuid4
+
+from sqlalchemy import insert
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.config import get_settings
+from app.core.logging import configure_logging
+from app.db.base import Base
+from app.integrations.text_extractors.factory import get_extractor
+from app.models import (
+    Dataset,
+    DatasetItem,
+    Document,
+    DocumentVersion,
+    Domain,
+    Segment,
+)
+from app.services.export_service import ExportService
+from app.services.review_service import ReviewService
+from app.services.segmenter_service import SegmenterService
+from app.services.synthetic_generator import SyntheticGeneratorService
+from benchmarks.stats import latency_summary
+
+settings = get_settings()
+
+# Rows per bulk INSERT while seeding
+SEED_CHUNK_SIZE = 5000
+
+DOCX_CONTENT_TYPE = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+
+_WORDS = (
+    "agreement", "balance", "client", "clause", "contract", "coverage", "deadline",
+    "evidence", "invoice", "liability", "notice", "payment", "policy", "premium",
+    "procedure", "record", "renewal", "request", "review", "statement", "term",
+)
+
+
+def peak_rss_mb() -> float:
+    """Get the process peak resident set size in MB (Linux reports KB)."""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+class Stage:
+    """Latency samples and totals for one benchmark stage."""
+
+    def __init__(self, name: str):
+        """Initialize stage.
+
+        Args:
+            name: Stage name
+        """
+        self.name = name
+        self.latencies_ms: list[float] = []
+        self.rows = 0
+        self.seconds = 0.0
+        self.peak_memory_mb: Optional[float] = None
+
+    @contextmanager
+    def op(self) -> Iterator["Stage"]:
+        """Time one operation of the stage; callers add processed rows."""
+        start = time.perf_counter()
+        yield self
+        self.latencies_ms.append((time.perf_counter() - start) * 1000)
+
+    def report(self) -> dict[str, Any]:
+        """Build the machine-readable stage report."""
+
+        def rounded(value: Optional[float]) -> Optional[float]:
+            return round(value, 3) if value is not None else None
+
+        return {
+            "ops": len(self.latencies_ms),
+            "rows": self.rows,
+            "seconds": round(self.seconds, 3),
+            "ops_per_second": rounded(
+                len(self.latencies_ms) / self.seconds if self.seconds else None
+            ),
+            "rows_per_second": rounded(self.rows / self.seconds if self.seconds else None),
+            "latency_ms": latency_summary(self.latencies_ms),
+            "peak_memory_mb": rounded(self.peak_memory_mb),
+            "peak_rss_mb": rounded(peak_rss_mb()),
+        }
+
+
+@contextmanager
+def stage(name: str, results: dict[str, Any], trace_memory: bool) -> Iterator[Stage]:
+    """Run a benchmark stage and store its report in ``results``.
+
+    Args:
+        name: Stage name
+        results: Report dict to update
+        trace_memory: Measure peak Python heap with tracemalloc (slows the stage)
+
+    Yields:
+        Stage collecting samples
+    """
+    current = Stage(name)
+    if trace_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        yield current
+    finally:
+        current.seconds = time.perf_counter() - start
+        if trace_memory:
+            current.peak_memory_mb = tracemalloc.get_traced_memory()[1] / 2**20
+            tracemalloc.stop()
+        results[name] = current.report()
+        print(
+            f"{name:<12} {current.rows:>9} rows  {current.seconds:8.2f}s  "
+            f"p95={results[name]['latency_ms']['p95']}ms",
+            file=sys.stderr,
+        )
+
+
+def synthetic_text(rng: random.Random, paragraphs: int, words_per_paragraph: int = 60) -> str:
+    """Build a synthetic document with blank-line separated paragraphs."""
+    return "\n\n".join(
+        " ".join(rng.choice(_WORDS) for _ in range(words_per_paragraph)).capitalize() + "."
+        for _ in range(paragraphs)
+    )
+
+
+def synthetic_docx(text: str) -> bytes:
+    """Build a DOCX file with one paragraph per text paragraph."""
+    from docx import Document as DocxDocument
+
+    document = DocxDocument()
+    for paragraph in text.split("\n\n"):
+        document.add_paragraph(paragraph)
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+class InMemoryS3Client:
+    """Local stand-in for ``S3Client`` keeping uploads in memory."""
+
+    def __init__(self):
+        """Initialize stand-in."""
+        self.objects: dict[str, bytes] = {}
+
+    async def upload_file(
+        self,
+        file_content: Any,
+        s3_key: str,
+        content_type: Optional[str] = None,
+    ) -> str:
+        """Store an upload and return its key."""
+        if not isinstance(file_content, bytes):
+            file_content = file_content.read()
+        self.objects[s3_key] = file_content
+        return s3_key
+
+    async def download_file(self, s3_key: str) -> bytes:
+        """Return a stored upload."""
+        return self.objects[s3_key]
+
+
+async def _bulk_insert(session: AsyncSession, model: Any, rows: list[dict[str, Any]]) -> None:
+    """Insert rows in chunks with executemany."""
+    for i in range(0, len(rows), SEED_CHUNK_SIZE):
+        await session.execute(insert(model), rows[i : i + SEED_CHUNK_SIZE])
+    await session.commit()
+
+
+async def seed(
+    session: AsyncSession,
+    args: argparse.Namespace,
+    rng: random.Random,
+    current: Stage,
+) -> dict[str, Any]:
+    """Seed domains, documents, segments and dataset items.
+
+    Returns:
+        IDs of the seeded entities used by later stages
+    """
+    domain_ids = [str(uuid4()) for _ in range(args.domains)]
+    await _bulk_insert(
+        session,
+        Domain,
+        [
+            {"id": domain_id, "name": f"bench-{domain_id}", "slug": f"bench-{domain_id}"}
+            for domain_id in domain_ids
+        ],
+    )
+
+    documents = []
+    versions = []
+    for index in range(args.documents):
+        document_id = str(uuid4())
+        documents.append(
+            {
+                "id": document_id,
+                "domain_id": domain_ids[index % len(domain_ids)],
+                "filename": f"doc-{index}.txt",
+                "original_filename": f"doc-{index}.txt",
+                "s3_key": f"bench/doc-{index}.txt",
+                "content_type": "text/plain",
+                "status": "processed",
+            }
+        )
+        versions.append({"id": str(uuid4()), "document_id": document_id, "version_number": 1})
+    await _bulk_insert(session, Document, documents)
+    await _bulk_insert(session, DocumentVersion, versions)
+
+    paragraph = synthetic_text(rng, 1)
+    segments = []
+    for index in range(args.segments):
+        document = documents[index % len(documents)]
+        segments.append(
+            {
+                "id": str(uuid4()),
+                "domain_id": document["domain_id"],
+                "document_id": document["id"],
+                "document_version_id": versions[index % len(versions)]["id"],
+                "segment_type": "paragraph",
+                "content": paragraph,
+                "position": index // len(documents),
+                "meta_data": {},
+            }
+        )
+    await _bulk_insert(session, Segment, segments)
+
+    dataset_id = str(uuid4())
+    await _bulk_insert(
+        session,
+        Dataset,
+        [
+            {
+                "id": dataset_id,
+                "domain_id": domain_ids[0],
+                "name": "bench",
+                "provider": "fake",
+                "target_model_family": "fake-model",
+                "status": "ready",
+                "generation_config": {},
+                "segment_filter": {},
+            }
+        ],
+    )
+
+    items = []
+    for index in range(args.items):
+        items.append(
+            {
+                "id": str(uuid4()),
+                "dataset_id": dataset_id,
+                "segment_id": segments[index % len(segments)]["id"],
+                "source_provider": "fake",
+                "instruction": f"Summarize the {rng.choice(_WORDS)} terms.",
+                "ideal_response": paragraph,
+                "bad_response": "No.",
+                "explanation": "The ideal response is grounded in the segment.",
+                "status": "approved" if index % 2 else "pending_review",
+                "quality_flags": {},
+                "meta_data": {},
+            }
+        )
+    await _bulk_insert(session, DatasetItem, items)
+
+    current.rows = len(domain_ids) + len(documents) + len(versions) + len(segments) + 1 + len(items)
+    return {
+        "domain_id": domain_ids[0],
+        "documents": documents,
+        "versions": versions,
+        "dataset_id": dataset_id,
+    }
+
+
+async def run(args: argparse.Namespace) -> dict[str, Any]:
+    """Run every stage and build the report."""
+    rng = random.Random(args.seed)
+    # Providers are created per run and read their latency from settings
+    settings.FAKE_LLM_LATENCY_MS = args.fake_latency_ms
+    engine = create_async_engine(args.database_url, echo=False)
+    session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    stages: dict[str, Any] = {}
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+
+    try:
+        with stage("seed", stages, args.trace_memory) as current:
+            async with session_factory() as session:
+                with current.op():
+                    seeded = await seed(session, args, rng, current)
+
+        # Extraction: plain text and DOCX uploads of the same documents
+        texts = [synthetic_text(rng, args.paragraphs) for _ in range(args.process_documents)]
+        payloads = [("text/plain", text.encode("utf-8")) for text in texts]
+        payloads += [(DOCX_CONTENT_TYPE, synthetic_docx(text)) for text in texts]
+        with stage("extraction", stages, args.trace_memory) as current:
+            for content_type, payload in payloads:
+                extractor = get_extractor(content_type)
+                with current.op():
+                    await extractor.extract(payload)
+                current.rows += len(payload)
+
+        with stage("segmentation", stages, args.trace_memory) as current:
+            for index, text in enumerate(texts):
+                document = seeded["documents"][index % len(seeded["documents"])]
+                version = seeded["versions"][index % len(seeded["versions"])]
+                async with session_factory() as session:
+                    with current.op():
+                        segments = await SegmenterService.create_segments_from_text(
+                            db=session,
+                            domain_id=document["domain_id"],
+                            document_id=document["id"],
+                            document_version_id=version["id"],
+                            text=text,
+                            segment_type="paragraph",
+                        )
+                current.rows += len(segments)
+
+        with stage("generation", stages, args.trace_memory) as current:
+            for _ in range(args.generate_runs):
+                async with session_factory() as session:
+                    with current.op():
+                        created = await SyntheticGeneratorService.generate_items(
+                            db=session,
+                            dataset_id=seeded["dataset_id"],
+                            max_items=args.generate_items,
+                            batch_size=args.generate_batch_size,
+                        )
+                current.rows += created
+
+        with stage("list_pending", stages, args.trace_memory) as current:
+            for _ in range(args.repeat):
+                async with session_factory() as session:
+                    with current.op():
+                        pending = await ReviewService.list_pending(
+                            session, dataset_id=seeded["dataset_id"]
+                        )
+                current.rows += len(pending)
+
+        export_service = ExportService()
+        export_service.s3_client = InMemoryS3Client()
+        with stage("export", stages, args.trace_memory) as current:
+            for _ in range(args.repeat):
+                async with session_factory() as session:
+                    with current.op():
+                        export = await export_service.export_jsonl(session, seeded["dataset_id"])
+                current.rows += export.item_count
+    finally:
+        await engine.dispose()
+
+    return {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "scale": {
+                "domains": args.domains,
+                "documents": args.documents,
+                "segments": args.segments,
+                "items": args.items,
+            },
+            "trace_memory": args.trace_memory,
+        },
+        "stages": stages,
+    }
+
+
+def _git_commit() -> Optional[str]:
+    """Get the current git commit, if available."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(
+    report: dict[str, Any],
+    baseline: dict[str, Any],
+    max_regression: Optional[float],
+) -> bool:
+    """Print per-stage changes against a baseline report.
+
+    Args:
+        report: Current report
+        baseline: Baseline report
+        max_regression: Allowed p95 / throughput regression in percent (optional)
+
+    Returns:
+        False if any stage regressed beyond ``max_regression``
+    """
+    ok = True
+    header = f"{'stage':<12} {'rows/s':>12} {'change':>8} {'p95 ms':>10} {'change':>8}"
+    print(header, file=sys.stderr)
+    for name, current in report["stages"].items():
+        previous = baseline.get("stages", {}).get(name)
+        if not previous:
+            continue
+        throughput_change = _change(current["rows_per_second"], previous["rows_per_second"])
+        p95_change = _change(current["latency_ms"]["p95"], previous["latency_ms"]["p95"])
+        print(
+            f"{name:<12} {current['rows_per_second'] or 0:>12.1f} {throughput_change:>+7.1f}% "
+            f"{current['latency_ms']['p95'] or 0:>10.2f} {p95_change:>+7.1f}%",
+            file=sys.stderr,
+        )
+        regression = max(p95_change, -throughput_change)
+        if max_regression is not None and regression > max_regression:
+            ok = False
+    return ok
+
+
+def _change(current: Optional[float], previous: Optional[float]) -> float:
+    """Relative change in percent."""
+    if not current or not previous:
+        return 0.0
+    return (current - previous) / previous * 100
+
+
+def scratch_database_url() -> str:
+    """Default scratch database: the configured database name with a ``_bench`` suffix."""
+    url = make_url(settings.DATABASE_URL)
+    return url.set(database=f"{url.database}_bench").render_as_string(hide_password=False)
+
+
+def check_scratch_database(parser: argparse.ArgumentParser, database_url: str) -> None:
+    """Refuse to wipe the application database."""
+    target = make_url(database_url)
+    application = make_url(settings.DATABASE_URL)
+    if (target.host, target.port, target.database) == (
+        application.host,
+        application.port,
+        application.database,
+    ):
+        parser.error(
+            f"--database-url points at the application database ({target.database}), "
+            "which the benchmark would wipe"
+        )
+
+
+def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--database-url",
+        default=scratch_database_url(),
+        help="Scratch database (wiped on every run)",
+    )
+    parser.add_argument("--domains", type=int, default=1)
+    parser.add_argument("--documents", type=int, default=100)
+    parser.add_argument("--segments", type=int, default=10_000)
+    parser.add_argument(
+        "--items", type=int, default=10_000, help="Seeded dataset items (half pending review)"
+    )
+    parser.add_argument(
+        "--process-documents", type=int, default=20, help="Documents extracted and segmented"
+    )
+    parser.add_argument(
+        "--paragraphs", type=int, default=200, help="Paragraphs per processed document"
+    )
+    parser.add_argument("--generate-runs", type=int, default=5)
+    parser.add_argument("--generate-items", type=int, default=200, help="Items per generation run")
+    parser.add_argument("--generate-batch-size", type=int, default=50)
+    parser.add_argument("--fake-latency-ms", type=float, default=0.0, help="Fake provider latency")
+    parser.add_argument(
+        "--repeat", type=int, default=5, help="Repetitions of list_pending and export"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--trace-memory", action="store_true", help="Track peak Python heap (slower)"
+    )
+    parser.add_argument("--output", help="Write the JSON report to this file (default: stdout)")
+    parser.add_argument("--baseline", help="Compare against a previous JSON report")
+    parser.add_argument(
+        "--max-regression", type=float, help="Fail when a stage regresses by more than this %%"
+    )
+    args = parser.parse_args(argv)
+    check_scratch_database(parser, args.database_url)
+    return args
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """Run the benchmark from the command line."""
+    args = parse_args(argv)
+    configure_logging(log_level="WARNING", app_env="production")
+
+    report = asyncio.run(run(args))
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if not compare(report, baseline, args.max_regression):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
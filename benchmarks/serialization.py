@@ -0,0 +1,149 @@
+"""Serialization time of large list responses.
+
+Renders N segment rows (text-heavy, like ``GET /api/v1/segments``) the way a
+route returning Pydantic models is rendered by FastAPI (``model_validate`` per
+row, then ``response_model`` validation and serialization, then
+``JSONResponse``) and through ``app.api.responses.list_response`` as a JSON
+array and as an NDJSON stream. No database or server is involved:
+
+    python -m benchmarks.serialization --rows 10000 --output serialization.json
+"""
+
+import argparse
+import asyncio
+import gc
+import json
+import platform
+import sys
+import time
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from typing import Any, List, Optional
+
+from fastapi import Request
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from app.api.responses import NDJSON_MEDIA_TYPE, list_response
+from app.schemas.segment import SegmentResponse
+from benchmarks.pipeline import _git_commit
+from benchmarks.stats import latency_summary
+
+CONTENT = "Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 20
+
+
+def build_rows(count: int) -> list[SimpleNamespace]:
+    """Build segment-like rows with the attributes of the ORM model."""
+    created_at = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    return [
+        SimpleNamespace(
+            id=f"segment-{index}",
+            domain_id="domain-1",
+            document_id="document-1",
+            document_version_id="version-1",
+            use_case="support",
+            segment_type="paragraph",
+            content=CONTENT,
+            position=index,
+            meta_data={"page": index // 10, "section": "intro"},
+            created_at=created_at,
+        )
+        for index in range(count)
+    ]
+
+
+def build_request(accept: str) -> Request:
+    """Build a request carrying only an ``Accept`` header."""
+    return Request({"type": "http", "headers": [(b"accept", accept.encode("latin-1"))]})
+
+
+async def render_response_model(rows: list[Any]) -> bytes:
+    """Render rows as a route returning Pydantic models with ``response_model``."""
+    field = create_response_field(
+        name="Response", type_=List[SegmentResponse], mode="serialization"
+    )
+    models = [SegmentResponse.model_validate(row) for row in rows]
+    content = await serialize_response(field=field, response_content=models)
+    return JSONResponse(content).body
+
+
+async def render_fast_json(rows: list[Any]) -> bytes:
+    """Render rows through ``list_response`` as one JSON array."""
+    return list_response(build_request("application/json"), SegmentResponse, rows).body
+
+
+async def render_fast_ndjson(rows: list[Any]) -> bytes:
+    """Render rows through ``list_response`` as a (fully consumed) NDJSON stream."""
+    response = list_response(build_request(NDJSON_MEDIA_TYPE), SegmentResponse, rows)
+    return b"".join([chunk async for chunk in response.body_iterator])
+
+
+RENDERERS = {
+    "response_model": render_response_model,
+    "orjson": render_fast_json,
+    "ndjson": render_fast_ndjson,
+}
+
+
+async def measure(renderer: Any, rows: list[Any], repeat: int) -> dict[str, Any]:
+    """Measure the render time of one renderer."""
+    await renderer(rows)
+    timings: list[float] = []
+    size = 0
+    for _ in range(repeat):
+        # Collect the previous run's garbage outside the timed section
+        gc.collect()
+        start = time.perf_counter()
+        size = len(await renderer(rows))
+        timings.append((time.perf_counter() - start) * 1000)
+    return {"bytes": size, "time_ms": latency_summary(timings)}
+
+
+async def run(args: argparse.Namespace) -> dict[str, Any]:
+    """Measure every renderer on the same rows."""
+    rows = build_rows(args.rows)
+    results = {
+        name: await measure(renderer, rows, args.repeat) for name, renderer in RENDERERS.items()
+    }
+    baseline = results["response_model"]["time_ms"]["p50"]
+    for result in results.values():
+        result["speedup"] = round(baseline / result["time_ms"]["p50"], 2)
+
+    return {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "rows": args.rows,
+        },
+        "renderers": results,
+    }
+
+
+def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--output", help="Write the JSON report to this file (default: stdout)")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """Run the benchmark from the command line."""
+    args = parse_args(argv)
+    report = asyncio.run(run(args))
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
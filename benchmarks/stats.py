@@ -0,0 +1,42 @@
+"""Statistics helpers shared by benchmarks and load tests."""
+
+import math
+from typing import Optional
+
+
+def percentile(samples: list[float], pct: float) -> Optional[float]:
+    """Compute a nearest-rank percentile.
+
+    Args:
+        samples: Latency samples
+        pct: Percentile (0-100)
+
+    Returns:
+        Percentile value, or None without samples
+    """
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    index = max(0, math.ceil(pct / 100 * len(ordered)) - 1)
+    return ordered[index]
+
+
+def latency_summary(samples: list[float]) -> dict[str, Optional[float]]:
+    """Summarize latency samples (milliseconds) as p50/p95/p99/max.
+
+    Args:
+        samples: Latency samples
+
+    Returns:
+        Dict of rounded percentiles
+    """
+
+    def rounded(value: Optional[float]) -> Optional[float]:
+        return round(value, 3) if value is not None else None
+
+    return {
+        "p50": rounded(percentile(samples, 50)),
+        "p95": rounded(percentile(samples, 95)),
+        "p99": rounded(percentile(samples, 99)),
+        "max": rounded(max(samples) if samples else None),
+    }
@@ -100,11 +100,11 @@ CREATE TABLE segments (
     created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
 );
 
-CREATE INDEX idx_segments_domain_id ON segments(domain_id);
+CREATE INDEX idx_segments_domain ON segments(domain_id, id);
+CREATE INDEX idx_segments_domain_use_case ON segments(domain_id, use_case, id);
+CREATE INDEX idx_segments_domain_use_case_type ON segments(domain_id, use_case, segment_type, id);
 CREATE INDEX idx_segments_document_id ON segments(document_id);
 CREATE INDEX idx_segments_document_version_id ON segments(document_version_id);
-CREATE INDEX idx_segments_use_case ON segments(use_case);
-CREATE INDEX idx_segments_segment_type ON segments(segment_type);
 CREATE INDEX idx_segments_created_at ON segments(created_at DESC);
 
 COMMENT ON TABLE segments IS 'Segmentos de texto extraídos dos documentos';
@@ -156,6 +156,7 @@ CREATE TABLE datasets (
     version INTEGER DEFAULT 1,
     generation_config JSONB DEFAULT '{}',
     segment_filter JSONB DEFAULT '{}',
+    generation_state JSONB NOT NULL DEFAULT '{}',
     total_items INTEGER DEFAULT 0,
     approved_items INTEGER DEFAULT 0,
     rejected_items INTEGER DEFAULT 0,
@@ -173,6 +174,7 @@ CREATE INDEX idx_datasets_created_at ON datasets(created_at DESC);
 
 COMMENT ON TABLE datasets IS 'Datasets de treinamento para modelos de IA';
 COMMENT ON COLUMN datasets.provider IS 'Provider LLM usado: openai, gemini, together';
+COMMENT ON COLUMN datasets.generation_state IS 'Jobs da Batch API da última geração offline';
 COMMENT ON COLUMN datasets.status IS 'Status: draft, generating, ready, archived';
 COMMENT ON COLUMN datasets.segment_filter IS 'Filtros aplicados na seleção de segmentos em formato JSON';
 
@@ -185,6 +187,13 @@ CREATE TABLE dataset_items (
     dataset_id UUID NOT NULL REFERENCES datasets(id) ON DELETE CASCADE,
     segment_id UUID REFERENCES segments(id) ON DELETE SET NULL,
     source_provider VARCHAR(50),
+    source_model VARCHAR(100),
+    generation_run_id VARCHAR(36),
+    prompt_tokens INTEGER,
+    completion_tokens INTEGER,
+    cached_tokens INTEGER,
+    latency_ms FLOAT,
+    usage_estimated BOOLEAN NOT NULL DEFAULT FALSE,
     instruction TEXT NOT NULL,
     input_text TEXT,
     ideal_response TEXT NOT NULL,
@@ -198,17 +207,22 @@ CREATE TABLE dataset_items (
     updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
 );
 
-CREATE INDEX idx_dataset_items_dataset_id ON dataset_items(dataset_id);
+CREATE INDEX idx_dataset_items_dataset_status ON dataset_items(dataset_id, status, created_at);
+CREATE INDEX idx_dataset_items_pending_review ON dataset_items(created_at)
+    WHERE status = 'pending_review';
 CREATE INDEX idx_dataset_items_segment_id ON dataset_items(segment_id);
-CREATE INDEX idx_dataset_items_status ON dataset_items(status);
 CREATE INDEX idx_dataset_items_source_provider ON dataset_items(source_provider);
 CREATE INDEX idx_dataset_items_quality_score ON dataset_items(quality_score DESC);
 CREATE INDEX idx_dataset_items_created_at ON dataset_items(created_at DESC);
+CREATE INDEX idx_dataset_items_generation_run_id ON dataset_items(dataset_id, generation_run_id);
 
 COMMENT ON TABLE dataset_items IS 'Items individuais do dataset (exemplos de treinamento)';
 COMMENT ON COLUMN dataset_items.status IS 'Status: pending_review, approved, rejected';
 COMMENT ON COLUMN dataset_items.quality_score IS 'Score de qualidade (0.0 a 1.0)';
 COMMENT ON COLUMN dataset_items.quality_flags IS 'Flags de qualidade em formato JSON';
+COMMENT ON COLUMN dataset_items.generation_run_id IS 'Execução de geração que produziu o item';
+COMMENT ON COLUMN dataset_items.prompt_tokens IS 'Tokens de prompt consumidos (rateados em chamadas multi-item)';
+COMMENT ON COLUMN dataset_items.usage_estimated IS 'Tokens estimados pelo tamanho do texto (stream sem bloco de uso)';
 
 -- ============================================================================
 -- TABELA: dataset_exports
@@ -330,26 +344,52 @@ COMMENT ON COLUMN training_jobs.metrics IS 'Métricas de treinamento em formato
 -- Descrição: Logs do sistema
 -- ============================================================================
 CREATE TABLE system_logs (
-    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    id UUID NOT NULL DEFAULT uuid_generate_v4(),
     level VARCHAR(20) NOT NULL,
     module VARCHAR(100) NOT NULL,
     action VARCHAR(100) NOT NULL,
     entity_id UUID,
     entity_type VARCHAR(50),
-    details JSONB DEFAULT '{}',
+    details JSONB NOT NULL DEFAULT '{}',
     request_id VARCHAR(100),
-    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
-);
+    created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (id, created_at)
+) PARTITION BY RANGE (created_at);
+
+-- Partições mensais do mês atual e dos 3 seguintes; a aplicação cria as
+-- próximas e remove as antigas (SYSTEM_LOG_RETENTION_DAYS)
+DO $$
+DECLARE
+    part_month TIMESTAMP;
+BEGIN
+    FOR part_month IN
+        SELECT generate_series(
+            date_trunc('month', NOW() AT TIME ZONE 'UTC'),
+            date_trunc('month', NOW() AT TIME ZONE 'UTC') + INTERVAL '3 months',
+            INTERVAL '1 month'
+        )
+    LOOP
+        EXECUTE format(
+            'CREATE TABLE system_logs_p%s PARTITION OF system_logs '
+            'FOR VALUES FROM (%L) TO (%L)',
+            to_char(part_month, 'YYYY_MM'),
+            part_month AT TIME ZONE 'UTC',
+            (part_month + INTERVAL '1 month') AT TIME ZONE 'UTC'
+        );
+    END LOOP;
+END $$;
+
+-- Recebe linhas fora das partições mensais (ex.: manutenção atrasada); a
+-- aplicação registra um alerta e move essas linhas ao criar a partição do mês
+CREATE TABLE system_logs_default PARTITION OF system_logs DEFAULT;
 
 CREATE INDEX idx_system_logs_level ON system_logs(level);
 CREATE INDEX idx_system_logs_module ON system_logs(module);
-CREATE INDEX idx_system_logs_action ON system_logs(action);
 CREATE INDEX idx_system_logs_entity_id ON system_logs(entity_id);
-CREATE INDEX idx_system_logs_entity_type ON system_logs(entity_type);
 CREATE INDEX idx_system_logs_request_id ON system_logs(request_id);
 CREATE INDEX idx_system_logs_created_at ON system_logs(created_at DESC);
 
-COMMENT ON TABLE system_logs IS 'Logs estruturados do sistema';
+COMMENT ON TABLE system_logs IS 'Logs estruturados do sistema, particionados por mês de created_at';
 COMMENT ON COLUMN system_logs.level IS 'Nível: DEBUG, INFO, WARNING, ERROR, CRITICAL';
 COMMENT ON COLUMN system_logs.details IS 'Detalhes adicionais em formato JSON';
 
@@ -0,0 +1,108 @@
+"""Tests for the offline batch API client."""
+
+import json
+
+import httpx
+import pytest
+
+from app.integrations.llm_providers.batch_client import BatchClient
+
+
+def _stand_in_batch_server():
+    """Build a minimal OpenAI Batch-compatible stand-in server."""
+    state = {"input": None, "polls": 0}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        if request.method == "POST" and path.endswith("/files"):
+            body = request.content.decode()
+            state["input"] = [
+                json.loads(line) for line in body.splitlines() if line.startswith("{")
+            ]
+            return httpx.Response(200, json={"id": "file-in"})
+        if request.method == "POST" and path.endswith("/batches"):
+            return httpx.Response(200, json={"id": "batch-1", "status": "validating"})
+        if request.method == "GET" and path.endswith("/batches/batch-1"):
+            state["polls"] += 1
+            status = "completed" if state["polls"] > 1 else "in_progress"
+            return httpx.Response(
+                200,
+                json={
+                    "id": "batch-1",
+                    "status": status,
+                    "output_file_id": "file-out",
+                    "error_file_id": "file-err",
+                },
+            )
+        if request.method == "GET" and path.endswith("/files/file-err/content"):
+            # Requests the provider rejected only appear in the error file
+            rejected = {
+                "custom_id": "seg-rejected",
+                "response": {
+                    "status_code": 400,
+                    "body": {"error": {"message": "context length exceeded"}},
+                },
+                "error": None,
+            }
+            return httpx.Response(200, text=json.dumps(rejected) + "\n")
+        if request.method == "GET" and path.endswith("/files/file-out/content"):
+            lines = []
+            for line in state["input"]:
+                if line["custom_id"] == "seg-rejected":
+                    continue
+                if line["custom_id"] == "seg-bad":
+                    lines.append({"custom_id": "seg-bad", "response": None, "error": {"message": "boom"}})
+                    continue
+                content = json.dumps({"instruction": "Q", "ideal_response": "A"})
+                body = {
+                    "model": "gpt-4o-mini",
+                    "choices": [{"message": {"content": content}}],
+                    "usage": {"prompt_tokens": 12, "completion_tokens": 5},
+                }
+                lines.append(
+                    {
+                        "custom_id": line["custom_id"],
+                        "response": {"status_code": 200, "body": body},
+                        "error": None,
+                    }
+                )
+            text = "\n".join(json.dumps(line) for line in lines)
+            return httpx.Response(200, text=text + '\n{"custom_id": "seg-trunc')
+        return httpx.Response(404)
+
+    return httpx.MockTransport(handler), state
+
+
+@pytest.mark.asyncio
+async def test_batch_round_trip():
+    """Test submitting, polling and reading back a batch job."""
+    transport, state = _stand_in_batch_server()
+    client = BatchClient("OpenAI", "http://stand-in/v1", "key", transport=transport)
+
+    requests = [
+        {"custom_id": "seg-1", "system_prompt": "sys", "user_prompt": "one"},
+        {"custom_id": "seg-bad", "system_prompt": "sys", "user_prompt": "two"},
+        {"custom_id": "seg-rejected", "system_prompt": "sys", "user_prompt": "three"},
+    ]
+    batch_id = await client.submit(requests, model="gpt-4o-mini")
+    batch = await client.wait(batch_id, poll_interval=0, timeout=5)
+    results, errors = await client.fetch_results(batch)
+
+    assert state["input"][0]["body"]["response_format"] == {"type": "json_object"}
+    assert list(results) == ["seg-1"]
+    assert results["seg-1"]["response"] == {"instruction": "Q", "ideal_response": "A"}
+    assert results["seg-1"]["usage"]["total_tokens"] == 17
+    assert errors["seg-bad"] == "boom"
+    assert errors["seg-rejected"] == "context length exceeded"
+    # A malformed line is reported by position and does not abort the ingest
+    assert "file-out:3" in errors
+    assert len(errors) == 3
+
+
+def test_duplicate_custom_ids_are_rejected():
+    """Test that requests sharing a custom_id cannot be submitted."""
+    client = BatchClient("OpenAI", "http://stand-in/v1", "key")
+    request = {"custom_id": "seg-1", "system_prompt": "sys", "user_prompt": "one"}
+
+    with pytest.raises(ValueError):
+        client.build_jsonl([request, dict(request)], model="gpt-4o-mini")
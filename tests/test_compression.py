@@ -0,0 +1,85 @@
+"""Tests for response compression."""
+
+import gzip
+import zlib
+
+import brotli
+import pytest
+from starlette.datastructures import Headers
+
+from app.core.compression import CompressionMiddleware
+
+BODY = b'{"content": "' + b"lorem ipsum " * 500 + b'"}'
+
+
+async def _call(app, accept_encoding):
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": "/api/v1/segments",
+        "headers": [(b"accept-encoding", accept_encoding.encode("latin-1"))],
+    }
+    await CompressionMiddleware(app, minimum_size=1024)(scope, receive, send)
+    return Headers(raw=messages[0]["headers"]), [m.get("body", b"") for m in messages[1:]]
+
+
+def _json_app(body):
+    async def app(scope, receive, send):
+        headers = [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+        ]
+        await send({"type": "http.response.start", "status": 200, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
+
+    return app
+
+
+@pytest.mark.asyncio
+async def test_large_json_is_compressed_with_the_preferred_encoding():
+    """Test that brotli is preferred, gzip is the fallback and small bodies pass through."""
+    headers, chunks = await _call(_json_app(BODY), "gzip, deflate, br")
+    assert headers["content-encoding"] == "br"
+    assert headers["vary"] == "Accept-Encoding"
+    assert int(headers["content-length"]) == len(chunks[0]) < len(BODY)
+    assert brotli.decompress(chunks[0]) == BODY
+
+    headers, chunks = await _call(_json_app(BODY), "gzip, br;q=0")
+    assert headers["content-encoding"] == "gzip"
+    assert gzip.decompress(chunks[0]) == BODY
+
+    headers, chunks = await _call(_json_app(b"[]"), "gzip, br")
+    assert "content-encoding" not in headers
+    assert headers["vary"] == "Accept-Encoding"
+    assert chunks == [b"[]"]
+
+
+@pytest.mark.asyncio
+async def test_streamed_ndjson_is_flushed_chunk_by_chunk():
+    """Test that each streamed chunk can be decoded as soon as it arrives."""
+    lines = [b'{"position": %d}\n' % index for index in range(3)]
+
+    async def app(scope, receive, send):
+        headers = [(b"content-type", b"application/x-ndjson")]
+        await send({"type": "http.response.start", "status": 200, "headers": headers})
+        for line in lines:
+            await send({"type": "http.response.body", "body": line, "more_body": True})
+        await send({"type": "http.response.body", "body": b""})
+
+    headers, chunks = await _call(app, "gzip")
+    assert headers["content-encoding"] == "gzip"
+    assert "content-length" not in headers
+
+    decoder = zlib.decompressobj(31)
+    for line, chunk in zip(lines, chunks):
+        assert decoder.decompress(chunk) == line
+    assert decoder.decompress(chunks[-1]) == b""
+    assert decoder.eof
@@ -0,0 +1,66 @@
+"""Tests for the deterministic fake LLM provider."""
+
+import pytest
+
+from app.core.exceptions import ExternalServiceError
+from app.integrations.llm_providers.base import LLMProvider
+from app.integrations.llm_providers.factory import get_provider
+from app.integrations.llm_providers.fake_provider import FakeProvider
+
+
+@pytest.mark.asyncio
+async def test_fake_provider_is_deterministic_per_prompt():
+    """Test that outputs depend only on the prompt, and usage is recorded."""
+    first = FakeProvider(seed=1, latency_ms=0)
+    second = FakeProvider(seed=2, latency_ms=0)
+    system_prompt = "You write training examples."
+
+    response = await first.generate_json(system_prompt, "segment one", model="fake-model")
+
+    assert response == await second.generate_json(system_prompt, "segment one", model="fake-model")
+    assert response != await first.generate_json(system_prompt, "segment two", model="fake-model")
+    assert set(response) == {"instruction", "input", "ideal_response", "bad_response", "explanation"}
+    assert first.last_usage["provider"] == "fake"
+    assert first.last_usage["cached_tokens"] > 0  # system prompt seen on the first call
+    assert isinstance(get_provider("fake"), FakeProvider)
+
+
+@pytest.mark.asyncio
+async def test_fake_provider_answers_multi_item_prompts():
+    """Test that multi-item prompts get examples for every numbered segment."""
+    provider = FakeProvider(latency_ms=0)
+
+    response = await provider.generate_json(
+        "Generate 2 distinct training example(s) for each numbered segment",
+        "[Segment 1]\nfirst\n\n[Segment 2]\nsecond",
+    )
+
+    assert [item["segment"] for item in response["items"]] == [1, 1, 2, 2]
+
+
+@pytest.mark.asyncio
+async def test_fake_provider_injects_rate_limits():
+    """Test that injected failures look like provider rate limits."""
+    provider = FakeProvider(latency_ms=0, rate_limit_rate=1.0)
+
+    with pytest.raises(ExternalServiceError, match="429"):
+        await provider.generate_json("sys", "user")
+
+
+class _BufferedFakeProvider(FakeProvider):
+    """Fake provider without native streaming (yields the full completion once)."""
+
+    stream_generate = LLMProvider.stream_generate
+
+
+@pytest.mark.parametrize("provider_class", [FakeProvider, _BufferedFakeProvider])
+@pytest.mark.asyncio
+async def test_streamed_json_keeps_usage_recorded_by_the_stream(provider_class):
+    """Test that usage recorded during a stream is not replaced by an estimate."""
+    provider = provider_class(latency_ms=0, completion_tokens=500)
+
+    response = await provider.generate_json_stream("system", "segment one", model="fake-model")
+
+    assert response["instruction"]
+    assert provider.last_usage["estimated"] is False
+    assert provider.last_usage["completion_tokens"] == 500
@@ -0,0 +1,47 @@
+"""Tests for the Gemini provider."""
+
+from types import SimpleNamespace
+
+import pytest
+
+from app.integrations.llm_providers import gemini_provider as gemini_module
+from app.integrations.llm_providers.gemini_provider import GeminiProvider
+
+
+def _chunk(text, usage=None):
+    return SimpleNamespace(parts=[text] if text else [], text=text, usage_metadata=usage)
+
+
+class _StreamingModel:
+    """Stand-in for ``genai.GenerativeModel`` streaming fixed chunks."""
+
+    def __init__(self, model):
+        self.model = model
+
+    async def generate_content_async(self, prompt, generation_config, stream):
+        async def chunks():
+            yield _chunk('{"instruction": "Q", ')
+            yield _chunk('"ideal_response": "A"}')
+            # Final chunk: no text, cumulative usage
+            yield _chunk(
+                "",
+                SimpleNamespace(
+                    prompt_token_count=30, candidates_token_count=9, cached_content_token_count=0
+                ),
+            )
+
+        return chunks()
+
+
+@pytest.mark.asyncio
+async def test_stream_records_usage_metadata_of_the_last_chunk(monkeypatch):
+    """Test that streamed Gemini generations report real token counts."""
+    monkeypatch.setattr(gemini_module.genai, "GenerativeModel", _StreamingModel)
+    provider = GeminiProvider()
+
+    result = await provider.generate_json_stream("sys", "user", model="gemini-pro")
+
+    assert result == {"instruction": "Q", "ideal_response": "A"}
+    assert provider.last_usage["prompt_tokens"] == 30
+    assert provider.last_usage["completion_tokens"] == 9
+    assert provider.last_usage["estimated"] is False
@@ -0,0 +1,39 @@
+"""Tests for incremental JSON validation of streamed completions."""
+
+import pytest
+
+from app.integrations.llm_providers.json_parsing import IncrementalJSONValidator, MalformedJSONStreamError
+
+
+def _feed_all(validator: IncrementalJSONValidator, chunks: list[str]) -> None:
+    for chunk in chunks:
+        validator.feed(chunk)
+
+
+def test_validator_accepts_fenced_json_split_across_chunks():
+    """Test that valid JSON completes across arbitrary chunk boundaries."""
+    validator = IncrementalJSONValidator(allowed_keys={"instruction", "ideal_response"})
+
+    _feed_all(validator, ["```json\n{\"instr", "uction\": \"a {b} \\\"c\\\"\", ", "\"ideal_response\": [1, true]}"])
+
+    assert validator.complete
+
+
+@pytest.mark.parametrize(
+    "chunks,reason",
+    [
+        (["Sure! Here is", " the JSON"], "leading_text"),
+        (["{\"instruction\": \"x\"]"], "mismatched_bracket"),
+        (["{\"unexpected\": 1}"], "unexpected_key"),
+        (["{\"instruction\": \"line\nbreak\"}"], "control_character"),
+        (["{\"instruction\": \"", "x" * 50], "budget_exceeded"),
+    ],
+)
+def test_validator_aborts_early(chunks, reason):
+    """Test that malformed or over-budget output is rejected before completion."""
+    validator = IncrementalJSONValidator(max_chars=40, allowed_keys={"instruction"})
+
+    with pytest.raises(MalformedJSONStreamError) as exc_info:
+        _feed_all(validator, chunks)
+
+    assert exc_info.value.reason == reason
@@ -0,0 +1,76 @@
+"""Tests for the queue-backed log sink."""
+
+import io
+import json
+import threading
+import weakref
+
+from app.core.log_sink import _STOP, QueueLogSink
+
+
+class _BlockingStream(io.StringIO):
+    """Stream whose first write waits until released."""
+
+    def __init__(self):
+        super().__init__()
+        self.release = threading.Event()
+        self.writes = 0
+
+    def write(self, data):
+        self.writes += 1
+        self.release.wait(5)
+        return super().write(data)
+
+
+def test_sink_batches_lines_and_flushes_on_close():
+    """Test that queued str and bytes lines are written in order on close."""
+    stream = io.StringIO()
+    sink = QueueLogSink(stream=stream, batch_size=100)
+
+    for i in range(50):
+        sink.write(f"line {i}" if i % 2 else f"line {i}".encode("utf-8"))
+    sink.close()
+
+    assert stream.getvalue().splitlines() == [f"line {i}" for i in range(50)]
+    assert sink.stats()["written"] == 50
+    assert sink.stats()["dropped"] == 0
+
+
+def test_sink_drops_without_blocking_when_full():
+    """Test that a full queue drops lines, counts them and reports the drops."""
+    stream = _BlockingStream()
+    sink = QueueLogSink(stream=stream, max_queue_size=5, batch_size=1)
+
+    # The writer thread blocks on its first line, so the queue fills up
+    for i in range(20):
+        sink.write(f"line {i}")
+    dropped = sink.stats()["dropped"]
+    assert dropped >= 20 - 5 - 1
+
+    stream.release.set()
+    sink.close()
+
+    lines = stream.getvalue().splitlines()
+    notices = [json.loads(line) for line in lines if line.startswith("{")]
+    assert sum(notice["dropped"] for notice in notices) == dropped
+    assert len(lines) - len(notices) == 20 - dropped
+
+
+def test_closed_sinks_are_not_restarted_after_fork():
+    """Test that the fork hook only restarts the writer of open sinks."""
+    open_sink = QueueLogSink(stream=io.StringIO())
+    closed_sink = QueueLogSink(stream=io.StringIO())
+    closed_sink.close()
+    open_thread, open_queue = open_sink._thread, open_sink._queue
+
+    QueueLogSink._restart_in_child(weakref.ref(open_sink))
+    QueueLogSink._restart_in_child(weakref.ref(closed_sink))
+
+    assert open_sink._thread is not open_thread
+    assert open_sink._thread.is_alive()
+    assert not closed_sink._thread.is_alive()
+    # Without a real fork the previous writer is still running: stop both
+    open_queue.put(_STOP)
+    open_sink.close()
+    open_thread.join(1)
+    assert not open_thread.is_alive()
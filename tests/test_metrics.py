@@ -0,0 +1,42 @@
+"""Tests for request metrics."""
+
+import pytest
+from prometheus_client import REGISTRY
+
+from app.core.metrics import MetricsMiddleware
+
+
+class _Route:
+    path = "/api/v1/datasets/{dataset_id}"
+
+
+@pytest.mark.asyncio
+async def test_requests_are_labelled_by_route_template():
+    """Test that latency is recorded per route template, never per raw path."""
+
+    async def app(scope, receive, send):
+        if scope["path"].startswith("/api/v1/datasets/"):
+            scope["route"] = _Route()
+            status = 200
+        else:
+            status = 404
+        await send({"type": "http.response.start", "status": status, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    def count(route, status):
+        labels = {"method": "GET", "route": route, "status": status}
+        return REGISTRY.get_sample_value("vrforge_http_request_duration_seconds_count", labels) or 0
+
+    before = count(_Route.path, "200"), count("unmatched", "404")
+    middleware = MetricsMiddleware(app)
+    for path in ("/api/v1/datasets/1", "/api/v1/datasets/2", "/no/such/path"):
+        await middleware({"type": "http", "method": "GET", "path": path}, receive, send)
+
+    assert count(_Route.path, "200") - before[0] == 2
+    assert count("unmatched", "404") - before[1] == 1
@@ -0,0 +1,116 @@
+"""Tests for the request logging and read-your-writes middlewares."""
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.responses import ORJSONResponse
+from httpx import ASGITransport, AsyncClient
+
+from app.api.deps import get_db_session
+from app.core.middleware import (
+    PRIMARY_STICKY_COOKIE,
+    ReadYourWritesMiddleware,
+    RequestLoggingMiddleware,
+)
+
+
+async def _streaming_app(scope, receive, send):
+    """ASGI app echoing the request body after three streamed chunks."""
+    message = await receive()
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    for _ in range(3):
+        await send({"type": "http.response.body", "body": b"chunk", "more_body": True})
+    await send({"type": "http.response.body", "body": message["body"]})
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("detail_level", ["minimal", "standard", "verbose"])
+async def test_streaming_passthrough_with_request_id(detail_level):
+    """Test that streamed chunks pass untouched and a request ID header is added."""
+    middleware = RequestLoggingMiddleware(
+        _streaming_app, log_request_body=True, detail_level=detail_level
+    )
+    scope = {
+        "type": "http",
+        "method": "POST",
+        "scheme": "http",
+        "path": "/items",
+        "query_string": b"limit=10",
+        "headers": [(b"host", b"testserver"), (b"authorization", b"Bearer secret")],
+        "client": ("127.0.0.1", 1234),
+    }
+    sent = []
+
+    async def receive():
+        return {"type": "http.request", "body": b'{"name": "x"}', "more_body": False}
+
+    async def send(message):
+        sent.append(message)
+
+    await middleware(scope, receive, send)
+
+    assert [m.get("body") for m in sent[1:]] == [b"chunk", b"chunk", b"chunk", b'{"name": "x"}']
+    assert [m.get("more_body", False) for m in sent[1:]] == [True, True, True, False]
+    header_names = [name for name, _ in sent[0]["headers"]]
+    assert header_names == [b"x-request-id"]
+
+
+@pytest.mark.asyncio
+async def test_sampled_paths_log_only_errors(monkeypatch):
+    """Test that sampled paths skip success logs but always log errors."""
+    from app.core import middleware as middleware_module
+
+    events = []
+
+    class _Recorder:
+        def __getattr__(self, level):
+            return lambda event, **fields: events.append((level, event, fields))
+
+    monkeypatch.setattr(middleware_module, "logger", _Recorder())
+    monkeypatch.setattr(middleware_module.settings, "LOG_SAMPLE_RATES", {"/health": 0.0})
+
+    def app_with_status(status):
+        async def app(scope, receive, send):
+            await send({"type": "http.response.start", "status": status, "headers": []})
+            await send({"type": "http.response.body", "body": b""})
+
+        return app
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    for status in (200, 503):
+        middleware = RequestLoggingMiddleware(app_with_status(status), detail_level="minimal")
+        scope = {"type": "http", "method": "GET", "path": "/health", "headers": []}
+        await middleware(scope, receive, send)
+
+    assert [(level, event) for level, event, _ in events] == [("error", "Request completed")]
+    assert events[0][2]["status_code"] == 503
+
+
+@pytest.mark.asyncio
+async def test_write_routes_returning_a_response_still_get_the_sticky_cookie(monkeypatch):
+    """Test that the read-your-writes cookie survives routes returning a Response object."""
+    from app.api import deps
+
+    monkeypatch.setattr(
+        deps.settings, "DATABASE_READ_REPLICA_URL", "postgresql+asyncpg://replica/db"
+    )
+    app = FastAPI()
+
+    @app.api_route("/items", methods=["GET", "POST"])
+    async def items(db=Depends(get_db_session)):
+        return ORJSONResponse({"ok": True})
+
+    app.add_middleware(ReadYourWritesMiddleware)
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        write = await client.post("/items")
+        read = await client.get("/items")
+
+    assert write.json() == {"ok": True}
+    cookie = write.headers["set-cookie"]
+    assert cookie.startswith(f"{PRIMARY_STICKY_COOKIE}=")
+    assert "HttpOnly" in cookie and "Max-Age=" in cookie
+    assert "set-cookie" not in read.headers
@@ -0,0 +1,75 @@
+"""Tests for monthly partition naming and retention."""
+
+from datetime import date
+
+import pytest
+
+from app.db.partitions import (
+    add_months,
+    ensure_partitions,
+    expired_partitions,
+    partition_month,
+    partition_name,
+)
+
+
+def test_partition_names_round_trip_across_years():
+    """Test that partition names encode their month, also across a year boundary."""
+    month = add_months(date(2026, 11, 1), 2)
+
+    assert month == date(2027, 1, 1)
+    assert partition_name("system_logs", month) == "system_logs_p2027_01"
+    assert partition_month("system_logs", "system_logs_p2027_01") == month
+    assert partition_month("system_logs", "system_logs_unpartitioned") is None
+
+
+def test_only_fully_expired_months_are_dropped():
+    """Test that a partition is dropped only once its whole month left the retention period."""
+    names = ["system_logs_p2026_08", "system_logs_p2026_06", "system_logs_p2026_07", "other"]
+
+    expired = expired_partitions("system_logs", names, retention_days=90, today=date(2026, 10, 19))
+
+    # Cutoff is 2026-07-21: July still holds rows inside the retention period
+    assert expired == ["system_logs_p2026_06"]
+
+
+class _Result:
+    def __init__(self, value):
+        self.value = value
+
+    def scalars(self):
+        return iter(self.value)
+
+    def scalar(self):
+        return self.value
+
+
+class _RecordingConnection:
+    """Connection stub with one existing month and rows stranded in the default partition."""
+
+    def __init__(self):
+        self.statements = []
+
+    async def execute(self, statement, params=None):
+        sql = str(statement)
+        self.statements.append(sql)
+        if "pg_inherits" in sql:
+            return _Result(["system_logs_p2026_10", "system_logs_default"])
+        if "count(*)" in sql:
+            return _Result(3 if params["start"].month == 11 else 0)
+        return _Result(None)
+
+
+@pytest.mark.asyncio
+async def test_rows_in_the_default_partition_are_moved_into_the_new_month():
+    """Test that a month with stranded default rows is built detached and then attached."""
+    conn = _RecordingConnection()
+
+    created = await ensure_partitions(conn, "system_logs", months_ahead=2, today=date(2026, 10, 19))
+
+    assert created == ["system_logs_p2026_11", "system_logs_p2026_12"]
+    ddl = [sql for sql in conn.statements if "pg_inherits" not in sql and "count(*)" not in sql]
+    assert ddl[0].startswith("CREATE TABLE system_logs_p2026_11 (LIKE system_logs")
+    assert "DELETE FROM system_logs_default" in ddl[1]
+    assert ddl[2].startswith("ALTER TABLE system_logs ATTACH PARTITION system_logs_p2026_11")
+    assert ddl[3].startswith("CREATE TABLE IF NOT EXISTS system_logs_p2026_12 PARTITION OF")
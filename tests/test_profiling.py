@@ -0,0 +1,68 @@
+"""Tests for on-demand profiling."""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from app.core.profiling import StackSampler, dump_tasks
+
+
+def _spin(seconds: float) -> None:
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+@pytest.mark.asyncio
+async def test_request_sampler_only_counts_its_own_task():
+    """Test that a task-bound sampler ignores other tasks on the same loop."""
+
+    async def other_request():
+        await asyncio.sleep(0.02)
+        _spin(0.2)
+
+    async def profiled_request():
+        _spin(0.2)
+        await asyncio.sleep(0.05)
+
+    other = asyncio.create_task(other_request())
+    sampler = StackSampler(
+        threading.get_ident(),
+        0.005,
+        task=asyncio.current_task(),
+        loop=asyncio.get_running_loop(),
+    )
+    sampler.start()
+    await profiled_request()
+    profile = sampler.stop()
+    await other
+
+    assert sampler.samples > 0
+    assert "profiled_request" in profile
+    assert "other_request" not in profile
+    for line in profile.splitlines():
+        stack, count = line.rsplit(" ", 1)
+        assert int(count) > 0
+
+
+@pytest.mark.asyncio
+async def test_task_dump_folds_identical_tasks():
+    """Test that tasks waiting at the same point are counted together."""
+
+    async def waiter():
+        await asyncio.sleep(10)
+
+    tasks = [asyncio.create_task(waiter()) for _ in range(3)]
+    await asyncio.sleep(0)
+    try:
+        dump = dump_tasks()
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    line = next(line for line in dump.splitlines() if "waiter" in line)
+    assert line.startswith("task;")
+    assert line.endswith(" 3")
@@ -0,0 +1,58 @@
+"""Tests for compiled prompt templates."""
+
+import pytest
+
+from app.core.exceptions import ValidationError
+from app.services.prompt_template import (
+    compile_template,
+    get_compiled_template,
+    render_few_shot_examples,
+)
+
+
+def test_format_style_template_keeps_escaped_braces():
+    """Test that str.format-style templates keep their meaning."""
+    compiled = compile_template('Content: {content}\nReturn {{"instruction": "..."}}')
+
+    assert compiled.render("hello") == 'Content: hello\nReturn {"instruction": "..."}'
+
+
+def test_json_braces_are_literal():
+    """Test that unescaped JSON braces do not break rendering."""
+    compiled = compile_template(
+        'Domain {domain} / {use_case}\n{content}\nFormat: {"items": [{"segment": 1}]}\n{metadata.page}'
+    )
+
+    rendered = compiled.render(
+        "text", context={"domain": "Legal", "use_case": None}, metadata={"page": 3}
+    )
+
+    assert rendered == 'Domain Legal / \ntext\nFormat: {"items": [{"segment": 1}]}\n3'
+    assert compiled.uses_segment_metadata
+
+
+def test_invalid_templates_are_rejected():
+    """Test validation of unknown variables and a missing content placeholder."""
+    with pytest.raises(ValidationError):
+        compile_template("Use {contnet}")
+    with pytest.raises(ValidationError):
+        compile_template("No placeholder here")
+
+
+def test_compiled_templates_are_cached_per_version():
+    """Test that compilation is cached per template id and version."""
+    first = get_compiled_template("template-1", None, "{content}")
+
+    assert get_compiled_template("template-1", None, "{content}") is first
+    assert get_compiled_template("template-2", None, "{content}") is not first
+
+
+def test_segment_content_last_and_few_shot_block():
+    """Test prefix-cache layout detection and few-shot rendering."""
+    assert compile_template("Domain {domain}. Instructions.\n\n{content}").segment_content_last
+    assert not compile_template("{content}\n\nNow generate an example.").segment_content_last
+
+    block = render_few_shot_examples([{"instruction": "Q", "ideal_response": "A"}])
+
+    assert block.endswith('Example 1:\n{"ideal_response": "A", "instruction": "Q"}')
+    assert render_few_shot_examples(None) == ""
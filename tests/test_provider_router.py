@@ -0,0 +1,86 @@
+"""Tests for multi-provider routing."""
+
+import asyncio
+import random
+
+import pytest
+
+from app.core.exceptions import ExternalServiceError
+from app.integrations.llm_providers.base import LLMProvider
+from app.integrations.llm_providers.router import ProviderRoute, ProviderRouter
+
+
+class _StubProvider:
+    """Provider stub returning a fixed response or raising."""
+
+    def __init__(self, error: Exception = None):
+        self.error = error
+        self.calls = 0
+
+    async def generate_json(self, system_prompt, user_prompt, model, temperature=0.7):
+        self.calls += 1
+        if self.error:
+            raise self.error
+        return {"instruction": "Q", "ideal_response": "A"}
+
+
+@pytest.mark.asyncio
+async def test_router_fails_over_and_cools_down_failing_route():
+    """Test that a failing route is failed over and then skipped."""
+    failing = _StubProvider(error=ExternalServiceError("OpenAI", "429 rate limit"))
+    healthy = _StubProvider()
+    router = ProviderRouter(
+        [
+            ProviderRoute("openai", "gpt-4o-mini", weight=1000, provider=failing),
+            ProviderRoute("together", "llama", weight=1, provider=healthy),
+        ],
+        rng=random.Random(0),
+    )
+
+    _, first_route, _ = await router.generate_json("sys", "user")
+    _, second_route, usage = await router.generate_json("sys", "user")
+
+    assert first_route.provider_name == "together"
+    assert second_route.provider_name == "together"
+    assert failing.calls == 1
+    assert healthy.calls == 2
+    assert usage["provider"] == "together"
+
+
+@pytest.mark.asyncio
+async def test_router_respects_quota():
+    """Test that exhausted routes are not used."""
+    router = ProviderRouter([ProviderRoute("openai", "gpt-4o-mini", max_requests=1, provider=_StubProvider())])
+
+    await router.generate_json("sys", "user")
+    with pytest.raises(ExternalServiceError):
+        await router.generate_json("sys", "user")
+
+
+class _SlowUsageProvider(LLMProvider):
+    """Provider recording usage before a per-prompt delay, so concurrent calls interleave."""
+
+    name = "Stub"
+
+    async def generate(self, system_prompt, user_prompt, model, temperature=0.7, max_tokens=2000):
+        raise NotImplementedError
+
+    async def generate_json(self, system_prompt, user_prompt, model, temperature=0.7):
+        self._record_usage(model, 1.0, prompt_tokens=len(user_prompt), completion_tokens=1)
+        await asyncio.sleep(0.02 if user_prompt == "slow" else 0)
+        return {"prompt": user_prompt}
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_on_a_shared_provider_get_their_own_usage():
+    """Test that usage is tracked per call, not read back off the shared provider."""
+    router = ProviderRouter([ProviderRoute("openai", "gpt-4o-mini", provider=_SlowUsageProvider())])
+
+    results = await asyncio.gather(
+        router.generate_json("sys", "slow"), router.generate_json("sys", "quick!")
+    )
+
+    assert [(response["prompt"], usage["prompt_tokens"]) for response, _, usage in results] == [
+        ("slow", 4),
+        ("quick!", 6),
+    ]
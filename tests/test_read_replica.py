@@ -0,0 +1,54 @@
+"""Tests for read-replica routing."""
+
+import pytest
+
+from app.db.session import ReplicaLagMonitor
+
+
+class _StubMonitor(ReplicaLagMonitor):
+    """Lag monitor reporting a scripted sequence of lags."""
+
+    def __init__(self, lags, **kwargs):
+        super().__init__(replica_engine=None, **kwargs)
+        self.lags = list(lags)
+        self.checks = 0
+
+    async def _measure_lag(self) -> float:
+        self.checks += 1
+        lag = self.lags.pop(0)
+        if isinstance(lag, Exception):
+            raise lag
+        return lag
+
+
+@pytest.mark.asyncio
+async def test_replica_skipped_while_lagging_or_unreachable():
+    """Test that reads fall back to the primary on high lag or failed checks."""
+    monitor = _StubMonitor(
+        [0.5, 30.0, ConnectionError("replica down"), 1.0],
+        max_lag_seconds=5.0,
+        check_interval_seconds=0.0,
+        check_timeout_seconds=1.0,
+    )
+
+    assert await monitor.is_usable() is True
+    assert await monitor.is_usable() is False
+    assert monitor.lag_seconds == 30.0
+    assert await monitor.is_usable() is False
+    assert monitor.lag_seconds is None
+    assert await monitor.is_usable() is True
+
+
+@pytest.mark.asyncio
+async def test_replica_lag_check_is_cached():
+    """Test that the lag is measured at most once per check interval."""
+    monitor = _StubMonitor(
+        [0.1, 0.1],
+        max_lag_seconds=5.0,
+        check_interval_seconds=60.0,
+        check_timeout_seconds=1.0,
+    )
+
+    for _ in range(5):
+        assert await monitor.is_usable() is True
+    assert monitor.checks == 1
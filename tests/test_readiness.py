@@ -0,0 +1,32 @@
+"""Tests for the readiness checker."""
+
+import asyncio
+
+import pytest
+
+from app.core.readiness import ReadinessChecker
+
+
+@pytest.mark.asyncio
+async def test_slow_critical_dependency_makes_node_unready_and_result_is_cached():
+    """Test that a timed-out critical probe fails readiness and results are reused."""
+    checker = ReadinessChecker(timeout_seconds=0.05, cache_seconds=60)
+    calls = {"database": 0, "s3": 0}
+
+    async def database(engine):
+        calls["database"] += 1
+
+    async def slow_s3():
+        calls["s3"] += 1
+        await asyncio.sleep(1)
+
+    checker._probe_database = database
+    checker._probe_s3 = slow_s3
+
+    results = await asyncio.gather(*(checker.check() for _ in range(5)))
+
+    assert results[0]["status"] == "unready"
+    assert results[0]["checks"]["database"]["status"] == "ok"
+    assert results[0]["checks"]["s3"]["error"].startswith("Timed out")
+    assert all(result is results[0] for result in results)
+    assert calls == {"database": 1, "s3": 1}
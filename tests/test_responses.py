@@ -0,0 +1,90 @@
+"""Tests for fast list responses and conditional GETs."""
+
+import json
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+from fastapi import Request
+
+from app.api.responses import NDJSON_MEDIA_TYPE, detail_response, list_response
+from app.schemas.segment import SegmentResponse
+
+
+def _segments(count):
+    return [
+        SimpleNamespace(
+            id=f"segment-{index}",
+            domain_id="domain-1",
+            document_id=None,
+            document_version_id=None,
+            use_case=None,
+            segment_type="paragraph",
+            content=f"text {index}",
+            position=index,
+            meta_data={"page": index},
+            created_at=datetime(2024, 1, 1, tzinfo=timezone.utc),
+        )
+        for index in range(count)
+    ]
+
+
+def _request(accept):
+    return Request({"type": "http", "headers": [(b"accept", accept.encode("latin-1"))]})
+
+
+def _get(path, **headers):
+    raw = [(name.encode("latin-1"), value.encode("latin-1")) for name, value in headers.items()]
+    return Request(
+        {"type": "http", "method": "GET", "path": path, "query_string": b"", "headers": raw}
+    )
+
+
+def test_list_response_renders_validated_rows_as_json_array():
+    """Test that ORM-like rows are validated once and rendered with orjson."""
+    response = list_response(_request("application/json"), SegmentResponse, _segments(2))
+
+    assert response.media_type == "application/json"
+    body = json.loads(response.body)
+    assert [item["id"] for item in body] == ["segment-0", "segment-1"]
+    assert body[1]["meta_data"] == {"page": 1}
+    assert body[0]["created_at"] == "2024-01-01T00:00:00+00:00"
+
+
+@pytest.mark.asyncio
+async def test_list_response_streams_ndjson_when_asked():
+    """Test that ``Accept: application/x-ndjson`` streams one object per line."""
+    response = list_response(_request(NDJSON_MEDIA_TYPE), SegmentResponse, _segments(3))
+
+    body = b"".join([chunk async for chunk in response.body_iterator])
+    lines = body.decode().splitlines()
+    assert response.media_type == NDJSON_MEDIA_TYPE
+    assert [json.loads(line)["position"] for line in lines] == [0, 1, 2]
+
+
+def test_detail_response_answers_conditional_requests_with_304():
+    """Test that a client revalidating with the ETag or date gets a 304."""
+    segment = _segments(1)[0]
+    response = detail_response(_get("/api/v1/segments/segment-0"), SegmentResponse, segment)
+    etag = response.headers["etag"]
+    assert response.status_code == 200
+    assert etag.startswith('W/"')
+    assert response.headers["last-modified"] == "Mon, 01 Jan 2024 00:00:00 GMT"
+
+    for headers in (
+        {"if-none-match": etag},
+        {"if-modified-since": response.headers["last-modified"]},
+    ):
+        cached = detail_response(
+            _get("/api/v1/segments/segment-0", **headers), SegmentResponse, segment
+        )
+        assert cached.status_code == 304
+        assert cached.headers["etag"] == etag
+        assert cached.body == b""
+
+    segment.created_at = datetime(2024, 1, 2, tzinfo=timezone.utc)
+    changed = detail_response(
+        _get("/api/v1/segments/segment-0", **{"if-none-match": etag}), SegmentResponse, segment
+    )
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
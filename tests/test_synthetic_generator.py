@@ -0,0 +1,230 @@
+"""Tests for synthetic generator helpers."""
+
+import json
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import httpx
+import pytest
+
+from app.core.exceptions import NotFoundError
+from app.integrations.llm_providers.batch_client import BatchClient
+from app.models.segment import Segment
+from app.services import synthetic_generator as generator_module
+from app.services.synthetic_generator import SyntheticGeneratorService
+
+SEGMENT_ID = "11111111-1111-1111-1111-111111111111"
+DELETED_SEGMENT_ID = "22222222-2222-2222-2222-222222222222"
+
+
+def _segment(segment_id: str, content: str) -> SimpleNamespace:
+    return SimpleNamespace(id=segment_id, content=content)
+
+
+def test_pack_segments_respects_count_and_size():
+    """Test packing small segments into multi-item calls."""
+    batch = [_segment("a", "x" * 10), _segment("b", "x" * 10), _segment("c", "x" * 100), _segment("d", "x")]
+
+    packs = SyntheticGeneratorService._pack_segments(batch, pack_segments=3, pack_max_chars=50)
+
+    assert [[s.id for s in pack] for pack in packs] == [["a", "b"], ["c"], ["d"]]
+
+
+def test_parse_multi_item_response_attributes_and_validates():
+    """Test parsing and attributing examples of a multi-item response."""
+    pack = [_segment("a", "first"), _segment("b", "second")]
+    response = {
+        "items": [
+            {"segment": 2, "instruction": "Q1", "ideal_response": "A1"},
+            {"segment": "1", "instruction": "Q2", "ideal_response": "A2"},
+            {"segment": 3, "instruction": "Q3", "ideal_response": "A3"},
+            {"segment": 1, "instruction": "", "ideal_response": "A4"},
+            "not an object",
+        ]
+    }
+
+    examples, rejected = SyntheticGeneratorService._parse_multi_item_response(response, pack)
+
+    assert [(segment_id, ex["instruction"]) for segment_id, ex in examples] == [("b", "Q1"), ("a", "Q2")]
+    assert rejected == 3
+
+
+def test_parse_multi_item_response_accepts_bare_array_for_single_segment():
+    """Test that examples without a segment number map to a single-segment pack."""
+    pack = [_segment("a", "only")]
+    response = [{"instruction": "Q", "ideal_response": "A"}, {"instruction": "Q2", "ideal_response": "A2"}]
+
+    examples, rejected = SyntheticGeneratorService._parse_multi_item_response(response, pack)
+
+    assert [segment_id for segment_id, _ in examples] == ["a", "a"]
+    assert rejected == 0
+
+
+class _StubSession:
+    """Session stub returning one dataset and its segment IDs, and recording added rows."""
+
+    def __init__(self, dataset, segment_ids=(SEGMENT_ID,), events=None):
+        self.dataset = dataset
+        self.segment_ids = segment_ids
+        self.events = events if events is not None else []
+        self.added = []
+        self.commits = 0
+
+    async def execute(self, query):
+        if getattr(query, "_for_update_arg", None) is not None:
+            self.events.append("lock")
+        if query.column_descriptions[0]["entity"] is Segment:
+            return SimpleNamespace(scalars=lambda: list(self.segment_ids))
+        return SimpleNamespace(scalar_one_or_none=lambda: self.dataset)
+
+    def add_all(self, rows):
+        self.added.extend(rows)
+
+    async def commit(self):
+        self.commits += 1
+
+
+def _offline_dataset(batches):
+    return SimpleNamespace(
+        id="dataset-1",
+        domain_id="domain-1",
+        provider="openai",
+        status="generating",
+        total_items=0,
+        pending_items=0,
+        generation_state={
+            "mode": "offline",
+            "generation_run_id": "run-1",
+            "previous_status": "draft",
+            "submitted_at": datetime.now(timezone.utc).isoformat(),
+            "batches": {batch_id: {"status": "submitted"} for batch_id in batches},
+        },
+    )
+
+
+def _batch_server(statuses, events):
+    def handler(request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        events.append(path)
+        for batch_id, status in statuses.items():
+            if path.endswith(f"/batches/{batch_id}"):
+                return httpx.Response(
+                    200, json={"id": batch_id, "status": status, "output_file_id": "out"}
+                )
+        if path.endswith("/files/out/content"):
+            completions = [
+                (f"{SEGMENT_ID}:0", {"instruction": "Q", "ideal_response": "A"}),
+                (f"{SEGMENT_ID}:1", {"instruction": "Q", "ideal_response": "A"}),
+                (f"{DELETED_SEGMENT_ID}:2", {"instruction": "Q", "ideal_response": "A"}),
+                (f"{SEGMENT_ID}:3", {"instruction": None, "ideal_response": "A"}),
+                (f"{SEGMENT_ID}:4", ["not", "an", "object"]),
+            ]
+            lines = [
+                {
+                    "custom_id": custom_id,
+                    "response": {
+                        "status_code": 200,
+                        "body": {
+                            "model": "gpt-4o-mini",
+                            "choices": [{"message": {"content": json.dumps(completion)}}],
+                            "usage": {"prompt_tokens": 10, "completion_tokens": 5},
+                        },
+                    },
+                }
+                for custom_id, completion in completions
+            ]
+            return httpx.Response(200, text="\n".join(json.dumps(line) for line in lines))
+        return httpx.Response(404)
+
+    return httpx.MockTransport(handler)
+
+
+def _use_batch_server(monkeypatch, statuses):
+    events = []
+    transport = _batch_server(statuses, events)
+    monkeypatch.setattr(
+        generator_module,
+        "get_batch_client",
+        lambda provider: BatchClient("OpenAI", "http://stand-in/v1", "key", transport=transport),
+    )
+    return events
+
+
+@pytest.mark.asyncio
+async def test_ingest_offline_ingests_finished_batches_and_keeps_polling(monkeypatch):
+    """Test that one poll ingests completed jobs and leaves running ones for later.
+
+    Results that are not complete examples or whose segment was deleted
+    since submission are counted as failed.
+    """
+    events = _use_batch_server(monkeypatch, {"batch-1": "completed", "batch-2": "in_progress"})
+    dataset = _offline_dataset(["batch-1", "batch-2"])
+    db = _StubSession(dataset, events=events)
+
+    summary = await SyntheticGeneratorService.ingest_offline(db, "dataset-1")
+
+    assert summary["items_created"] == 2
+    assert summary["batches"]["batch-1"] == {"status": "ingested", "items": 2, "failed": 3}
+    assert summary["batches"]["batch-2"] == {"status": "submitted"}
+    assert dataset.status == "generating"
+    assert dataset.total_items == 2
+    # Repeated segments keep one item per request
+    assert [item.segment_id for item in db.added] == [SEGMENT_ID, SEGMENT_ID]
+    assert all(item.generation_run_id == "run-1" for item in db.added)
+    # The dataset row is only locked once every provider call is done
+    assert events[-1] == "lock"
+    assert events.count("lock") == 1
+
+
+@pytest.mark.asyncio
+async def test_ingest_offline_restores_status_when_every_batch_failed(monkeypatch):
+    """Test that a dataset does not stay generating after its jobs failed."""
+    _use_batch_server(monkeypatch, {"batch-1": "expired"})
+    dataset = _offline_dataset(["batch-1"])
+
+    summary = await SyntheticGeneratorService.ingest_offline(_StubSession(dataset), "dataset-1")
+
+    assert summary["batches"]["batch-1"]["status"] == "failed"
+    assert summary["status"] == dataset.status == "draft"
+    assert dataset.generation_state["batches"]["batch-1"]["status"] == "failed"
+
+
+@pytest.mark.asyncio
+async def test_ingest_offline_leaves_finished_generations_alone(monkeypatch):
+    """Test that polling a finished generation neither calls the provider nor changes status."""
+    events = _use_batch_server(monkeypatch, {"batch-1": "expired"})
+    dataset = _offline_dataset(["batch-1"])
+    await SyntheticGeneratorService.ingest_offline(_StubSession(dataset), "dataset-1")
+    dataset.status = "archived"
+    polls = len(events)
+
+    summary = await SyntheticGeneratorService.ingest_offline(_StubSession(dataset), "dataset-1")
+
+    assert len(events) == polls
+    assert summary["items_created"] == 0
+    assert summary["status"] == "archived"
+
+
+class _SegmentSession:
+    """Session stub answering ``Segment.id IN (...)`` queries from known IDs."""
+
+    def __init__(self, known_ids):
+        self.known_ids = known_ids
+
+    async def execute(self, query):
+        (requested,) = query.compile().params.values()
+        rows = [_segment(seg_id, "text") for seg_id in requested if seg_id in self.known_ids]
+        return SimpleNamespace(scalars=lambda: [row.id for row in rows])
+
+
+@pytest.mark.asyncio
+async def test_segment_ids_past_max_items_are_still_validated():
+    """Test that an unknown ID is rejected even when max_items cuts it off."""
+    db = _SegmentSession({"a", "b"})
+    batches = SyntheticGeneratorService._iter_segment_batches(
+        db, dataset=None, segment_ids=["a", "b", "unknown"], max_items=2, batch_size=10
+    )
+
+    with pytest.raises(NotFoundError) as excinfo:
+        await batches.__anext__()
+    assert excinfo.value.details["missing_ids"] == ["unknown"]
@@ -0,0 +1,49 @@
+"""Tests for the batched system log writer."""
+
+import asyncio
+
+import pytest
+
+from app.core.system_log import SystemLogWriter
+
+
+class _RecordingEngine:
+    """Engine stand-in recording the rows of every bulk insert."""
+
+    def __init__(self):
+        self.batches = []
+
+    def begin(self):
+        engine = self
+
+        class _Connection:
+            async def __aenter__(self):
+                return self
+
+            async def __aexit__(self, *exc):
+                return False
+
+            async def execute(self, statement, rows):
+                engine.batches.append(list(rows))
+
+        return _Connection()
+
+
+@pytest.mark.asyncio
+async def test_full_batch_triggers_flush_and_overflow_is_dropped():
+    """Test that a full batch is flushed early and rows beyond the buffer are counted."""
+    engine = _RecordingEngine()
+    writer = SystemLogWriter(batch_size=3, flush_interval=60, max_buffer=4, engine=engine)
+    writer.start()
+
+    for i in range(3):
+        assert writer.write("info", "tests", f"action-{i}", request_id="req")
+    await asyncio.sleep(0.01)
+    assert [row["action"] for row in engine.batches[0]] == ["action-0", "action-1", "action-2"]
+    assert engine.batches[0][0]["level"] == "INFO"
+
+    results = [writer.write("info", "tests", "overflow") for _ in range(6)]
+    assert results == [True] * 4 + [False] * 2
+
+    await writer.stop()
+    assert writer.stats() == {"pending": 0, "written": 7, "dropped": 2, "failed": 0}
@@ -0,0 +1,82 @@
+"""Tests for the Together AI provider."""
+
+import json
+
+import httpx
+import pytest
+
+from app.integrations.llm_providers.together_provider import TogetherProvider
+from app.services.synthetic_generator import MULTI_ITEM_RESPONSE_KEYS
+
+
+@pytest.mark.asyncio
+async def test_generate_json_parses_fenced_content_and_records_usage():
+    """Test a JSON generation round trip against a stand-in Together server."""
+    sent = {}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        sent["body"] = json.loads(request.content)
+        content = '```json\n{"instruction": "Q", "ideal_response": "A"}\n```'
+        return httpx.Response(
+            200,
+            json={
+                "choices": [{"message": {"content": content}}],
+                "usage": {"prompt_tokens": 20, "completion_tokens": 7},
+            },
+        )
+
+    provider = TogetherProvider(transport=httpx.MockTransport(handler))
+    result = await provider.generate_json("sys", "user", model="llama")
+
+    assert result == {"instruction": "Q", "ideal_response": "A"}
+    assert sent["body"]["model"] == "llama"
+    assert sent["body"]["messages"][1]["content"].endswith("Respond with valid JSON only.")
+    assert provider.last_usage["provider"] == "together"
+    assert provider.last_usage["total_tokens"] == 27
+    assert provider.last_usage["estimated"] is False
+    assert provider.last_usage["latency_ms"] >= 0
+
+
+def _sse_handler(events: list[dict], sent: dict):
+    def handler(request: httpx.Request) -> httpx.Response:
+        sent["body"] = json.loads(request.content)
+        lines = [f"data: {json.dumps(event)}\n\n" for event in events]
+        return httpx.Response(200, text="".join(lines) + "data: [DONE]\n\n")
+
+    return handler
+
+
+def _delta(content: str) -> dict:
+    return {"choices": [{"delta": {"content": content}}]}
+
+
+@pytest.mark.asyncio
+async def test_stream_records_usage_sent_after_the_json_value():
+    """Test that a single-example multi-item stream completes with real usage."""
+    sent = {}
+    events = [
+        _delta('```json\n{"segment": 1, "instruction": "Q", '),
+        _delta('"ideal_response": "A"}'),
+        _delta("\n```"),
+        {"choices": [], "usage": {"prompt_tokens": 40, "completion_tokens": 12}},
+    ]
+    provider = TogetherProvider(transport=httpx.MockTransport(_sse_handler(events, sent)))
+    result = await provider.generate_json_stream(
+        "sys", "user", model="llama", allowed_keys=MULTI_ITEM_RESPONSE_KEYS
+    )
+
+    assert result == {"segment": 1, "instruction": "Q", "ideal_response": "A"}
+    assert sent["body"]["stream_options"] == {"include_usage": True}
+    assert provider.last_usage["total_tokens"] == 52
+    assert provider.last_usage["estimated"] is False
+
+
+@pytest.mark.asyncio
+async def test_stream_without_usage_block_is_flagged_as_estimated():
+    """Test that token counts guessed from text length are flagged."""
+    events = [_delta('{"instruction": "Q", "ideal_response": "A"}')]
+    provider = TogetherProvider(transport=httpx.MockTransport(_sse_handler(events, {})))
+    await provider.generate_json_stream("sys", "user", model="llama")
+
+    assert provider.last_usage["estimated"] is True
+    assert provider.last_usage["completion_tokens"] > 0
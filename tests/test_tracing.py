@@ -0,0 +1,49 @@
+"""Tests for span tracing."""
+
+import json
+
+import pytest
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+
+from app.core.logging import clear_request_context, set_request_id
+from app.core.tracing import FileSpanExporter, RequestIdSpanProcessor, traced
+
+
+def test_spans_are_exported_as_json_lines_with_request_id(tmp_path):
+    """Test that exported spans carry the current request ID, one per line."""
+    path = tmp_path / "traces.jsonl"
+    provider = TracerProvider()
+    provider.add_span_processor(RequestIdSpanProcessor())
+    provider.add_span_processor(SimpleSpanProcessor(FileSpanExporter(str(path))))
+    tracer = provider.get_tracer("test")
+
+    set_request_id("req-123")
+    try:
+        with tracer.start_as_current_span("parent"):
+            with tracer.start_as_current_span("child"):
+                pass
+    finally:
+        clear_request_context()
+
+    spans = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [span["name"] for span in spans] == ["child", "parent"]
+    assert all(span["attributes"]["request_id"] == "req-123" for span in spans)
+    assert spans[0]["context"]["trace_id"] == spans[1]["context"]["trace_id"]
+
+
+@pytest.mark.asyncio
+async def test_traced_passes_through_when_tracing_is_disabled():
+    """Test that decorated functions keep their result and name without tracing."""
+
+    @traced()
+    async def add(a, b):
+        return a + b
+
+    @traced("sync.multiply")
+    def multiply(a, b):
+        return a * b
+
+    assert await add(1, 2) == 3
+    assert multiply(2, 3) == 6
+    assert add.__name__ == "add"
@@ -0,0 +1,114 @@
+"""Tests for usage and cost reports."""
+
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from app.api.deps import get_read_db_session
+from app.main import app
+from app.services import usage_service as usage_module
+from app.services.usage_service import UsageService
+
+PRICING = {
+    "gpt-4o-mini": {"prompt": 0.15, "cached_prompt": 0.075, "completion": 0.6},
+    "llama-3-8b": {"prompt": 0.2, "completion": 0.2},
+}
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def _row(run_id, provider, model, items, prompt, completion, cached, estimated=0, seconds=0):
+    return SimpleNamespace(
+        generation_run_id=run_id,
+        source_provider=provider,
+        source_model=model,
+        items=items,
+        estimated_items=estimated,
+        prompt_tokens=prompt,
+        completion_tokens=completion,
+        cached_tokens=cached,
+        avg_latency_ms=1500.0,
+        avg_segment_chars=600,
+        started_at=START,
+        finished_at=START + timedelta(seconds=seconds),
+    )
+
+
+class _UsageSession:
+    """Session stub answering the dataset lookup, then the aggregation rows."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.calls = 0
+
+    async def execute(self, query):
+        self.calls += 1
+        if self.calls == 1:
+            return SimpleNamespace(scalar_one_or_none=lambda: "dataset-1")
+        return iter(self.rows)
+
+
+@pytest.fixture
+def pricing(monkeypatch):
+    monkeypatch.setattr(usage_module.settings, "LLM_PRICING", PRICING)
+
+
+def test_estimate_cost_prices_cached_prompt_tokens(pricing):
+    """Test that cached tokens use their own price and unpriced models cost None."""
+    # (600k * 0.15 + 400k * 0.075 + 100k * 0.6) / 1M
+    assert UsageService.estimate_cost("gpt-4o-mini", 1_000_000, 100_000, 400_000) == 0.18
+    # Without a cached price, cached tokens cost as much as the others
+    assert UsageService.estimate_cost("llama-3-8b", 500_000, 500_000, 200_000) == 0.2
+    assert UsageService.estimate_cost("unknown", 1000, 1000) is None
+
+
+@pytest.mark.asyncio
+async def test_dataset_usage_aggregates_runs_across_providers(pricing):
+    """Test that rows per provider/model roll up into runs and dataset totals."""
+    rows = [
+        _row("run-1", "openai", "gpt-4o-mini", 3, 1_000_000, 100_000, 400_000, seconds=10),
+        _row("run-1", "together", "llama-3-8b", 1, 500_000, 500_000, 0, estimated=1, seconds=20),
+        _row("run-2", "openai", "gpt-4o-mini", 2, 200_000, 50_000, 0, seconds=4),
+    ]
+
+    report = await UsageService.get_dataset_usage(_UsageSession(rows), "dataset-1")
+
+    run_1, run_2 = report["runs"]
+    assert run_1["items"] == 4
+    assert run_1["estimated_items"] == 1
+    assert run_1["prompt_tokens"] == 1_500_000
+    assert run_1["cost_usd"] == pytest.approx(0.38)
+    assert [model["cost_usd"] for model in run_1["models"]] == [0.18, 0.2]
+    assert run_1["duration_seconds"] == 20.0
+    assert run_1["items_per_second"] == 0.2
+    assert run_2["cost_usd"] == pytest.approx(0.06)
+    assert report["items"] == 6
+    assert report["cached_tokens"] == 400_000
+    assert report["cost_usd"] == 0.44
+
+
+@pytest.mark.asyncio
+async def test_usage_route_reports_null_cost_for_unpriced_models(pricing):
+    """Test the usage endpoint end to end with a model missing from the pricing table."""
+    rows = [
+        _row("run-1", "openai", "gpt-4o-mini", 2, 1_000_000, 100_000, 400_000, seconds=8),
+        _row("run-1", "gemini", "gemini-pro", 2, 1000, 1000, 0, seconds=8),
+    ]
+
+    async def override_db():
+        yield _UsageSession(rows)
+
+    app.dependency_overrides[get_read_db_session] = override_db
+    try:
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            response = await client.get("/api/v1/datasets/dataset-1/usage")
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["cost_usd"] is None
+    assert body["runs"][0]["cost_usd"] is None
+    assert [model["cost_usd"] for model in body["runs"][0]["models"]] == [0.18, None]
+    assert body["runs"][0]["tokens_per_item"] == 275500.0